@@ -0,0 +1,52 @@
+"""btclassic simulation objects benchmark.
+
+Compares the btclassic ticks/sec with orders and portfolio simulated by
+pydantic models (`sim_objects=False`) and by slotted simulation objects
+(`sim_objects=True`). Decisions are precomputed so that the orders and
+portfolio handling dominates.
+
+Usage: python benchmarks/bench_btclassic_sim.py [nb_data]
+"""
+import os
+import sys
+import time
+import mosaic.trading as mtr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__),
+                                "..", "mosaic", "tests"))
+from testing_tools import DMReturnsSign, prepare_random_ohlcv_data  # noqa: E402
+
+
+def run(label, ohlcv_df, order_model, sim_objects):
+    bot = mtr.BotTrading.from_dict({
+        'cls': 'BotTrading',
+        'mode': 'btclassic',
+        'dm_precompute': True,
+        'sim_objects': sim_objects,
+        'order_model': order_model,
+        'exchange': {'cls': 'ExchangeBase',
+                     'fees_rates': {'taker': 0.001, 'maker': 0.001}},
+    })
+    bot.decision_model = DMReturnsSign()
+
+    tic = time.perf_counter()
+    bot.start(ohlcv_trading_df=ohlcv_df)
+    duration = time.perf_counter() - tic
+
+    nb_ticks = 3*len(ohlcv_df)
+    print(f"{label:<40} {duration:8.3f}s {nb_ticks/duration:10.0f} ticks/s "
+          f"({len(bot.orders_executed)} orders)")
+
+
+if __name__ == "__main__":
+    nb_data = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=nb_data)
+    print(f"{nb_data} candles - {3*nb_data} ticks")
+
+    for order_model in [
+            {'cls': 'OrderMarket', 'params': {'exec_bound_rate': 0.001}},
+            {'cls': 'OrderTrailingMarket', 'params': {'exec_bound_rate': 0.001}}]:
+        for sim_objects in [False, True]:
+            run(f"{order_model['cls']} sim_objects={sim_objects}",
+                ohlcv_df, order_model, sim_objects)
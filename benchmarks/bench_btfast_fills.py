@@ -0,0 +1,50 @@
+"""btfast intrabar fills benchmark.
+
+Compares the session duration of btclassic mode and of btfast mode with
+intrabar fills (`btfast_fills=True`) for market and trailing market
+orders. Both modes give the same orders and portfolio.
+
+Usage: python benchmarks/bench_btfast_fills.py [nb_data]
+"""
+import os
+import sys
+import time
+import mosaic.trading as mtr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__),
+                                "..", "mosaic", "tests"))
+from testing_tools import DMReturnsSign, prepare_random_ohlcv_data  # noqa: E402
+
+
+def run(label, ohlcv_df, order_model, mode):
+    bot = mtr.BotTrading.from_dict({
+        'cls': 'BotTrading',
+        'mode': mode,
+        'dm_precompute': True,
+        'btfast_fills': True,
+        'diff_thresh_buy_sell_orders': 2,
+        'order_model': order_model,
+        'exchange': {'cls': 'ExchangeBase',
+                     'fees_rates': {'taker': 0.001, 'maker': 0.001}},
+    })
+    bot.decision_model = DMReturnsSign()
+
+    tic = time.perf_counter()
+    bot.start(ohlcv_trading_df=ohlcv_df)
+    duration = time.perf_counter() - tic
+
+    print(f"{label:<40} {duration:8.3f}s "
+          f"(performance {bot.portfolio.performance:.6f})")
+
+
+if __name__ == "__main__":
+    nb_data = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=nb_data)
+    print(f"{nb_data} candles - {3*nb_data} ticks")
+
+    for order_model in [
+            {'cls': 'OrderMarket', 'params': {'exec_bound_rate': 0.001}},
+            {'cls': 'OrderTrailingMarket', 'params': {'exec_bound_rate': 0.001}}]:
+        for mode in ["btclassic", "btfast"]:
+            run(f"{order_model['cls']} {mode}", ohlcv_df, order_model, mode)
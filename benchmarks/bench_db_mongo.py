@@ -0,0 +1,69 @@
+"""DBMongo update benchmark.
+
+Compares records/sec of the former one `update_one` per record path with
+the bulk write path and the write-behind buffer (one portfolio update per
+tick, as done by the bot backtest loop).
+
+Runs against a local mongod when reachable, otherwise against mongomock
+(which has no network round trip, so that only the client side overhead is
+measured).
+
+Usage: python benchmarks/bench_db_mongo.py [nb_data]
+"""
+import sys
+import time
+import pymongo
+import mosaic.db as mdb
+
+
+def create_backend():
+    try:
+        bkd = pymongo.MongoClient(serverSelectionTimeoutMS=500)
+        bkd.server_info()
+        return bkd, "mongod"
+    except pymongo.errors.PyMongoError:
+        import mongomock
+        return mongomock.MongoClient(), "mongomock"
+
+
+def update_one_by_one(db, endpoint, data, index):
+    """Former DBMongo.update implementation, kept as reference."""
+    db_coll, index = db.prepare_and_get_coll(endpoint, index)
+    for d in data:
+        db_coll.update_one({idx: d[idx] for idx in index},
+                           {"$set": d}, upsert=True)
+
+
+def run(label, fun, nb_data):
+    tic = time.perf_counter()
+    fun()
+    duration = time.perf_counter() - tic
+    print(f"{label:<28} {duration:8.3f}s {nb_data/duration:12.0f} records/s")
+
+
+if __name__ == "__main__":
+    nb_data = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    bkd, bkd_name = create_backend()
+    print(f"Backend: {bkd_name} - {nb_data} records")
+
+    data = [{"uid": i, "value": float(i)} for i in range(nb_data)]
+    ticks = [{"bot_uid": "bench", "value": float(i)} for i in range(nb_data)]
+
+    db = mdb.DBMongo(name="mosaic_bench", bkd=bkd)
+    db_buffered = mdb.DBMongo(name="mosaic_bench", bkd=bkd, buffer_size=500)
+
+    for endpoint in ["records", "records_bulk", "ticks", "ticks_buffered"]:
+        bkd["mosaic_bench"][endpoint].drop()
+
+    run("records update_one", lambda: update_one_by_one(
+        db, "records", data, ["uid"]), nb_data)
+    run("records bulk_write", lambda: db.update(
+        "records_bulk", data=data, index=["uid"]), nb_data)
+    run("ticks update per tick", lambda: [db.update(
+        "ticks", data=d, index=["bot_uid"]) for d in ticks], nb_data)
+    run("ticks write-behind buffer", lambda: [db_buffered.update(
+        "ticks_buffered", data=d, index=["bot_uid"]) for d in ticks]
+        and db_buffered.flush(), nb_data)
+
+    bkd.drop_database("mosaic_bench")
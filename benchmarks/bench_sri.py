@@ -0,0 +1,88 @@
+"""SRI hit counting benchmark.
+
+Compares the sliding window hit counting used by `SRI.compute` with the
+former shifted columns implementation (`pd.concat` of `length` shifts) for
+increasing window lengths.
+
+Usage: python benchmarks/bench_sri.py [nb_data]
+"""
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import mosaic.indicator as mid
+
+
+def compute_hits_shift_concat(ohlcv_df, data_range_min, data_range_max,
+                              length):
+    """Former SRI hit counting, kept as reference."""
+    ohlcv_low_shift_df = \
+        pd.concat([ohlcv_df["low"].shift(i).rename(i)
+                   for i in range(length)], axis=1)
+    indic_bmin_dup_df = \
+        pd.concat([data_range_min.rename(i)
+                   for i in range(length)], axis=1)
+    hl = (ohlcv_low_shift_df < indic_bmin_dup_df).sum(axis=1).astype(float)
+
+    ohlcv_high_shift_df = \
+        pd.concat([ohlcv_df["high"].shift(i).rename(i)
+                   for i in range(length)], axis=1)
+    indic_bmax_dup_df = \
+        pd.concat([data_range_max.rename(i)
+                   for i in range(length)], axis=1)
+    hh = (ohlcv_high_shift_df > indic_bmax_dup_df).sum(axis=1).astype(float)
+
+    return hl, hh
+
+
+def compute_hits_sliding(ohlcv_df, data_range_min, data_range_max, length):
+    hl = mid.sri.count_window_hits(ohlcv_df["low"].to_numpy(),
+                                   data_range_min.to_numpy(),
+                                   length, side="lower")
+    hh = mid.sri.count_window_hits(ohlcv_df["high"].to_numpy(),
+                                   data_range_max.to_numpy(),
+                                   length, side="upper")
+    return hl, hh
+
+
+def measure(fun, *args):
+    tracemalloc.start()
+    time_start = time.perf_counter()
+    fun(*args)
+    duration = time.perf_counter() - time_start
+    _, mem_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, mem_peak/2**20
+
+
+if __name__ == "__main__":
+
+    nb_data = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    rng = np.random.default_rng(0)
+    close = 100*np.exp(np.cumsum(rng.normal(0, 0.001, nb_data)))
+    ohlcv_df = pd.DataFrame({"low": close*(1 - rng.uniform(0, 0.001, nb_data)),
+                             "high": close*(1 + rng.uniform(0, 0.001, nb_data)),
+                             "close": close})
+
+    bench_list = []
+    for length in [10, 50, 100, 200, 500]:
+        indic = mid.SRI(length=length)
+        _, data_range_min, data_range_max = \
+            indic.compute(ohlcv_df, return_range=True)
+
+        for method, fun in [("shift_concat", compute_hits_shift_concat),
+                            ("sliding", compute_hits_sliding)]:
+            duration, mem_peak = measure(fun, ohlcv_df,
+                                         data_range_min, data_range_max,
+                                         length)
+            bench_list.append({"length": length,
+                               "method": method,
+                               "time (s)": duration,
+                               "peak memory (MB)": mem_peak})
+
+    bench_df = pd.DataFrame(bench_list)\
+                 .pivot(index="length", columns="method")
+    print(f"SRI hit counting over {nb_data} candles")
+    print(bench_df.round(3).to_string())
@@ -7,6 +7,7 @@ from pandas import DataFrame, Timedelta, Timestamp, to_datetime
 from pydantic import BaseModel, Field
 from time import sleep
 from ..indicator.indicator_message import IndicatorMessage
+from mosaic.trading.ohlcv_download import fetch_ohlcv_pages
 
 
 class Exchange(BaseModel):
@@ -59,33 +60,20 @@ class Exchange(BaseModel):
                                 start: Timestamp, end: Timestamp,
                                 fetch_count=2000):
 
-        ohlcv = []
-
         logging.info(
             f'Download {self.ccxt_exchange.id} {timeframe} {symbol}/{base_pair}')
 
         end_time_in_ms = int(end.value / 1000000)
         start_in_ms = int(start.value / 1000000)
 
-        while start_in_ms < end_time_in_ms:
-
-            new_ohlcv = self.ccxt_exchange.fetchOHLCV(
-                f'{symbol}/{base_pair}', timeframe, start_in_ms, fetch_count)
-
-            if len(new_ohlcv) == 0:
-                break
-
-            last_value = new_ohlcv[len(new_ohlcv)-1][0]
-
-            if len(new_ohlcv) == 1 and Timestamp(start_in_ms) == Timestamp(last_value):
-                break
-
-            ohlcv.extend(new_ohlcv)
-
-            start_in_ms = last_value
+        # Pages are fetched concurrently within the exchange rate limit
+        ohlcv_df, stats = fetch_ohlcv_pages(
+            self.ccxt_exchange, f'{symbol}/{base_pair}', timeframe,
+            start_in_ms, end_time_in_ms + 1,
+            fetch_limit=fetch_count,
+            logger=logging.getLogger())
 
-        df = DataFrame(
-            ohlcv, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
+        df = ohlcv_df.rename(columns={"timestamp": "time"})
         df['time'] = df['time'].astype('datetime64[ms]')
         df.set_index("time", inplace=True)
 
@@ -64,7 +64,9 @@ class ObjMOSAIC(pydantic.BaseModel):
                         f"{clsname} is not a subclass of {ObjMOSAIC.__name__}")
 
                 return cls(**obj_copy)
-            
+
+            return obj_copy
+
         elif isinstance(obj, list):
             for index, value in enumerate(obj):
                 obj[index] = basecls.from_dict(value)
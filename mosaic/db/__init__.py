@@ -1,4 +1,5 @@
 from .db_base import DBBase
+from .db_buffered import DBBuffered
 from .db_rest import DBREST
 
 #from .db_dataframe import DBDataFrame, DBExcel, DBCSV, DBGSpread
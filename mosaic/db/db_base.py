@@ -68,6 +68,9 @@ class DBBase(ObjMOSAIC):
 
         delete(endpoint, filter={}, **params):
             Deletes data from the database.
+
+        flush(**params):
+            Sends pending buffered writes to the database.
     """
     name: str = pydantic.Field(None, description="Data backend id/name")
     config: DBConfigBase = \
@@ -108,3 +111,7 @@ class DBBase(ObjMOSAIC):
         """DB delete data function."""
         raise NotImplementedError("This function must be implemented in class {}"
                                   .format(self.__class__))
+
+    def flush(self, **params):
+        """DB flush buffered writes function (nothing is buffered by default)."""
+        pass
@@ -0,0 +1,226 @@
+import itertools
+import threading
+import collections
+import pydantic
+
+from .db_base import DBBase
+
+import pkg_resources
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class DBWriteQueue:
+    """Pending writes shared by the copies of a DBBuffered backend."""
+
+    def __init__(self):
+        self.pending = collections.OrderedDict()
+        self.cond = threading.Condition()
+        self.flush_lock = threading.Lock()
+        self.thread = None
+        self.closed = False
+        self.uid = itertools.count()
+
+
+class DBBuffered(DBBase):
+    """
+    Write-behind buffer wrapping any data backend.
+
+    `put` and `update` calls are queued in memory and return immediately.
+    Updates of a record with the same index values are coalesced (the
+    latest values of each field are kept). A background thread sends
+    pending writes to the wrapped backend when `batch_size` writes are
+    pending or every `flush_interval` seconds. At most `max_pending`
+    writes are kept in memory: further writes wait for the background
+    flush (backpressure).
+
+    Read and delete operations flush pending writes first.
+
+    Args:
+        db: Wrapped data backend.
+        batch_size: Number of pending writes triggering a background flush.
+        flush_interval: Maximum delay (seconds) between background flushes.
+        max_pending: Maximum number of pending writes.
+        batch_mode: Send consecutive writes of a same endpoint as one
+            backend call with a list of records, otherwise one backend call
+            per record.
+
+    Methods:
+        flush(**params):
+            Sends all pending writes to the wrapped backend.
+
+        close(**params):
+            Flushes pending writes and stops the background thread.
+    """
+
+    db: DBBase = pydantic.Field(
+        None, description="Buffered data backend")
+
+    batch_size: int = pydantic.Field(
+        100, description="Number of pending writes triggering a flush")
+
+    flush_interval: float = pydantic.Field(
+        1.0, description="Maximum delay (seconds) between two flushes")
+
+    max_pending: int = pydantic.Field(
+        10000, description="Maximum number of pending writes before "
+        "writers wait for the flush")
+
+    batch_mode: bool = pydantic.Field(
+        True, description="Send batched records in one backend call")
+
+    _queue: DBWriteQueue = pydantic.PrivateAttr(None)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._queue = DBWriteQueue()
+
+    @property
+    def nb_pending(self):
+        return len(self._queue.pending)
+
+    def connect(self, **params):
+        self.db.logger = self.logger
+        return self.db.connect(**params)
+
+    def count(self, endpoint, filter={}, **params):
+        self.flush()
+        return self.db.count(endpoint, filter=filter, **params)
+
+    def size(self, endpoint, **params):
+        self.flush()
+        return self.db.size(endpoint, **params)
+
+    def get(self, endpoint, filter={}, **params):
+        self.flush()
+        return self.db.get(endpoint, filter=filter, **params)
+
+    def delete(self, endpoint, filter={}, **params):
+        self.flush()
+        return self.db.delete(endpoint, filter=filter, **params)
+
+    def reset(self, **params):
+        self.flush()
+        return self.db.reset(**params)
+
+    def put(self, endpoint, data={}, index=[], **params):
+        self.enqueue("put", endpoint, data, index, **params)
+
+    def update(self, endpoint, data=[], index=[], **params):
+        self.enqueue("update", endpoint, data, index, **params)
+
+    def write_key(self, method, endpoint, data, index):
+        """Updates with the same index values share the same key."""
+        if method == "update" and len(index) > 0:
+            try:
+                key = (method, endpoint, tuple(index),
+                       tuple(data.get(idx) for idx in index))
+                hash(key)
+                return key
+            except TypeError:
+                pass
+
+        return (method, endpoint, next(self._queue.uid))
+
+    def enqueue(self, method, endpoint, data, index, **params):
+        queue = self._queue
+        if not isinstance(index, (list, tuple)):
+            index = [index]
+        data_list = data if isinstance(data, list) else [data]
+
+        with queue.cond:
+            if queue.closed:
+                raise ValueError(f"Buffered DB {self.name} is closed")
+
+            # Backpressure: wait for the flush to free memory
+            while len(queue.pending) > 0 and \
+                    len(queue.pending) + len(data_list) > self.max_pending:
+                queue.cond.notify_all()
+                queue.cond.wait()
+
+            for d in data_list:
+                key = self.write_key(method, endpoint, d, index)
+                write = queue.pending.get(key)
+                if write is None:
+                    queue.pending[key] = \
+                        dict(method=method, endpoint=endpoint,
+                             index=list(index), data=dict(d), params=params)
+                else:
+                    write["data"].update(d)
+                    write["params"] = params
+
+            if len(queue.pending) >= self.batch_size:
+                queue.cond.notify_all()
+
+            if queue.thread is None:
+                queue.thread = threading.Thread(target=self.flush_loop,
+                                                daemon=True)
+                queue.thread.start()
+
+    def flush_loop(self):
+        queue = self._queue
+        while True:
+            with queue.cond:
+                if not queue.closed and len(queue.pending) < self.batch_size:
+                    queue.cond.wait(timeout=self.flush_interval)
+                if queue.closed:
+                    return
+            self.flush_pending()
+
+    def flush_pending(self):
+        """Sends pending writes to the wrapped backend, in queue order."""
+        queue = self._queue
+        with queue.flush_lock:
+            with queue.cond:
+                write_list = list(queue.pending.values())
+                queue.pending.clear()
+                queue.cond.notify_all()
+
+            batch_key_fun = (lambda write: (write["method"],
+                                            write["endpoint"],
+                                            tuple(write["index"]),
+                                            repr(write["params"]))) \
+                if self.batch_mode else id
+
+            for _, write_batch in itertools.groupby(write_list,
+                                                    key=batch_key_fun):
+                write_batch = list(write_batch)
+                write = write_batch[0]
+                data_list = [wr["data"] for wr in write_batch]
+                if self.batch_mode:
+                    data_batches = [data_list[i:i + self.batch_size]
+                                    for i in range(0, len(data_list),
+                                                   self.batch_size)]
+                else:
+                    data_batches = data_list
+
+                for data in data_batches:
+                    try:
+                        getattr(self.db, write["method"])(
+                            write["endpoint"],
+                            data=data,
+                            index=write["index"],
+                            **write["params"])
+                    except Exception as err:
+                        if self.logger:
+                            self.logger.error(
+                                "Problem occurred flushing data in endpoint {} : {}"
+                                .format(write["endpoint"], err))
+
+        return len(write_list)
+
+    def flush(self, **params):
+        nb_writes = self.flush_pending()
+        self.db.flush(**params)
+        return nb_writes
+
+    def close(self, **params):
+        queue = self._queue
+        with queue.cond:
+            queue.closed = True
+            queue.cond.notify_all()
+        if queue.thread is not None:
+            queue.thread.join()
+        return self.flush(**params)
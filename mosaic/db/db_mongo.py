@@ -1,3 +1,4 @@
+import time
 import pymongo
 import pydantic
 import typing
@@ -20,7 +21,8 @@ class DBMongo(DBBase):
     - `size`: Returns the number of documents in a collection that match the given filter.
     - `get`: Retrieves documents from a collection that match the given filter and projection criteria.
     - `replace`: Replaces documents in a collection that match the given index with the provided data. If the documents don't exist, inserts them.
-    - `update`: Updates documents in a collection that match the given index with the provided data. If the documents don't exist, inserts them.
+    - `update`: Updates documents in a collection that match the given index with the provided data. If the documents don't exist, inserts them. Updates are sent with `bulk_write` in batches of `bulk_size` operations, and are buffered when a write-behind buffer is configured.
+    - `flush`: Sends the buffered updates to the database.
     - `put`: Inserts documents into a collection. If the documents already exist, they are not inserted.
     - `reset`: Deletes all collections in the specified database.
     - `delete`: Deletes documents from a collection that match the given filter.
@@ -31,6 +33,29 @@ class DBMongo(DBBase):
         pydantic.Field(default=DMBSConfigBase(),
                        description="The data backend configuration")
 
+    bulk_size: int = pydantic.Field(
+        1000, description="Maximum number of operations sent in one bulk write")
+
+    buffer_size: int = pydantic.Field(
+        0, description="Number of buffered updates triggering a flush "
+        "(0 means no buffering)")
+
+    buffer_timeout: float = pydantic.Field(
+        None, description="Maximum delay (seconds) before flushing buffered "
+        "updates on the next update")
+
+    _index_created: set = pydantic.PrivateAttr(default_factory=set)
+    _buffer: dict = pydantic.PrivateAttr(default_factory=dict)
+    _buffer_ts: float = pydantic.PrivateAttr(None)
+
+    @property
+    def buffer_mode(self):
+        return self.buffer_size > 0 or self.buffer_timeout is not None
+
+    @property
+    def nb_buffered(self):
+        return sum(len(ops) for ops in self._buffer.values())
+
     def connect(self, serverSelectionTimeoutMS=2000, **params):
 
         self.bkd = pymongo.MongoClient(host=self.config.host,
@@ -62,9 +87,12 @@ class DBMongo(DBBase):
             if not isinstance(index, (list, tuple, set)):
                 index = [index]
 
-            if len(index) > 0:
+            # Index creation is a server round trip: done once per collection
+            index_key = (db_name, coll_name, tuple(index))
+            if len(index) > 0 and not (index_key in self._index_created):
                 db_coll.create_index([(idx, 1) for idx in index],
                                      unique=True)
+                self._index_created.add(index_key)
         else:
             index = []
 
@@ -125,8 +153,16 @@ class DBMongo(DBBase):
                data=[],
                index=[],
                set_on_insert_data={},
+               flush=False,
                **params):
-
+        """Upserts data matching index values.
+
+        In buffer mode, update operations are queued and only sent to the
+        database when `buffer_size` operations are buffered, when
+        `buffer_timeout` seconds elapsed since the last flush, when `flush`
+        is True or when the `flush` method is called. Returned insert and
+        update counts then cover the flushed operations.
+        """
         res_dict = {"data_name": endpoint,
                     "ops_type": "update",
                     "ops": dict([
@@ -140,30 +176,29 @@ class DBMongo(DBBase):
         if len(set_on_insert_data) > 0:
             set_query.update({"$setOnInsert": set_on_insert_data})
 
-        try:
-            if isinstance(data, list):
-                ops_res_cur = \
-                    [db_coll.update_one(
-                        {idx: d[idx] for idx in index},
-                        dict({"$set": d}, **set_query),
-                        upsert=True) for d in data]
+        data_list = data if isinstance(data, list) else [data]
+        ops_list = [pymongo.UpdateOne({idx: d[idx] for idx in index},
+                                      dict({"$set": d}, **set_query),
+                                      upsert=True)
+                    for d in data_list]
+        res_dict["ops"]["nb_data_processed"] += len(ops_list)
 
-                res_dict["ops"]["nb_data_processed"] += len(data)
-                res_dict["ops"]["nb_updates"] += \
-                    sum([res.modified_count for res in ops_res_cur])
-                res_dict["ops"]["nb_inserts"] += \
-                    sum([res.upserted_id is not None for res in ops_res_cur])
+        if self.buffer_mode:
+            self._buffer.setdefault(endpoint, []).extend(ops_list)
+            if self._buffer_ts is None:
+                self._buffer_ts = time.monotonic()
 
-            else:
-                ops_res_cur = \
-                    db_coll.update_one({idx: data[idx] for idx in index},
-                                       dict({"$set": data}, **set_query),
-                                       upsert=True)
+            if flush or self.is_buffer_full():
+                res_flush_dict = self.flush()
+                for ops in ["nb_inserts", "nb_updates"]:
+                    res_dict["ops"][ops] += res_flush_dict["ops"][ops]
 
-                res_dict["ops"]["nb_data_processed"] += 1
-                res_dict["ops"]["nb_updates"] += ops_res_cur.modified_count
-                res_dict["ops"]["nb_inserts"] += ops_res_cur.upserted_id is not None
+            return res_dict
 
+        try:
+            res_bulk_dict = self.bulk_update(db_coll, ops_list)
+            res_dict["ops"]["nb_updates"] += res_bulk_dict["nb_updates"]
+            res_dict["ops"]["nb_inserts"] += res_bulk_dict["nb_inserts"]
         except Exception as err:
             if self.logger:
                 self.logger.error("Problem occurred updating data in endpoint {} : {}"
@@ -172,10 +207,56 @@ class DBMongo(DBBase):
         self.log_db_ops(res_dict)
 
         return res_dict
-        # if self.logger:
-        #     # TODO: STOP USING THIS USE LOG_DB_OPS INSTEAD
-        #     self.logger.debug(self.format_update_res(db_coll,
-        #                                            update_res))
+
+    def bulk_update(self, db_coll, ops_list):
+        """Sends update operations with ordered bulk writes of `bulk_size`
+        operations, so that successive updates of a same document are
+        applied in order."""
+        res_dict = {"nb_inserts": 0, "nb_updates": 0}
+        for i in range(0, len(ops_list), self.bulk_size):
+            ops_res_cur = db_coll.bulk_write(ops_list[i:i + self.bulk_size],
+                                             ordered=True)
+            res_dict["nb_updates"] += ops_res_cur.modified_count
+            res_dict["nb_inserts"] += ops_res_cur.upserted_count
+
+        return res_dict
+
+    def is_buffer_full(self):
+        if self.buffer_size > 0 and self.nb_buffered >= self.buffer_size:
+            return True
+        if self.buffer_timeout is not None and self._buffer_ts is not None:
+            return time.monotonic() - self._buffer_ts >= self.buffer_timeout
+        return False
+
+    def flush(self, **params):
+        """Sends all buffered update operations to the database."""
+        res_dict = {"data_name": ", ".join(self._buffer.keys()),
+                    "ops_type": "flush",
+                    "ops": dict([
+                        ("nb_data_processed", 0),
+                        ("nb_inserts", 0),
+                        ("nb_updates", 0)])}
+
+        buffer = self._buffer
+        self._buffer = {}
+        self._buffer_ts = None
+
+        for endpoint, ops_list in buffer.items():
+            db_coll, index = self.prepare_and_get_coll(endpoint)
+            res_dict["ops"]["nb_data_processed"] += len(ops_list)
+            try:
+                res_bulk_dict = self.bulk_update(db_coll, ops_list)
+                res_dict["ops"]["nb_updates"] += res_bulk_dict["nb_updates"]
+                res_dict["ops"]["nb_inserts"] += res_bulk_dict["nb_inserts"]
+            except Exception as err:
+                if self.logger:
+                    self.logger.error("Problem occurred flushing data in endpoint {} : {}"
+                                      .format(endpoint, err))
+
+        if res_dict["ops"]["nb_data_processed"] > 0:
+            self.log_db_ops(res_dict)
+
+        return res_dict
 
     def put(self, endpoint,
             data=[],
@@ -12,6 +12,8 @@ from ..utils.viz_tools import plotly_convert_to_line_style
 #from ..trading.core import SignalBase
 from ..core import ObjMOSAIC
 from ..predict_model.pm_base import PredictModelBase
+from ..predict_model.pm_cache import PMCache
+from ..indicator.features_cache import FeaturesCache
 from ..indicator.indicator import Indicator
 import pkg_resources
 installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
@@ -21,6 +23,14 @@ if 'ipdb' in installed_pkg:
 # PandasSeries = typing.TypeVar('pandas.core.frame.Series')
 # PandasDataFrame = typing.TypeVar('pandas.core.frame.DataFrame')
 
+# Integer decision codes
+DECISION_CODE_BUY = 1
+DECISION_CODE_SELL = -1
+DECISION_CODE_NO_SIGNAL = 0
+
+# Categories ["buy", "sell", no signal] codes indexed by decision code + 1
+DECISION_CATEGORY_CODES = np.array([1, 2, 0], dtype=np.int8)
+
         
 class DMBase(ObjMOSAIC):
     """ Decision model base class """
@@ -34,6 +44,9 @@ class DMBase(ObjMOSAIC):
 
     no_signal_code: str = \
         pydantic.Field("pass", description="String to be used when no signal is generated")
+
+    decision_codes: bool = \
+        pydantic.Field(False, description="Emit int8 decision codes (+1 buy, -1 sell, 0 no signal) instead of categorical decision labels")
     
     params: HyperParams = \
         pydantic.Field(None, description="Decision model parameters")
@@ -42,32 +55,95 @@ class DMBase(ObjMOSAIC):
         {v: v for v in ["open", "high", "low", "close", "volume"]},
         description="OHLCV variable name dictionnary")
 
+    fit_cache: PMCache = \
+        pydantic.Field(None, description="Fitted predict models cache: models already fitted on the same data are loaded instead of being fitted again")
+
+    features_cache: FeaturesCache = \
+        pydantic.Field(None, description="Computed features cache shared by the decision model predict models")
+
+    def __init__(self, **data: typing.Any):
+        super().__init__(**data)
+
+        self.share_features_cache()
 
     
     @property
     def bw_length(self):
         return 0
 
+    @property
+    def online(self):
+        """Indicates if the decision model is updated with new bars."""
+        return False
+
+    def update(self, ohlcv_df, **kwrds):
+        """Updates online models with new OHLCV bars."""
+        pass
+
+    def share_features_cache(self):
+        """Set the decision model features cache to its predict models."""
+        if self.features_cache is None:
+            return
+        for attr in self.__fields__:
+            pm = getattr(self, attr)
+            if isinstance(pm, PredictModelBase):
+                pm.features_cache = self.features_cache
+
+    def get_fitted_state(self):
+        """Fitted state of each predict model, indexed by attribute name."""
+        return {attr: getattr(self, attr).get_fitted_state()
+                for attr in self.__fields__
+                if isinstance(getattr(self, attr), PredictModelBase)}
+
+    def set_fitted_state(self, fitted_state):
+        """Restores predict models fitted state given by `get_fitted_state`."""
+        for attr, pm_fitted_state in fitted_state.items():
+            getattr(self, attr).set_fitted_state(pm_fitted_state)
+
+    def fit_pm(self, pm, ohlcv_df, **kwrds):
+        """Fit a predict model, using the fitted models cache if any."""
+        if self.fit_cache is None:
+            pm.fit(ohlcv_df, **kwrds)
+        else:
+            self.fit_cache.fit(pm, ohlcv_df, **kwrds)
+
+    def codes_to_decision(self, codes, index):
+        """Decision Series from int8 decision codes.
+
+        Codes are kept as is with `decision_codes`, otherwise they are
+        converted into categorical labels without any string assignment.
+        """
+        if self.decision_codes:
+            return pd.Series(codes, index=index, name="decision")
+
+        return pd.Series(
+            pd.Categorical.from_codes(
+                DECISION_CATEGORY_CODES[codes + 1],
+                categories=["buy", "sell", self.no_signal_code]),
+            index=index,
+            name="decision")
+
+    def fillna_decision(self, decision_s):
+        """Fill missing decisions (e.g. after reindexing) with no signal."""
+        if self.decision_codes:
+            return decision_s.fillna(DECISION_CODE_NO_SIGNAL)\
+                             .astype(np.int8)
+
+        return decision_s.fillna(self.no_signal_code)
+
     def compute_signal(self, signal_score_df, **kwrds):
 
-        signal_s = pd.Series(
-            self.no_signal_code,
-            index=signal_score_df.index,
-            name="decision",
-            dtype=pd.CategoricalDtype(
-                categories=["buy", "sell", self.no_signal_code]
-            ),
-        )
+        score = signal_score_df["score"].to_numpy(dtype=float)
+        codes = np.full(len(score), DECISION_CODE_NO_SIGNAL, dtype=np.int8)
 
         if self.buy_threshold is not None:
-            idx_buy = signal_score_df["score"] > self.buy_threshold
-            signal_s.loc[idx_buy] = "buy"
-            
+            codes[score > self.buy_threshold] = DECISION_CODE_BUY
+
         if self.sell_threshold is not None:
-            idx_sell = signal_score_df["score"] < -self.sell_threshold
-            signal_s.loc[idx_sell] = "sell"
+            codes[score < -self.sell_threshold] = DECISION_CODE_SELL
 
-        return pd.concat([signal_s,
+        return pd.concat([self.codes_to_decision(codes,
+                                                 signal_score_df.index),
                           signal_score_df],
                          axis=1)
     
@@ -75,6 +151,10 @@ class DMBase(ObjMOSAIC):
         
         raise NotImplementedError("compute method not implemented")
 
+    def predict_last(self, ohlcv_df, **kwrds):
+        """Decision for the last OHLCV bar only (live trading)."""
+        return self.predict(ohlcv_df, **kwrds).iloc[-1:]
+
 
     def plotly(self, ohlcv_df,
                ret_signals=False,
@@ -104,7 +184,11 @@ class DMBase(ObjMOSAIC):
         var_buy_data = self.ohlcv_names.get(var_buy)
         var_sell_data = self.ohlcv_names.get(var_sell)
         
-        signals_buy = decisions_s.loc[decisions_s == "buy"]
+        buy_decision, sell_decision = \
+            (DECISION_CODE_BUY, DECISION_CODE_SELL) if self.decision_codes \
+            else ("buy", "sell")
+
+        signals_buy = decisions_s.loc[decisions_s == buy_decision]
         signals_buy_trace = go.Scatter(
             x=signals_buy.index,
             y=ohlcv_df.loc[signals_buy.index, var_buy_data],
@@ -112,7 +196,7 @@ class DMBase(ObjMOSAIC):
             marker=buy_style,
             name='buy signals')
 
-        signals_sell = decisions_s.loc[decisions_s == "sell"]
+        signals_sell = decisions_s.loc[decisions_s == sell_decision]
         signals_sell_trace = go.Scatter(
             x=signals_sell.index,
             y=ohlcv_df.loc[signals_sell.index, var_sell_data],
@@ -190,8 +274,15 @@ class DM1ML(DMBase):
     def bw_length(self):
         return self.pm.bw_length
 
+    @property
+    def online(self):
+        return self.pm.online
+
     def fit(self, ohlcv_df, **kwrds):
-        self.pm.fit(ohlcv_df, **kwrds)
+        self.fit_pm(self.pm, ohlcv_df, **kwrds)
+
+    def update(self, ohlcv_df, **kwrds):
+        self.pm.update(ohlcv_df, **kwrds)
     
     def predict(self, ohlcv_df, **kwrds):
         signal_score_df = pd.DataFrame(
@@ -200,6 +291,13 @@ class DM1ML(DMBase):
         
         return self.compute_signal(signal_score_df)
 
+    def predict_last(self, ohlcv_df, **kwrds):
+        signal_score_df = pd.DataFrame(
+            self.pm.predict_last(ohlcv_df, **kwrds).rename("score")
+            )
+
+        return self.compute_signal(signal_score_df)
+
 
 class DMDR(DM1ML):
     """ Decision model based on deterministic rules """
@@ -212,6 +310,7 @@ class DMDR(DM1ML):
 
         self.pm = PredictModelBase(features=list(self.features.values()),
                                    ohlcv_names=self.ohlcv_names)
+        self.share_features_cache()
     
     def fit(self, ohlcv_df, **kwrds):
         pass
@@ -222,28 +321,24 @@ class DMDR(DM1ML):
     
     def compute_signal(self, features_df, **kwrds):
 
-        signal_s = pd.Series(
-            self.no_signal_code,
-            index=features_df.index,
-            name="decision",
-            dtype=pd.CategoricalDtype(
-                categories=["buy", "sell", self.no_signal_code]
-            ),
-        )
-
         idx_buy, idx_sell = \
             self.compute_signal_idx(features_df, **kwrds)
 
-        signal_s.loc[idx_buy] = "buy"
-        signal_s.loc[idx_sell] = "sell"
+        codes = np.full(len(features_df), DECISION_CODE_NO_SIGNAL,
+                        dtype=np.int8)
+        codes[np.asarray(idx_buy, dtype=bool)] = DECISION_CODE_BUY
+        codes[np.asarray(idx_sell, dtype=bool)] = DECISION_CODE_SELL
 
-        return pd.concat([signal_s,
+        return pd.concat([self.codes_to_decision(codes, features_df.index),
                           features_df],
                          axis=1)
 
     def predict(self, ohlcv_df, **kwrds):
         return self.compute_signal(self.pm.compute_features(ohlcv_df))
 
+    def predict_last(self, ohlcv_df, **kwrds):
+        return self.predict(ohlcv_df, **kwrds).iloc[-1:]
+
     
 class DM2ML(DMBase):
     """ Decision model based on two distinct machine learning prediction model : one for buy decisions and one for sell decisions """
@@ -257,9 +352,17 @@ class DM2ML(DMBase):
     def bw_length(self):
         return max(self.pm_buy.bw_length, self.pm_sell.bw_length)
 
+    @property
+    def online(self):
+        return self.pm_buy.online or self.pm_sell.online
+
+    def update(self, ohlcv_df, **kwrds):
+        self.pm_buy.update(ohlcv_df, **kwrds)
+        self.pm_sell.update(ohlcv_df, **kwrds)
+
     def fit(self, ohlcv_df, **kwrds):
-        self.pm_buy.fit(ohlcv_df, **kwrds)
-        self.pm_sell.fit(ohlcv_df, **kwrds)
+        self.fit_pm(self.pm_buy, ohlcv_df, **kwrds)
+        self.fit_pm(self.pm_sell, ohlcv_df, **kwrds)
     
     def predict(self, ohlcv_df, **kwrds):
 
@@ -273,6 +376,18 @@ class DM2ML(DMBase):
                                      sell_score], axis=1)
         return self.compute_signal(signal_score_df)
 
+    def predict_last(self, ohlcv_df, **kwrds):
+
+        buy_score = self.pm_buy.predict_last(ohlcv_df, **kwrds).rename("buy_score")
+        sell_score = self.pm_sell.predict_last(ohlcv_df, **kwrds).rename("sell_score")
+
+        signal_score = (buy_score - sell_score).rename("score")
+
+        signal_score_df = pd.concat([signal_score,
+                                     buy_score,
+                                     sell_score], axis=1)
+        return self.compute_signal(signal_score_df)
+
     def plotly(self,
                ohlcv_df,
                ret_signals=False,
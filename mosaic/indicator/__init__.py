@@ -5,6 +5,7 @@ from .rsi import RSI
 from .mfi import MFI
 from .sri import SRI
 from .candle import Candle
+from .features_cache import FeaturesCache
 
 # from .bbands import BollingerBands
 # from .mvl import MVL
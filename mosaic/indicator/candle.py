@@ -2,6 +2,7 @@ import typing
 import pandas as pd
 from pydantic import Field
 from .indicator import IndicatorOHLCV
+from .streaming import div, nanmin, nanmax
 import pkg_resources
 installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
 if 'ipdb' in installed_pkg:
@@ -79,3 +80,38 @@ class Candle(IndicatorOHLCV):
 
         return indic_df
 
+
+    def reset_state(self):
+        self._state = {}
+        self.reset_variation_state()
+
+    def update_state(self, bar):
+
+        var_open = self.ohlcv_names.get("open", "open")
+        var_high = self.ohlcv_names.get("high", "high")
+        var_low = self.ohlcv_names.get("low", "low")
+        var_close = self.ohlcv_names.get("close", "close")
+        var_volume = self.ohlcv_names.get("volume", "volume")
+
+        data_open = bar[var_open]
+        data_close = bar[var_close]
+
+        indic = {self.names(var): bar[var]
+                 for var in [var_open, var_low, var_high, var_volume]}
+
+        indic[self.names("sl")] = nanmin(data_open, data_close) - bar[var_low]
+        indic[self.names("su")] = bar[var_high] - nanmax(data_open, data_close)
+        indic[self.names("body")] = data_close - data_open
+
+        var_r_list = []
+        for var in ["body", "sl", "su"]:
+            var_name = self.names(f"{var}_r")
+            indic[var_name] = div(indic[self.names(var)], data_open)
+            var_r_list.append(var_name)
+
+        for var in [var_high, var_low]:
+            var_name = self.names(f"{var}_r")
+            indic[var_name] = div(indic[self.names(var)], data_open) - 1
+            var_r_list.append(var_name)
+
+        return self.update_variation(indic, diff_var=var_r_list)
@@ -0,0 +1,181 @@
+import os
+import json
+import hashlib
+import tempfile
+import collections
+import threading
+import typing
+import pydantic
+import pandas as pd
+from ..core import ObjMOSAIC
+from ..utils.data_management import compute_data_fingerprint
+
+import pkg_resources
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class FeaturesCache(ObjMOSAIC):
+    """Content addressed cache of computed indicators.
+
+    Indicator values are stored under a key made of a hash of the indicator
+    parameters and a fingerprint of the OHLCV data (values, index and
+    columns), so that identical indicator columns are computed once per
+    dataset whatever the model using them. Entries are kept in an in-memory
+    LRU of `max_entries` indicators and, when `cache_dir` is set, in
+    Parquet files shared across runs and processes.
+
+    Datasets registered with `register_dataset` are also reused for their
+    slices: as indicators are causal, features of a slice are taken from
+    the features of the whole dataset, i.e. computed with all the history
+    preceding the slice (e.g. walk-forward folds).
+    """
+
+    max_entries: int = pydantic.Field(
+        128, description="Maximum number of indicators kept in memory")
+
+    cache_dir: str = pydantic.Field(
+        None, description="On disk cache directory (no disk cache if None)")
+
+    logger: typing.Any = pydantic.Field(
+        None, description="Logger")
+
+    _entries: collections.OrderedDict = \
+        pydantic.PrivateAttr(default_factory=collections.OrderedDict)
+    _lock: typing.Any = pydantic.PrivateAttr(default_factory=threading.Lock)
+    _datasets: list = pydantic.PrivateAttr(default_factory=list)
+
+    def dict(self, **kwrds):
+
+        if kwrds.get("exclude"):
+            kwrds["exclude"].add("logger")
+        else:
+            kwrds["exclude"] = {"logger"}
+
+        return super().dict(**kwrds)
+
+    @property
+    def nb_entries(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._datasets.clear()
+
+    def register_dataset(self, ohlcv_df):
+        """Registers a dataset whose slices reuse the dataset features."""
+        self._datasets.append((ohlcv_df, compute_data_fingerprint(ohlcv_df)))
+
+    def find_dataset(self, ohlcv_df):
+        """Registered dataset containing OHLCV data as a contiguous slice.
+
+        Returns:
+            tuple: Dataset, dataset fingerprint and slice start position,
+            None if OHLCV data are not a slice of a registered dataset.
+        """
+        if len(ohlcv_df) == 0:
+            return None
+
+        for dataset_df, data_key in self._datasets:
+            if not dataset_df.columns.equals(ohlcv_df.columns):
+                continue
+            i_start = dataset_df.index.get_indexer(ohlcv_df.index[:1])[0]
+            if i_start < 0:
+                continue
+            if dataset_df.iloc[i_start:i_start + len(ohlcv_df)]\
+                         .equals(ohlcv_df):
+                return dataset_df, data_key, i_start
+
+        return None
+
+    @staticmethod
+    def compute_key(indic, data_key):
+        indic_json = json.dumps(indic.dict(), sort_keys=True, default=str)
+        key_hash = hashlib.sha256(indic_json.encode("utf-8"))
+        key_hash.update(data_key.encode("utf-8"))
+        return key_hash.hexdigest()
+
+    def entry_filename(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key):
+        """Cached indicator values, None if not cached."""
+        with self._lock:
+            indic_df = self._entries.get(key)
+            if indic_df is not None:
+                self._entries.move_to_end(key)
+                return indic_df
+
+        if self.cache_dir is None:
+            return None
+
+        entry_filename = self.entry_filename(key)
+        if not os.path.exists(entry_filename):
+            return None
+
+        indic_df = pd.read_parquet(entry_filename)
+        self.set_memory(key, indic_df)
+
+        return indic_df
+
+    def set_memory(self, key, indic_df):
+        with self._lock:
+            self._entries[key] = indic_df
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set(self, key, indic_df):
+        self.set_memory(key, indic_df)
+
+        if self.cache_dir is None:
+            return
+
+        if not ('pyarrow' in installed_pkg):
+            raise ModuleNotFoundError(
+                "Please install pyarrow to use features disk cache : pip install pyarrow")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=self.cache_dir,
+                                            suffix=".tmp")
+        os.close(fd)
+        indic_df.to_parquet(tmp_filename)
+        os.replace(tmp_filename, self.entry_filename(key))
+
+    def compute(self, indicators, ohlcv_df):
+        """Computes indicators on OHLCV data, using cached values if any.
+
+        Args:
+            indicators (list): Indicators to be computed.
+            ohlcv_df (pd.DataFrame): OHLCV data.
+
+        Returns:
+            list: Indicators values DataFrames.
+        """
+        dataset = self.find_dataset(ohlcv_df)
+        if dataset is None:
+            data_key = compute_data_fingerprint(ohlcv_df)
+        else:
+            ohlcv_full_df, data_key, i_start = dataset
+
+        indic_df_list = []
+        for indic in indicators:
+            key = self.compute_key(indic, data_key)
+            indic_df = self.get(key)
+            if indic_df is None:
+                indic_df = indic.compute(ohlcv_df if dataset is None
+                                         else ohlcv_full_df)
+                self.set(key, indic_df)
+            elif self.logger:
+                self.logger.debug(f"Indicator {indic.__class__.__name__} "
+                                  f"{key[:12]} loaded from cache")
+
+            if dataset is not None:
+                indic_df = indic_df.iloc[i_start:i_start + len(ohlcv_df)]
+
+            # Callers may modify returned values
+            indic_df_list.append(indic_df.copy())
+
+        return indic_df_list
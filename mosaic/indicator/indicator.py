@@ -1,4 +1,7 @@
-from pydantic import Field
+import typing
+import math
+from collections import deque
+from pydantic import Field, PrivateAttr
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 from ..core import ObjMOSAIC
@@ -71,10 +74,123 @@ class IndicatorOHLCV(Indicator):
         {v: v for v in ["open", "high", "low", "close", "volume"]},
         description="OHLCV variable name dictionnary")
 
+    _state: typing.Any = PrivateAttr(None)
+
     @property
     def bw_length(self):
         return super().bw_length + self.variation_length
 
+    def init_state(self, ohlcv_df):
+        """Initialize streaming state from OHLCV history.
+
+        After initialization, `update` gives for each new bar the same row
+        as `compute` on the whole history including this bar.
+
+        Args:
+            ohlcv_df (pd.DataFrame): OHLCV history.
+        """
+        self.reset_state()
+        for bar in ohlcv_df.to_dict("records"):
+            self.update_state(bar)
+
+    def update(self, bar):
+        """Update indicator with a new OHLCV bar.
+
+        Args:
+            bar (pd.Series or dict): OHLCV bar indexed by OHLCV variable names.
+
+        Returns:
+            pd.Series: Indicator values for this bar.
+        """
+        if self._state is None:
+            self.reset_state()
+
+        if isinstance(bar, pd.Series):
+            return pd.Series(self.update_state(bar.to_dict()),
+                             name=bar.name, dtype=float)
+        else:
+            return pd.Series(self.update_state(dict(bar)),
+                             dtype=float)
+
+    def reset_state(self):
+        """Reset streaming state: To be overloaded along with `update_state`
+
+        Default state is the minimal window of bars needed by `compute`.
+        """
+        self._state = {"bars": deque(maxlen=self.bw_length + 1)}
+
+    def update_state(self, bar):
+        """Update streaming state with a new bar and return indicator values.
+
+        Default implementation recomputes the indicator over the minimal
+        window of bars: To be overloaded with O(1) updates.
+
+        Args:
+            bar (dict): OHLCV bar indexed by OHLCV variable names.
+
+        Returns:
+            dict: Indicator values for this bar.
+        """
+        self._state["bars"].append(bar)
+
+        return self.compute(pd.DataFrame(list(self._state["bars"])))\
+                   .iloc[-1].to_dict()
+
+    def reset_variation_state(self):
+        """Reset the indicator history used by `update_variation`."""
+        self._state["var_hist"] = deque(maxlen=self.variation_length)
+        self._state["var_last"] = {}
+
+    def update_variation(self, indic, diff_var=[]):
+        """Streaming counterpart of `compute_variation`.
+
+        Args:
+            indic (dict): Indicator values for the current bar.
+            diff_var (list): Variables whose variation is computed as a
+                difference instead of a relative change.
+
+        Returns:
+            dict: Indicator values completed with variations.
+        """
+        if self.variation_length == 0:
+            return indic
+
+        var_hist = self._state["var_hist"]
+        var_last = self._state["var_last"]
+
+        # pct_change forward fills missing values before computing changes
+        indic_filled = {}
+        for var, value in indic.items():
+            if value != value:
+                value = var_last.get(var, math.nan)
+            indic_filled[var] = var_last[var] = value
+
+        indic_var = dict(indic)
+        pct_change_var = [var for var in indic.keys()
+                          if not (var in diff_var)]
+        for length in range(self.variation_length):
+            indic_prev = var_hist[-length - 1] \
+                if length < len(var_hist) else None
+            for var in pct_change_var:
+                value = math.nan
+                if indic_prev is not None:
+                    value = indic_filled[var]/indic_prev[0][var] - 1 \
+                        if indic_prev[0][var] != 0 else math.nan
+                    if math.isinf(value):
+                        value = math.nan
+                indic_var[f"{var}_var_{length + 1}"] = value
+            for var in diff_var:
+                value = math.nan
+                if indic_prev is not None:
+                    value = indic[var] - indic_prev[1][var]
+                    if math.isinf(value):
+                        value = math.nan
+                indic_var[f"{var}_var_{length + 1}"] = value
+
+        var_hist.append((indic_filled, indic))
+
+        return indic_var
+
     def add_variation_names(self, names):
         names_var = \
             {f"{key}_var_{length + 1}": f"{name}_var_{length + 1}"
@@ -3,9 +3,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import typing
-import pandas_ta as ta
+import math
 from pydantic import Field
 from .indicator import IndicatorOHLCV
+from .streaming import div, RollingSum
 import pkg_resources
 installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
 if 'ipdb' in installed_pkg:
@@ -48,15 +49,47 @@ http://stockcharts.com/school/doku.php?id=chart_school:technical_indicators:mone
 
         indic_df = pd.DataFrame(index=ohlcv_df.index)
 
-        indic_df[self.names("mfi")] = ta.mfi(
-            high=ohlcv_df[var_high],
-            low=ohlcv_df[var_low],
-            close=ohlcv_df[var_close],
-            volume=ohlcv_df[var_volume],
-            length=self.length)
+        # Money flows as done by pandas_ta mfi
+        typical_price = (ohlcv_df[var_high] +
+                         ohlcv_df[var_low] +
+                         ohlcv_df[var_close])/3.0
+        raw_money_flow = typical_price*ohlcv_df[var_volume]
+        typical_price_diff = typical_price.diff(1)
+
+        pos_money_flow = raw_money_flow.where(typical_price_diff > 0, 0.)
+        neg_money_flow = raw_money_flow.where(typical_price_diff < 0, 0.)
+
+        psum = pos_money_flow.rolling(self.length).sum()
+        nsum = neg_money_flow.rolling(self.length).sum()
+
+        indic_df[self.names("mfi")] = 100*psum/(psum + nsum)
 
         return indic_df
 
+    def reset_state(self):
+        self._state = {"typical_price": math.nan,
+                       "psum": RollingSum(self.length),
+                       "nsum": RollingSum(self.length)}
+
+    def update_state(self, bar):
+        typical_price = (bar[self.ohlcv_names.get("high", "high")] +
+                         bar[self.ohlcv_names.get("low", "low")] +
+                         bar[self.ohlcv_names.get("close", "close")])/3.0
+        raw_money_flow = \
+            typical_price*bar[self.ohlcv_names.get("volume", "volume")]
+        typical_price_diff = typical_price - self._state["typical_price"]
+        self._state["typical_price"] = typical_price
+
+        self._state["psum"].push(
+            raw_money_flow if typical_price_diff > 0 else 0.)
+        self._state["nsum"].push(
+            raw_money_flow if typical_price_diff < 0 else 0.)
+
+        psum = self._state["psum"].sum()
+        nsum = self._state["nsum"].sum()
+
+        return {self.names("mfi"): div(100*psum, psum + nsum)}
+
     def plotly(self, ohlcv_df, layout={}, ret_indic=False, plot_ohlcv=False, **params):
 
         indic_df = self.compute(ohlcv_df).dropna()
@@ -1,7 +1,10 @@
 import typing
+import math
+from collections import deque
 import pandas as pd
 from pydantic import Field
 from .indicator import IndicatorOHLCV
+from .streaming import div, RollingExtremum
 import pkg_resources
 installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
 if 'ipdb' in installed_pkg:
@@ -46,6 +49,27 @@ class Returns(ReturnsBaseIndicator):
         
         return indic_df
 
+    def reset_state(self):
+        length = -self.horizon + 1 if self.horizon <= 0 else 0
+        self._state = {"values": deque(maxlen=length + 1),
+                       "last": math.nan}
+
+    def update_state(self, bar):
+        value = bar[self.ohlcv_names.get(self.var)]
+        # pct_change forward fills missing values
+        if value != value:
+            value = self._state["last"]
+        self._state["last"] = value
+
+        values = self._state["values"]
+        values.append(value)
+
+        ret = math.nan
+        if self.horizon <= 0 and len(values) == values.maxlen:
+            ret = div(value, values[0]) - 1
+
+        return {self.names('ret'): ret}
+
 
 class ReturnsRolling(ReturnsBaseIndicator):
 
@@ -86,3 +110,28 @@ class ReturnsRolling(ReturnsBaseIndicator):
 
         return indic_df
 
+    def reset_state(self):
+        if not (self.fun in ["max", "min"]):
+            # Generic window recomputation
+            return super().reset_state()
+
+        shift_ref = 1 if self.horizon >= 0 else 1 - self.horizon
+        self._state = {
+            "rolling": RollingExtremum(abs(self.horizon) + 1, fun=self.fun),
+            "ref": deque(maxlen=shift_ref + 1),
+        }
+
+    def update_state(self, bar):
+        if not ("rolling" in self._state):
+            return super().update_state(bar)
+
+        self._state["rolling"].push(bar[self.ohlcv_names.get(self.var)])
+        ref = self._state["ref"]
+        ref.append(bar[self.ohlcv_names.get(self.var_ref)])
+
+        ret = math.nan
+        if self.horizon <= 0 and len(ref) == ref.maxlen:
+            ret = div(self._state["rolling"].value(), ref[0]) - 1
+
+        return {self.names('ret'): ret}
+
@@ -3,9 +3,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import typing
-import pandas_ta as ta
+import math
 from pydantic import Field
 from .indicator import IndicatorOHLCV
+from .streaming import div, RollingSum, EWMean
 import pkg_resources
 installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
 if 'ipdb' in installed_pkg:
@@ -41,23 +42,27 @@ class RSI(IndicatorOHLCV):
 
         indic_df = pd.DataFrame(index=ohlcv_df.index)
 
-        if self.mode == "simple":
-            close_delta = data_close.diff(1)
+        close_delta = data_close.diff(1)
 
-            delta_up = close_delta.copy(deep=True)
-            delta_up[delta_up < 0] = 0
-            delta_down = close_delta.copy(deep=True)
-            delta_down[delta_down > 0] = 0
+        delta_up = close_delta.copy(deep=True)
+        delta_up[delta_up < 0] = 0
+        delta_down = close_delta.copy(deep=True)
+        delta_down[delta_down > 0] = 0
 
+        if self.mode == "simple":
             roll_up = delta_up.rolling(self.length).mean()
             roll_down = delta_down.rolling(self.length).mean()
-
-            indic_df[self.names('rsi')] = 100*roll_up/(roll_up + roll_down.abs())
         elif self.mode == "ta":
-            indic_df[self.names('rsi')] = ta.rsi(data_close, length=self.length)
+            # Wilder smoothing as done by pandas_ta rsi
+            roll_up = delta_up.ewm(alpha=1/self.length,
+                                   min_periods=self.length).mean()
+            roll_down = delta_down.ewm(alpha=1/self.length,
+                                       min_periods=self.length).mean()
         else:
             raise ValueError(f"{self.mode} not supported")
 
+        indic_df[self.names('rsi')] = 100*roll_up/(roll_up + roll_down.abs())
+
         # if self.levels:
         #     indic_df[self.indic_d_name] = \
         #         pd.cut(indic_df[self.indic_name],
@@ -66,6 +71,36 @@ class RSI(IndicatorOHLCV):
 
         return indic_df
 
+    def reset_state(self):
+        if self.mode == "simple":
+            roll_up = RollingSum(self.length)
+            roll_down = RollingSum(self.length)
+        elif self.mode == "ta":
+            roll_up = EWMean(1/self.length, min_periods=self.length)
+            roll_down = EWMean(1/self.length, min_periods=self.length)
+        else:
+            raise ValueError(f"{self.mode} not supported")
+
+        self._state = {"close": math.nan,
+                       "roll_up": roll_up,
+                       "roll_down": roll_down}
+
+    def update_state(self, bar):
+        close = bar[self.ohlcv_names.get("close", "close")]
+        close_delta = close - self._state["close"]
+        self._state["close"] = close
+
+        self._state["roll_up"].push(
+            0. if close_delta < 0 else close_delta)
+        self._state["roll_down"].push(
+            0. if close_delta > 0 else close_delta)
+
+        roll_up = self._state["roll_up"].mean()
+        roll_down = self._state["roll_down"].mean()
+
+        return {self.names('rsi'):
+                div(100*roll_up, roll_up + abs(roll_down))}
+
     def plotly(self, ohlcv_df, layout={}, ret_indic=False, plot_ohlcv=False, **params):
 
         indic_df = self.compute(ohlcv_df).dropna()
@@ -5,6 +5,7 @@ import pandas as pd
 import typing
 from pydantic import Field
 from .indicator import IndicatorOHLCV
+from .streaming import RollingExtremum, RollingSorted
 import pkg_resources
 import numpy as np
 installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
@@ -12,6 +13,62 @@ if 'ipdb' in installed_pkg:
     import ipdb  # noqa: F401
 
 
+# Longest window for which hits are counted shift by shift: longer windows
+# are counted on a rolling sorted window
+WINDOW_HITS_SHIFT_MAX_LENGTH = 1024
+
+
+def count_window_hits(data, bound, length, side="lower"):
+    """
+    Count the values of a sliding window crossing a moving bound.
+
+    For each index t, counts the indices i in [t - length + 1, t] such that
+    data[i] < bound[t] (side "lower") or data[i] > bound[t] (side "upper").
+
+    Short windows are counted shift by shift over NumPy arrays, in
+    O(N*length) vectorized comparisons. Longer windows are counted on a
+    rolling sorted window (see `RollingSorted`): each index inserts its
+    value, removes the value leaving the window and counts the hits by
+    bisection, in O(N*log(length)) comparisons. Memory stays O(N + length)
+    in both cases.
+
+    Args:
+        data (np.ndarray): Values to be compared with the bound.
+        bound (np.ndarray): Bound value at each index.
+        length (int): Window length.
+        side (str, optional): "lower" or "upper" bound. Defaults to "lower".
+
+    Returns:
+        np.ndarray: Number of hits at each index.
+    """
+    if side == "lower":
+        cmp_fun = np.less
+    elif side == "upper":
+        cmp_fun = np.greater
+    else:
+        raise ValueError(f"{side} bound side not supported")
+
+    nb_data = len(data)
+    hits = np.zeros(nb_data, dtype=np.int64)
+
+    if length > WINDOW_HITS_SHIFT_MAX_LENGTH:
+        window = RollingSorted(length)
+        count_hits = window.count_lt if side == "lower" else window.count_gt
+        for idx, (value, bound_value) in \
+                enumerate(zip(np.asarray(data, dtype=float).tolist(),
+                              np.asarray(bound, dtype=float).tolist())):
+            window.push(value)
+            hits[idx] = count_hits(bound_value)
+        return hits
+
+    is_hit = np.empty(nb_data, dtype=bool)
+    for shift in range(min(length, nb_data)):
+        cmp_fun(data[:nb_data - shift], bound[shift:], out=is_hit[shift:])
+        hits[shift:] += is_hit[shift:]
+
+    return hits
+
+
 class RangeIndex(IndicatorOHLCV):
     """
     Compute the range index indicator for OHLCV data.
@@ -84,7 +141,7 @@ class RangeIndex(IndicatorOHLCV):
 
         idx_range_0 = data_range == 0
 
-        indic_df[self.names("ri")] = 0
+        indic_df[self.names("ri")] = 0.
         
         indic_df.loc[~idx_range_0, self.names("ri")] = \
             2*(data_var_ri.loc[~idx_range_0] -
@@ -95,6 +152,48 @@ class RangeIndex(IndicatorOHLCV):
         else:
             return indic_df
 
+    def reset_state(self):
+        """
+        Reset the streaming state (rolling range bounds).
+        """
+        self._state = {
+            "range_min": RollingExtremum(self.length, fun="min"),
+            "range_max": RollingExtremum(self.length, fun="max"),
+        }
+
+    def update_state(self, bar, return_range=False):
+        """
+        Update the indicator with a new bar.
+
+        Args:
+            bar (dict): OHLCV bar.
+            return_range (bool, optional): Whether to return the range. Defaults to False.
+
+        Returns:
+            dict: Indicator values.
+        """
+        self._state["range_min"].push(
+            bar[self.ohlcv_names.get(self.var_range_min)])
+        self._state["range_max"].push(
+            bar[self.ohlcv_names.get(self.var_range_max)])
+
+        range_min = self._state["range_min"].value()
+        range_max = self._state["range_max"].value()
+        data_range = range_max - range_min
+
+        if data_range == 0:
+            ri = 0.
+        else:
+            ri = 2*((bar[self.ohlcv_names.get(self.var_ri)] -
+                     range_min)/data_range) - 1
+
+        indic = {self.names("ri"): ri}
+
+        if return_range:
+            return indic, range_min, range_max
+        else:
+            return indic
+
     def plotly(self, ohlcv_df, layout={}, ret_indic=False, **params):
         """
         Plot the indicator using Plotly.
@@ -226,29 +325,58 @@ class SRI(RangeIndex):
         indic_df, data_range_min, data_range_max = \
             super().compute(ohlcv_df, return_range=True, **kwrds)
 
-        ohlcv_low_shift_df = \
-            pd.concat([ohlcv_df[var_hit_low].shift(i).rename(i)
-                       for i in range(self.length)], axis=1)
-        indic_bmin_dup_df = \
-            pd.concat([data_range_min.rename(i)
-                       for i in range(self.length)], axis=1)
-        indic_df[self.names("hl")] = \
-            (ohlcv_low_shift_df < indic_bmin_dup_df).sum(axis=1).astype(float)
-
-        ohlcv_high_shift_df = \
-            pd.concat([ohlcv_df[var_hit_high].shift(i).rename(i)
-                       for i in range(self.length)], axis=1)
-        indic_bmax_dup_df = \
-            pd.concat([data_range_max.rename(i)
-                       for i in range(self.length)], axis=1)
-        indic_df[self.names("hh")] = \
-            (ohlcv_high_shift_df > indic_bmax_dup_df).sum(axis=1).astype(float)
-        
+        indic_df[self.names("hl")] = count_window_hits(
+            ohlcv_df[var_hit_low].to_numpy(dtype=float),
+            data_range_min.to_numpy(dtype=float),
+            self.length, side="lower").astype(float)
+
+        indic_df[self.names("hh")] = count_window_hits(
+            ohlcv_df[var_hit_high].to_numpy(dtype=float),
+            data_range_max.to_numpy(dtype=float),
+            self.length, side="upper").astype(float)
+
         if return_range:
             return indic_df, data_range_min, data_range_max
         else:
             return indic_df
 
+    def reset_state(self):
+        """
+        Reset the streaming state (rolling range bounds and sorted hits windows).
+        """
+        super().reset_state()
+        self._state["hit_min"] = RollingSorted(self.length)
+        self._state["hit_max"] = RollingSorted(self.length)
+
+    def update_state(self, bar, return_range=False):
+        """
+        Update the indicator with a new bar.
+
+        Args:
+            bar (dict): OHLCV bar.
+            return_range (bool, optional): Whether to return the range. Defaults to False.
+
+        Returns:
+            dict: Indicator values.
+        """
+        indic, range_min, range_max = \
+            super().update_state(bar, return_range=True)
+
+        self._state["hit_min"].push(
+            bar[self.ohlcv_names.get(self.var_hit_min)])
+        self._state["hit_max"].push(
+            bar[self.ohlcv_names.get(self.var_hit_max)])
+
+        indic[self.names("hl")] = \
+            float(self._state["hit_min"].count_lt(range_min))
+        indic[self.names("hh")] = \
+            float(self._state["hit_max"].count_gt(range_max))
+
+        if return_range:
+            return indic, range_min, range_max
+        else:
+            return indic
+
     def plotly(self, ohlcv_df, layout={}, ret_indic=False, **params):
         """
         Plot the indicator using Plotly.
@@ -0,0 +1,217 @@
+import math
+import bisect
+from collections import deque
+import pkg_resources
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+def div(num, den):
+    """Float division following numpy/pandas conventions (x/0 = +-inf, 0/0 = nan)."""
+    if den == 0:
+        if num == 0 or math.isnan(num):
+            return math.nan
+        return math.copysign(math.inf, num)*math.copysign(1, den)
+    return num/den
+
+
+def nanmin(*values):
+    """Minimum skipping NaN values as done by pandas reductions."""
+    values = [v for v in values if not math.isnan(v)]
+    return min(values) if values else math.nan
+
+
+def nanmax(*values):
+    """Maximum skipping NaN values as done by pandas reductions."""
+    values = [v for v in values if not math.isnan(v)]
+    return max(values) if values else math.nan
+
+
+class RollingSum:
+    """Fixed window rolling sum/mean updated in O(1).
+
+    Replicates pandas fixed window `rolling(length).sum()` and
+    `rolling(length).mean()` algorithm (Kahan compensated running sum with
+    separate add/remove compensations) so that streaming values are equal
+    to batch values.
+    """
+
+    def __init__(self, length, min_periods=None):
+        self.length = length
+        self.min_periods = length if min_periods is None else min_periods
+        self.values = deque(maxlen=length)
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.
+        self.comp_add = 0.
+        self.comp_remove = 0.
+        self.nb_same_value = 0
+        self.prev_value = math.nan
+
+    def push(self, val):
+        if len(self.values) == self.length:
+            self.remove(self.values[0])
+        self.values.append(val)
+        self.add(val)
+
+    def add(self, val):
+        if val != val:
+            return
+        self.nobs += 1
+        y = val - self.comp_add
+        t = self.sum_x + y
+        self.comp_add = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1, val) < 0:
+            self.neg_ct += 1
+        if val == self.prev_value:
+            self.nb_same_value += 1
+        else:
+            self.nb_same_value = 1
+        self.prev_value = val
+
+    def remove(self, val):
+        if val != val:
+            return
+        self.nobs -= 1
+        y = -val - self.comp_remove
+        t = self.sum_x + y
+        self.comp_remove = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1, val) < 0:
+            self.neg_ct -= 1
+
+    def sum(self):
+        if self.nobs == 0 == self.min_periods:
+            return 0.
+        if self.nobs >= self.min_periods:
+            if self.nb_same_value >= self.nobs:
+                return self.prev_value*self.nobs
+            return self.sum_x
+        return math.nan
+
+    def mean(self):
+        if self.nobs >= self.min_periods and self.nobs > 0:
+            result = self.sum_x/self.nobs
+            if self.nb_same_value >= self.nobs:
+                return self.prev_value
+            if self.neg_ct == 0 and result < 0:
+                return 0.
+            if self.neg_ct == self.nobs and result > 0:
+                return 0.
+            return result
+        return math.nan
+
+
+class RollingExtremum:
+    """Fixed window rolling min or max updated in amortized O(1).
+
+    A monotonic deque keeps the candidates of the current window extremum.
+    """
+
+    def __init__(self, length, fun="max"):
+        self.length = length
+        self.is_max = fun == "max"
+        self.it = 0
+        # Observation flags of the window and their running count
+        self.is_obs = deque(maxlen=length)
+        self.nobs = 0
+        self.candidates = deque()
+
+    def push(self, val):
+        is_obs = val == val
+        if len(self.is_obs) == self.length:
+            self.nobs -= self.is_obs[0]
+        self.is_obs.append(is_obs)
+        self.nobs += is_obs
+        if is_obs:
+            if self.is_max:
+                while self.candidates and self.candidates[-1][1] <= val:
+                    self.candidates.pop()
+            else:
+                while self.candidates and self.candidates[-1][1] >= val:
+                    self.candidates.pop()
+            self.candidates.append((self.it, val))
+        while self.candidates and \
+                self.candidates[0][0] <= self.it - self.length:
+            self.candidates.popleft()
+        self.it += 1
+
+    def value(self):
+        if self.nobs < self.length:
+            return math.nan
+        return self.candidates[0][1]
+
+
+class RollingSorted:
+    """Sorted values of a fixed window, to count values above/below a bound.
+
+    NaN values are never counted (any comparison with NaN is False).
+    """
+
+    def __init__(self, length):
+        self.values = deque(maxlen=length)
+        self.sorted = []
+
+    def push(self, val):
+        if len(self.values) == self.values.maxlen:
+            val_old = self.values[0]
+            if val_old == val_old:
+                del self.sorted[bisect.bisect_left(self.sorted, val_old)]
+        self.values.append(val)
+        if val == val:
+            bisect.insort(self.sorted, val)
+
+    def count_lt(self, bound):
+        if bound != bound:
+            return 0
+        return bisect.bisect_left(self.sorted, bound)
+
+    def count_gt(self, bound):
+        if bound != bound:
+            return 0
+        return len(self.sorted) - bisect.bisect_right(self.sorted, bound)
+
+
+class EWMean:
+    """Exponentially weighted mean updated in O(1).
+
+    Replicates pandas `ewm(alpha=alpha, adjust=adjust,
+    min_periods=min_periods).mean()` recursion.
+    """
+
+    def __init__(self, alpha, adjust=True, min_periods=0):
+        com = (1. - alpha)/alpha
+        self.alpha = 1./(1. + com)
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.old_wt_factor = 1. - self.alpha
+        self.new_wt = 1. if adjust else self.alpha
+        self.old_wt = 1.
+        self.weighted = None
+        self.nobs = 0
+
+    def push(self, cur):
+        is_obs = cur == cur
+        self.nobs += is_obs
+        if self.weighted is None:
+            self.weighted = cur
+        elif self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_obs:
+                if self.weighted != cur:
+                    self.weighted = \
+                        (self.old_wt*self.weighted + self.new_wt*cur) / \
+                        (self.old_wt + self.new_wt)
+                if self.adjust:
+                    self.old_wt += self.new_wt
+                else:
+                    self.old_wt = 1.
+        elif is_obs:
+            self.weighted = cur
+
+    def mean(self):
+        if self.weighted is None or self.nobs < self.min_periods:
+            return math.nan
+        return self.weighted
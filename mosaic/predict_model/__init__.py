@@ -1,3 +1,4 @@
 from .pm_base import PredictModelBase, PMReturns, PMReturnsUpDown
-from .pm_stats import PMOLS, PMLogit
+from .pm_stats import PMOLS, PMRLS, PMLogit
 from .pm_lstm import PMLSTM
+from .pm_cache import PMCache
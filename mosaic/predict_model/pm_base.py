@@ -1,12 +1,15 @@
 import pydantic
 import typing
 import copy
+import collections
+import numpy as np
 import pandas as pd
 #import tqdm
 from ..core import ObjMOSAIC
 from ..utils.data_management import HyperParams
 #from ..trading.core import SignalBase
 from ..indicator.indicator import IndicatorOHLCV
+from ..indicator.features_cache import FeaturesCache
 import sklearn.preprocessing as skp
 
 
@@ -30,6 +33,9 @@ class PredictModelBase(ObjMOSAIC):
     var_features: typing.List[str] = pydantic.Field(
         [], description="List of features variable names")
 
+    features_cache: FeaturesCache = pydantic.Field(
+        None, description="Computed features cache, may be shared by several models")
+
     sk_preproc: str = pydantic.Field(
         None, description="Name of the sklearn preprocessing class")
 
@@ -62,6 +68,11 @@ class PredictModelBase(ObjMOSAIC):
         return max([indic.bw_length
                     for indic in self.features]) if self.features else 0
 
+    @property
+    def online(self):
+        """Indicates if the model is updated with new bars (see `update`)."""
+        return False
+
     def __init__(self, **data: typing.Any):
         super().__init__(**data)
 
@@ -85,9 +96,13 @@ class PredictModelBase(ObjMOSAIC):
 
     def compute_features(self, ohlcv_df):
 
-        features_df_list = \
-            [indic.compute(ohlcv_df)
-             for indic in self.features]
+        if self.features_cache is None:
+            features_df_list = \
+                [indic.compute(ohlcv_df)
+                 for indic in self.features]
+        else:
+            features_df_list = \
+                self.features_cache.compute(self.features, ohlcv_df)
         if features_df_list:
             features_df = pd.concat(features_df_list, axis=1)
         else:
@@ -96,6 +111,33 @@ class PredictModelBase(ObjMOSAIC):
         self.var_features = list(features_df.columns)
         
         return features_df
+
+    def get_fitted_state(self):
+        """Fitted attributes of the model, to be stored in a model cache."""
+        return {"bkd": self.bkd,
+                "var_features": self.var_features,
+                "sk_preproc_features": self.sk_preproc_features,
+                "sk_preproc_target": self.sk_preproc_target}
+
+    def set_fitted_state(self, fitted_state):
+        """Restores fitted attributes given by `get_fitted_state`."""
+        for attr, value in fitted_state.items():
+            setattr(self, attr, value)
+
+    def update(self, ohlcv_df, **kwrds):
+        """Updates a fitted online model with new OHLCV bars.
+
+        Nothing is done by default: To be overloaded by online models.
+        """
+        return self
+
+    def predict_last(self, ohlcv_df, **kwrds):
+        """Prediction for the last OHLCV bar only (live trading).
+
+        Default implementation predicts on all bars: To be overloaded by
+        models able to predict the last bar only.
+        """
+        return self.predict(ohlcv_df, **kwrds).iloc[-1:]
     
 
 
@@ -104,6 +146,8 @@ class PMReturns(PredictModelBase):
     returns_horizon: int = \
         pydantic.Field(0, description="Close returns horizon to be predicted")
 
+    _features_buffer: dict = pydantic.PrivateAttr(None)
+
     @property
     def bw_length(self):
         return super().bw_length
@@ -151,6 +195,10 @@ class PMReturns(PredictModelBase):
         if dropna:
             features_df.dropna(inplace=True)
 
+        return self.preproc_features(features_df)
+
+    def preproc_features(self, features_df):
+
         if self.sk_preproc is not None:
             features_arr = self.sk_preproc_features.transform(features_df)
             features_df = pd.DataFrame(features_arr,
@@ -159,6 +207,50 @@ class PMReturns(PredictModelBase):
 
         return features_df
 
+    def update_features_buffer(self, ohlcv_df, buffer_length=1):
+        """Rolling buffer of the last pre processed features rows.
+
+        Features of the bars following the buffer last bar are computed with
+        the features indicators streaming updates. The buffer is rebuilt
+        from the whole OHLCV data when they do not follow it.
+
+        Args:
+            ohlcv_df (pd.DataFrame): Last OHLCV bars.
+            buffer_length (int): Number of features rows kept.
+
+        Returns:
+            pd.DataFrame: Last `buffer_length` pre processed features rows.
+        """
+        buffer = self._features_buffer
+
+        if buffer is None or buffer["length"] != buffer_length or \
+           not (buffer["index"][-1] in ohlcv_df.index):
+            features_df = self.preproc_features(
+                self.compute_features(ohlcv_df)).iloc[-buffer_length:]
+            for indic in self.features:
+                indic.init_state(ohlcv_df)
+
+            buffer = self._features_buffer = dict(
+                length=buffer_length,
+                index=collections.deque(features_df.index,
+                                        maxlen=buffer_length),
+                values=collections.deque(features_df.to_numpy(dtype=float),
+                                         maxlen=buffer_length))
+        else:
+            ohlcv_new_df = ohlcv_df.loc[ohlcv_df.index > buffer["index"][-1]]
+            for dt, bar in ohlcv_new_df.iterrows():
+                features_df = pd.DataFrame(
+                    [pd.concat([indic.update(bar)
+                                for indic in self.features])],
+                    index=[dt])[self.var_features]
+                buffer["index"].append(dt)
+                buffer["values"].append(
+                    self.preproc_features(features_df).to_numpy(dtype=float)[0])
+
+        return pd.DataFrame(np.array(buffer["values"]),
+                            index=list(buffer["index"]),
+                            columns=self.var_features)
+
     
     def postproc_data_predict(self, data_pred, **kwrds):
 
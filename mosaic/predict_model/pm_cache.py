@@ -0,0 +1,119 @@
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import typing
+import pydantic
+from ..core import ObjMOSAIC
+from ..utils.data_management import compute_data_fingerprint
+
+import pkg_resources
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class PMCache(ObjMOSAIC):
+    """On disk cache of fitted predict models.
+
+    A fitted model is stored under a key made of a hash of the model
+    configuration (`dict()` without the fitted attributes) and a
+    fingerprint of the fit data. Least recently used entries are evicted
+    when the cache holds more than `max_entries` models.
+    """
+
+    cache_dir: str = pydantic.Field(
+        "pm_cache", description="Cache directory")
+
+    max_entries: int = pydantic.Field(
+        100, description="Maximum number of cached models")
+
+    logger: typing.Any = pydantic.Field(
+        None, description="Logger")
+
+    def dict(self, **kwrds):
+
+        if kwrds.get("exclude"):
+            kwrds["exclude"].add("logger")
+        else:
+            kwrds["exclude"] = {"logger"}
+
+        return super().dict(**kwrds)
+
+    def compute_key(self, pm, ohlcv_df):
+        """Cache key of a model fitted on OHLCV data."""
+        pm_specs = pm.dict(exclude={"var_features",
+                                    "sk_preproc_features",
+                                    "sk_preproc_target",
+                                    "features_cache"})
+        pm_json = json.dumps(pm_specs, sort_keys=True, default=str)
+
+        key_hash = hashlib.sha256(pm_json.encode("utf-8"))
+        key_hash.update(compute_data_fingerprint(ohlcv_df).encode("utf-8"))
+        return key_hash.hexdigest()
+
+    def entry_filename(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def load(self, key):
+        """Returns the fitted state stored under key, None if not cached."""
+        entry_filename = self.entry_filename(key)
+        try:
+            with open(entry_filename, "rb") as entry_file:
+                fitted_state = pickle.load(entry_file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Mark entry as recently used
+        os.utime(entry_filename)
+
+        return fitted_state
+
+    def save(self, key, fitted_state):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Atomic write, cache may be shared by sweep workers
+        fd, tmp_filename = tempfile.mkstemp(dir=self.cache_dir,
+                                            suffix=".tmp")
+        with os.fdopen(fd, "wb") as entry_file:
+            pickle.dump(fitted_state, entry_file)
+        os.replace(tmp_filename, self.entry_filename(key))
+
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used entries beyond `max_entries`."""
+        entry_filenames = sorted(
+            [os.path.join(self.cache_dir, filename)
+             for filename in os.listdir(self.cache_dir)
+             if filename.endswith(".pkl")],
+            key=os.path.getmtime)
+
+        for entry_filename in entry_filenames[:-self.max_entries or None]:
+            try:
+                os.remove(entry_filename)
+            except FileNotFoundError:
+                pass
+
+    def fit(self, pm, ohlcv_df, **kwrds):
+        """Fits a model, or loads its fitted state when already cached.
+
+        Returns:
+            bool: True on cache hit.
+        """
+        key = self.compute_key(pm, ohlcv_df)
+
+        fitted_state = self.load(key)
+        if fitted_state is not None:
+            pm.set_fitted_state(fitted_state)
+            if self.logger:
+                self.logger.info(f"Fitted model {key[:12]} loaded from cache")
+            return True
+
+        pm.fit(ohlcv_df, **kwrds)
+        self.save(key, pm.get_fitted_state())
+        if self.logger:
+            self.logger.info(f"Fitted model {key[:12]} stored in cache")
+
+        return False
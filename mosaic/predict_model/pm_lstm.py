@@ -3,6 +3,7 @@ import typing
 import numpy as np
 import random
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 try:
     import tensorflow as tf
     import tensorflow.keras as tfk
@@ -40,6 +41,40 @@ class LSTMParam(HyperParams):
     batch_size: int = pydantic.Field(32, description="Batch size for training.")
     seed: int = pydantic.Field(None, description="Seed of the random generators")
 
+def compute_windows(data_arr, seq_length):
+    """Sequences of `seq_length` consecutive rows of a 2-D array.
+
+    Sequences are returned as a read-only strided view of shape
+    (nb_rows - seq_length + 1, seq_length, nb_cols): no data is copied.
+    """
+    data_arr = np.asarray(data_arr)
+    nb_seq = max(len(data_arr) - seq_length + 1, 0)
+    if nb_seq == 0:
+        return np.empty((0, seq_length) + data_arr.shape[1:],
+                        dtype=data_arr.dtype)
+
+    return np.moveaxis(sliding_window_view(data_arr, seq_length, axis=0),
+                       -1, 1)
+
+
+def iter_batches(batch_size, *data_arr_list, shuffle=False):
+    """Yields contiguous batches of arrays sharing the same first dimension.
+
+    Only the current batch is copied in memory, so that windows views can be
+    consumed without building the full 3-D tensor.
+    """
+    data_len = len(data_arr_list[0])
+    idx = np.random.permutation(data_len) if shuffle else None
+    for i in range(0, data_len, batch_size):
+        if shuffle:
+            batch = [data_arr[np.sort(idx[i:i + batch_size])]
+                     for data_arr in data_arr_list]
+        else:
+            batch = [np.ascontiguousarray(data_arr[i:i + batch_size])
+                     for data_arr in data_arr_list]
+        yield batch[0] if len(batch) == 1 else tuple(batch)
+
+
 class PMLSTM(PMReturns):
     """
     LSTM based predictive model for financial time series data.
@@ -52,6 +87,9 @@ class PMLSTM(PMReturns):
     params: LSTMParam = \
         pydantic.Field(LSTMParam(), description="LSTM hyper parameters")
 
+    batch_streaming: bool = \
+        pydantic.Field(False, description="Feed the network with batches of sequences built on the fly instead of the full sequences tensor")
+
     @property
     def bw_length(self):
         return super().bw_length + self.params.seq_length - 1
@@ -123,25 +161,10 @@ class PMLSTM(PMReturns):
             super().prepare_data_fit(ohlcv_df,
                                      dropna=dropna, **kwrds)
 
-        data_len = len(features_df)
-        features_arr_list = []
-        target_arr_list = []
-        
-        for i in range(data_len - self.params.seq_length + 1):
-            features_cur_df = \
-                features_df.iloc[i:(i + self.params.seq_length)]
-            features_arr = features_cur_df.values
-            # target_cur_s = target_s.iloc[i:i + self.params.seq_length]
-            # features_seq_cur_df = \
-            #     pd.concat([features_cur_df, target_cur_s],
-            #               axis=1)
-            # features_seq = features_seq_cur_df.values
-            target_val = target_s.iloc[i + self.params.seq_length - 1]
-            features_arr_list.append(features_arr)
-            target_arr_list.append(target_val)
-
-        features_arr = np.array(features_arr_list)
-        target_arr = np.array(target_arr_list)
+        # Sequences are views on the features array (no copy)
+        features_arr = compute_windows(features_df.to_numpy(dtype=float),
+                                       self.params.seq_length)
+        target_arr = target_s.to_numpy()[self.params.seq_length - 1:]
 
         return features_arr, target_arr
 
@@ -161,15 +184,8 @@ class PMLSTM(PMReturns):
             super().prepare_data_predict(ohlcv_df,
                                          dropna=dropna, **kwrds)
 
-        data_len = len(features_df)
-        features_arr_list = []
-
-        for i in range(data_len - self.params.seq_length + 1):
-            features_cur_df = \
-                features_df.iloc[i:(i + self.params.seq_length)]
-            features_arr_list.append(features_cur_df.values)
-
-        features_arr = np.array(features_arr_list)
+        features_arr = compute_windows(features_df.to_numpy(dtype=float),
+                                       self.params.seq_length)
 
         return features_arr
 
@@ -187,13 +203,44 @@ class PMLSTM(PMReturns):
         features_arr, target_arr = self.prepare_data_fit(ohlcv_df, **kwrds)
 
         self.build_model(features_arr.shape)
-        self.bkd.fit(features_arr, target_arr,
-                     epochs=self.params.epochs,
-                     batch_size=self.params.batch_size)
+
+        if self.batch_streaming:
+            data_fit = tf.data.Dataset.from_generator(
+                lambda: iter_batches(self.params.batch_size,
+                                     features_arr, target_arr,
+                                     shuffle=True),
+                output_signature=(
+                    tf.TensorSpec(shape=(None,) + features_arr.shape[1:],
+                                  dtype=tf.as_dtype(features_arr.dtype)),
+                    tf.TensorSpec(shape=(None,),
+                                  dtype=tf.as_dtype(target_arr.dtype))))
+            self.bkd.fit(data_fit,
+                         epochs=self.params.epochs)
+        else:
+            self.bkd.fit(features_arr, target_arr,
+                         epochs=self.params.epochs,
+                         batch_size=self.params.batch_size)
 
         return self
 
 
+    def get_fitted_state(self):
+        """Keras network is stored as architecture and weights."""
+        fitted_state = super().get_fitted_state()
+        if self.bkd is not None:
+            fitted_state["bkd"] = {"config": self.bkd.to_json(),
+                                   "weights": self.bkd.get_weights()}
+        return fitted_state
+
+    def set_fitted_state(self, fitted_state):
+        fitted_state = dict(fitted_state)
+        bkd_state = fitted_state.pop("bkd")
+        super().set_fitted_state(fitted_state)
+        if bkd_state is not None:
+            self.bkd = tfk.models.model_from_json(bkd_state["config"])
+            self.bkd.set_weights(bkd_state["weights"])
+            self.bkd.compile(optimizer='adam', loss='mean_squared_error')
+
     def predict(self, ohlcv_df, **kwrds):
         """
         Predicts using the trained LSTM model on the provided OHLCV data.
@@ -210,7 +257,14 @@ class PMLSTM(PMReturns):
         #                           features_arr.shape[1:])
 
         #ipdb.set_trace()
-        predictions_arr_raw = self.bkd.predict(features_arr)
+        if self.batch_streaming:
+            predictions_arr_raw = np.concatenate(
+                [self.bkd.predict_on_batch(features_batch_arr)
+                 for features_batch_arr in iter_batches(
+                     self.params.batch_size, features_arr)]
+                or [np.empty((0, 1))])
+        else:
+            predictions_arr_raw = self.bkd.predict(features_arr)
 
         predictions_arr = self.postproc_data_predict(predictions_arr_raw)
 
@@ -220,3 +274,30 @@ class PMLSTM(PMReturns):
 
         return predictions_s
 
+    def predict_last(self, ohlcv_df, **kwrds):
+        """
+        Predicts the last OHLCV bar only, for live trading.
+
+        Features of new bars are computed incrementally in a rolling buffer
+        of `seq_length` rows, and the network is called directly on this
+        single sequence (no Keras predict batching overhead).
+
+        Args:
+            ohlcv_df (DataFrame): Last OHLCV data.
+
+        Returns:
+            Series: Predicted value of the last bar.
+        """
+        features_df = \
+            self.update_features_buffer(ohlcv_df,
+                                        buffer_length=self.params.seq_length)
+
+        predictions_arr_raw = np.asarray(
+            self.bkd(features_df.to_numpy(dtype=float)[np.newaxis],
+                     training=False))
+
+        predictions_arr = self.postproc_data_predict(predictions_arr_raw)
+
+        return pd.Series(predictions_arr.flatten(),
+                         index=ohlcv_df.index[-1:],
+                         name=self.var_target)
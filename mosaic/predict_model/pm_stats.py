@@ -1,5 +1,8 @@
 import pydantic
 import typing
+import collections
+import numpy as np
+import pandas as pd
 import statsmodels.api as sm
 
 from .pm_base import PMReturns, PMReturnsUpDown
@@ -38,6 +41,148 @@ class PMOLS(PMReturns):
         return target_pred_s
 
 
+class PMRLS(PMReturns):
+    """Online OLS model updated by recursive least squares.
+
+    The model is first fitted by (weighted) least squares, then its
+    coefficients are updated in O(p^2) each time the target of a new bar
+    is known, instead of refitting on the whole window. With a forgetting
+    factor `lambda` < 1, coefficients are the weighted least squares
+    estimates with weights `lambda^(n - i)` for the i-th of n bars.
+
+    Model state (coefficients, inverse information matrix and last bar
+    used) is stored in `bkd`.
+    """
+
+    forgetting_factor: float = \
+        pydantic.Field(1, description="Forgetting factor applied to past bars (1 means no forgetting)",
+                       gt=0, le=1)
+
+    record_coefs: bool = \
+        pydantic.Field(False, description="Record coefficients after each update")
+
+    coefs_history_length: int = \
+        pydantic.Field(10000, description="Maximum number of coefficients snapshots kept (oldest ones are dropped)",
+                       gt=0)
+
+    _coefs_history: collections.deque = pydantic.PrivateAttr(None)
+
+    @property
+    def bw_length(self):
+        # Target of a bar is known returns_horizon + 1 bars later
+        return super().bw_length + self.returns_horizon + 1
+
+    @property
+    def online(self):
+        return True
+
+    @property
+    def var_coefs(self):
+        return ["const"] + self.var_features
+
+    @property
+    def coefs(self):
+        """Current coefficients."""
+        return pd.Series(self.bkd["coefs"], index=self.var_coefs)
+
+    @property
+    def coefs_history(self):
+        """Coefficients snapshots indexed by the last bar used."""
+        if self._coefs_history is None:
+            return pd.DataFrame(columns=self.var_coefs)
+
+        return pd.DataFrame([coefs for _, coefs in self._coefs_history],
+                            index=[dt for dt, _ in self._coefs_history],
+                            columns=self.var_coefs)
+
+    def record(self):
+        if self.record_coefs:
+            if self._coefs_history is None:
+                self._coefs_history = \
+                    collections.deque(maxlen=self.coefs_history_length)
+            self._coefs_history.append((self.bkd["dt_last"],
+                                        self.bkd["coefs"].copy()))
+
+    def fit(self, ohlcv_df, **kwrds):
+
+        features_df, target_s = self.prepare_data_fit(ohlcv_df, **kwrds)
+
+        X = sm.add_constant(features_df, has_constant="add").to_numpy(dtype=float)
+        y = target_s.to_numpy(dtype=float)
+        weights = self.forgetting_factor**np.arange(len(y) - 1, -1, -1)
+
+        P = np.linalg.pinv((X*weights[:, np.newaxis]).T @ X)
+        self.bkd = {"coefs": P @ (X.T @ (weights*y)),
+                    "P": P,
+                    "dt_last": target_s.index[-1]}
+
+        self._coefs_history = None
+        self.record()
+
+        return self
+
+    def update_one(self, x, y):
+        """Recursive least squares update with one observation."""
+        coefs = self.bkd["coefs"]
+        P = self.bkd["P"]
+
+        Px = P @ x
+        gain = Px/(self.forgetting_factor + x @ Px)
+        self.bkd["coefs"] = coefs + gain*(y - x @ coefs)
+        self.bkd["P"] = (P - np.outer(gain, Px))/self.forgetting_factor
+
+    def update(self, ohlcv_df, **kwrds):
+        """Updates coefficients with the bars following the last bar used.
+
+        Only bars whose target is known (i.e. followed by
+        returns_horizon + 1 bars in `ohlcv_df`) are used.
+        """
+        features_df = self.preproc_features(self.compute_features(ohlcv_df))
+        target_s = self.compute_returns(ohlcv_df)
+        if self.sk_preproc is not None:
+            target_s = pd.Series(
+                self.sk_preproc_target.transform(
+                    target_s.to_numpy().reshape(-1, 1)).flatten(),
+                index=target_s.index)
+
+        data_all_df = pd.concat([features_df, target_s], axis=1).dropna()
+        data_all_df = data_all_df.loc[data_all_df.index > self.bkd["dt_last"]]
+
+        X = sm.add_constant(data_all_df[self.var_features],
+                            has_constant="add").to_numpy(dtype=float)
+        for dt, x, y in zip(data_all_df.index, X,
+                            data_all_df.iloc[:, -1].to_numpy(dtype=float)):
+            self.update_one(x, y)
+            self.bkd["dt_last"] = dt
+            self.record()
+
+        return self
+
+    def predict(self, ohlcv_df, **kwrds):
+
+        features_df = self.prepare_data_predict(ohlcv_df, dropna=False)
+
+        X = sm.add_constant(features_df, has_constant="add")
+        target_pred_arr = self.postproc_data_predict(
+            (X.to_numpy(dtype=float) @ self.bkd["coefs"]).reshape(-1, 1))
+
+        return pd.Series(target_pred_arr.flatten(),
+                         index=features_df.index,
+                         name=self.var_target)
+
+    def predict_last(self, ohlcv_df, **kwrds):
+
+        features_df = self.update_features_buffer(ohlcv_df)
+
+        X = sm.add_constant(features_df, has_constant="add")
+        target_pred_arr = self.postproc_data_predict(
+            (X.to_numpy(dtype=float) @ self.bkd["coefs"]).reshape(-1, 1))
+
+        return pd.Series(target_pred_arr.flatten(),
+                         index=ohlcv_df.index[-1:],
+                         name=self.var_target)
+
+
 class PMLogit(PMReturnsUpDown):
 
     def fit(self, ohlcv_df, **kwrds):
@@ -0,0 +1,107 @@
+import mosaic.indicator as mid
+import mosaic.decision_model as mdm
+import mosaic.predict_model as mpm
+import pytest
+import pkg_resources
+from testing_tools import create_bot, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+BOT_SPECS = {'name': 'bot_btclassic',
+             'order_model': {'cls': 'OrderMarket',
+                             'params': {'exec_bound_rate': 0.001}}}
+
+
+class PMRLSFixed(mpm.PMRLS):
+    """PMRLS model whose coefficients are not updated."""
+
+    @property
+    def online(self):
+        return False
+
+    def update(self, ohlcv_df, **kwrds):
+        return self
+
+
+def test_btclassic_dm_precompute_001():
+    """Precomputed decisions give the same session as sliding windows."""
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=200)
+
+    bot_ref = create_bot(**BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    bot = create_bot(dm_precompute=True, **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    orders_ref = list(bot_ref.orders_executed.values())
+    orders = list(bot.orders_executed.values())
+
+    assert len(orders_ref) > 4
+    assert len(orders) == len(orders_ref)
+    for od, od_ref in zip(orders, orders_ref):
+        assert od.side == od_ref.side
+        assert od.dt_open == od_ref.dt_open
+        assert od.dt_closed == od_ref.dt_closed
+        assert od.quote_price == od_ref.quote_price
+
+    assert bot.portfolio.performance == \
+        pytest.approx(bot_ref.portfolio.performance, rel=1e-12)
+
+
+@pytest.mark.parametrize("dm_precompute", [False, True])
+def test_btclassic_decision_codes_001(dm_precompute):
+    """Integer decision codes give the same session as decision labels."""
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=200)
+
+    bot_ref = create_bot(dm_precompute=dm_precompute, **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    bot = create_bot(dm_precompute=dm_precompute, **BOT_SPECS)
+    bot.decision_model.decision_codes = True
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    orders_ref = list(bot_ref.orders_executed.values())
+    orders = list(bot.orders_executed.values())
+
+    assert len(orders_ref) > 4
+    assert [(od.side, od.dt_open) for od in orders] == \
+        [(od.side, od.dt_open) for od in orders_ref]
+    assert bot.portfolio.performance == \
+        pytest.approx(bot_ref.portfolio.performance, rel=1e-12)
+
+
+def test_btclassic_predict_last_001():
+    """Streamed last candle decisions give the same session as precomputed ones.
+
+    Sliding windows predictions are kept by default.
+    """
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=400)
+
+    bots = []
+    for dm_precompute, dm_predict_last in [(True, False), (False, True),
+                                           (False, False)]:
+        bot = create_bot(dm_precompute=dm_precompute,
+                         dm_predict_last=dm_predict_last, **BOT_SPECS)
+        bot.decision_model = mdm.DM1ML(
+            pm=PMRLSFixed(features=[mid.SRI(length=5), mid.RSI(length=3)]),
+            buy_threshold=0, sell_threshold=0)
+        bot.decision_model.fit(ohlcv_df.iloc[:200])
+        bot.start(ohlcv_trading_df=ohlcv_df.iloc[200:])
+        bots.append(bot)
+
+    bot_ref, bot, bot_window = bots
+    # Features of new candles were streamed, except on sliding windows
+    assert bot.decision_model.pm._features_buffer is not None
+    assert bot_window.decision_model.pm._features_buffer is None
+
+    orders_ref = list(bot_ref.orders_executed.values())
+    orders = list(bot.orders_executed.values())
+
+    assert len(orders_ref) > 4
+    assert [(od.side, od.dt_open) for od in orders] == \
+        [(od.side, od.dt_open) for od in orders_ref]
+    assert bot.portfolio.performance == \
+        pytest.approx(bot_ref.portfolio.performance, rel=1e-12)
@@ -0,0 +1,134 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+import numpy as np
+from testing_tools import DMReturnsSign, create_bot, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+BOT_SPECS = {'name': 'bot_btfast',
+             'mode': 'btfast'}
+
+
+@pytest.mark.parametrize("fees,buy_quote_rate,sell_base_rate", [
+    (0, 1, 1),
+    (0.001, 1, 1),
+    (0.01, 0.5, 0.8),
+])
+def test_btfast_engine_001(fees, buy_quote_rate, sell_base_rate):
+    """Engine and pydantic orders execution give the same portfolio."""
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=500)
+    invest_model = {'cls': 'InvestLongModel',
+                    'buy_quote_rate': buy_quote_rate,
+                    'sell_base_rate': sell_base_rate}
+
+    bot_ref = create_bot(fees=fees, invest_model=invest_model, **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df, use_engine=False)
+
+    bot = create_bot(fees=fees, invest_model=invest_model, **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df, build_orders=True)
+
+    pf_ref = bot_ref.portfolio.dict(exclude={"bot_uid"})
+    pf = bot.portfolio.dict(exclude={"bot_uid"})
+
+    assert bot_ref.portfolio.nb_buy_orders > 10
+    assert pf.keys() == pf_ref.keys()
+    for key, value_ref in pf_ref.items():
+        if isinstance(value_ref, float):
+            assert pf[key] == pytest.approx(value_ref, rel=1e-12)
+        else:
+            assert pf[key] == value_ref
+
+    orders_ref = list(bot_ref.orders_executed.values())
+    orders = list(bot.orders_executed.values())
+    assert len(orders) == len(orders_ref)
+    for od, od_ref in zip(orders, orders_ref):
+        assert od.side == od_ref.side
+        assert od.dt_open == od_ref.dt_open
+        assert od.dt_closed == od_ref.dt_closed
+        assert od.quote_price == od_ref.quote_price
+        assert od.quote_amount == pytest.approx(od_ref.quote_amount, rel=1e-12)
+        assert od.base_amount == pytest.approx(od_ref.base_amount, rel=1e-12)
+        assert od.fees.value == pytest.approx(od_ref.fees.value, rel=1e-12)
+        assert od.fees.asset == od_ref.fees.asset
+
+
+def test_btfast_engine_002():
+    """Orders are only built on demand and exported as DataFrames."""
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=500)
+
+    bot = create_bot(**BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    assert len(bot.orders_executed) == 0
+
+    orders_df = bot.btfast_orders_df()
+    portfolio_df = bot.btfast_portfolio_df()
+    nb_orders = bot.portfolio.nb_buy_orders + bot.portfolio.nb_sell_orders
+
+    assert len(orders_df) == nb_orders
+    assert len(portfolio_df) == nb_orders
+    assert (orders_df["side"].iloc[::2] == "buy").all()
+    assert (orders_df["side"].iloc[1::2] == "sell").all()
+    assert portfolio_df["nb_buy_orders"].iloc[-1] == bot.portfolio.nb_buy_orders
+
+    orders = bot.btfast_build_orders()
+    assert len(orders) == nb_orders
+    assert all(od.status == "executed" for od in orders.values())
+
+
+def test_btfast_engine_003():
+    """No buy decision means no order at all."""
+    codes = np.array([0, -1, 0, -1, -1, 0], dtype=np.int8)
+    pos, side = mtr.bt_fast.compute_order_signals(codes)
+    assert len(pos) == 0
+
+    codes = np.array([-1, 1, 1, 0, -1, 0, 1, -1], dtype=np.int8)
+    pos, side = mtr.bt_fast.compute_order_signals(codes)
+    np.testing.assert_array_equal(pos, [1, 4, 6, 7])
+    np.testing.assert_array_equal(side, [1, -1, 1, -1])
+
+
+def test_btfast_decision_codes_001():
+    """Decision models emit int8 codes or labels with the same decisions."""
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=500)
+
+    dm = DMReturnsSign()
+    decisions_s = dm.predict(ohlcv_df)["decision"]
+    dm.decision_codes = True
+    decision_codes_s = dm.predict(ohlcv_df)["decision"]
+
+    assert isinstance(decisions_s.dtype, pd.CategoricalDtype)
+    assert decision_codes_s.dtype == np.int8
+    np.testing.assert_array_equal(
+        mtr.bt_fast.decisions_to_codes(decisions_s),
+        decision_codes_s.to_numpy())
+    np.testing.assert_array_equal(
+        mtr.bt_fast.decisions_to_codes(decisions_s.astype(str)),
+        decision_codes_s.to_numpy())
+    # Missing decisions (e.g. after reindexing) mean no signal
+    np.testing.assert_array_equal(
+        mtr.bt_fast.decisions_to_codes(
+            decision_codes_s.reindex(ohlcv_df.index.shift(1))),
+        np.append(decision_codes_s.to_numpy()[1:], 0))
+
+
+@pytest.mark.parametrize("use_engine", [True, False])
+def test_btfast_decision_codes_002(use_engine):
+    """Btfast sessions consume integer decision codes."""
+    ohlcv_df = prepare_random_ohlcv_data(nb_data=500)
+
+    bot_ref = create_bot(**BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df, use_engine=use_engine)
+
+    bot = create_bot(**BOT_SPECS)
+    bot.decision_model.decision_codes = True
+    bot.start(ohlcv_trading_df=ohlcv_df, use_engine=use_engine)
+
+    assert bot_ref.portfolio.nb_buy_orders > 10
+    assert bot.portfolio.dict(exclude={"bot_uid"}) == \
+        bot_ref.portfolio.dict(exclude={"bot_uid"})
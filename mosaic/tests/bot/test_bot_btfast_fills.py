@@ -0,0 +1,117 @@
+import mosaic.trading as mtr
+from mosaic.trading.bt_fast import \
+    compute_fills, \
+    find_fill_tick, \
+    flatten_quotes
+import pytest
+import pkg_resources
+import numpy as np
+from testing_tools import create_bot, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+BOT_SPECS = {'name': 'bot_btfast_fills',
+             'dm_precompute': True,
+             'btfast_fills': True,
+             'portfolio': {'fees_taker': 0.001}}
+
+
+def test_find_fill_tick_001():
+    """Fill ticks of market and trailing orders."""
+    quotes = np.array([100., 99.5, 100.2, 99.8, 98.9, 99.4, 99.2, 100.5])
+
+    # Buy bound at 99 crossed at tick 4
+    assert find_fill_tick(quotes, 0, mtr.bt_fast.SIDE_BUY,
+                          exec_bound_rate=0.01) == (4, 4)
+    # Sell bound at 100.0 * 1.01 never crossed
+    assert find_fill_tick(quotes, 0, mtr.bt_fast.SIDE_SELL,
+                          exec_bound_rate=0.01) == (-1, -1)
+    # Trailing buy bound follows the lowest quote 98.9 up to 99.889
+    assert find_fill_tick(quotes, 0, mtr.bt_fast.SIDE_BUY,
+                          exec_bound_rate=0.01,
+                          exec_trailing_rate=0.01, scan_size=2) == (7, 4)
+
+    fills = compute_fills(quotes[0::2], quotes[1::2], quotes[1::2],
+                          order_pos=[0, 1], order_side=[1, -1],
+                          exec_bound_rate=0)
+    assert fills["tick"].tolist() == [0, 3]
+    assert fills["pos"].tolist() == [0, 1]
+
+
+def test_flatten_quotes_001():
+    ohlcv_df = prepare_random_ohlcv_data(10)
+    quote_s, _ = mtr.exchange.ExchangeBase().flatten_ohlcv(ohlcv_df)
+
+    np.testing.assert_array_equal(
+        flatten_quotes(ohlcv_df["open"], ohlcv_df["low"], ohlcv_df["high"]),
+        quote_s.to_numpy())
+
+
+@pytest.mark.parametrize("order_model,diff_thresh", [
+    ({'cls': 'OrderMarket', 'params': {'exec_bound_rate': 0.002}}, 0),
+    ({'cls': 'OrderMarket', 'params': {'exec_bound_rate': 0.01}}, 2),
+    ({'cls': 'OrderTrailingMarket', 'params': {'exec_bound_rate': 0.002}}, 0),
+    ({'cls': 'OrderTrailingMarket',
+      'params': {'exec_bound_rate': 0.004, 'exec_trailing_rate': 0.004}}, 2),
+])
+def test_btfast_fills_btclassic_001(order_model, diff_thresh):
+    """Btfast fills give the btclassic session of the same decisions."""
+    ohlcv_df = prepare_random_ohlcv_data()
+
+    bot_ref = create_bot(mode="btclassic", order_model=order_model,
+                         diff_thresh_buy_sell_orders=diff_thresh, **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    bot = create_bot(mode="btfast", order_model=order_model,
+                     diff_thresh_buy_sell_orders=diff_thresh, **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df, build_orders=True)
+
+    assert isinstance(bot.btfast_engine, mtr.BTFillEngine)
+    assert bot.btfast_engine.nb_orders == len(bot_ref.orders_executed)
+    assert len(bot_ref.orders_executed) > 4
+
+    exclude = {"uid", "bot_uid", "fees", "bkd", "db", "logger"}
+    for orders, orders_ref in [(bot.orders_executed, bot_ref.orders_executed),
+                               (bot.orders_open, bot_ref.orders_open)]:
+        assert [od.dict(exclude=exclude) for od in orders.values()] == \
+            [od.dict(exclude=exclude) for od in orders_ref.values()]
+        assert [od.fees.value for od in orders.values()] == \
+            pytest.approx([od.fees.value for od in orders_ref.values()])
+
+    portfolio = bot.portfolio.dict(exclude={"bot_uid"})
+    portfolio_ref = bot_ref.portfolio.dict(exclude={"bot_uid"})
+    for var in ["intratrade_duration_cum", "intertrade_duration_cum"]:
+        assert portfolio.pop(var) == pytest.approx(portfolio_ref.pop(var))
+    assert portfolio == portfolio_ref
+
+    orders_df = bot.btfast_orders_df()
+    assert (orders_df["dt_closed"] >= orders_df["dt_open"]).all()
+    assert len(bot.btfast_portfolio_df()) == bot.btfast_engine.nb_orders
+
+
+@pytest.mark.parametrize("intrabar_path", ["OLHC", "OHLC", "direction"])
+def test_btfast_fills_btclassic_002(intrabar_path):
+    """Btfast fills follow the exchange intrabar path as btclassic."""
+    ohlcv_df = prepare_random_ohlcv_data()
+    order_model = {'cls': 'OrderTrailingMarket',
+                   'params': {'exec_bound_rate': 0.002}}
+
+    bot_ref = create_bot(mode="btclassic", order_model=order_model,
+                         exchange={'intrabar_path': intrabar_path},
+                         diff_thresh_buy_sell_orders=2, **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    bot = create_bot(mode="btfast", order_model=order_model,
+                     exchange={'intrabar_path': intrabar_path},
+                     diff_thresh_buy_sell_orders=2, **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df, build_orders=True)
+
+    assert len(bot_ref.orders_executed) > 4
+    assert [(od.side, od.dt_open, od.dt_closed, od.quote_price)
+            for od in bot.orders_executed.values()] == \
+        [(od.side, od.dt_open, od.dt_closed, od.quote_price)
+         for od in bot_ref.orders_executed.values()]
+    assert bot.portfolio.performance == bot_ref.portfolio.performance
@@ -0,0 +1,128 @@
+import mosaic.predict_model as mpm
+import mosaic.decision_model as mdm
+import mosaic.indicator as mid
+import mosaic.trading as mtr
+from mosaic.db.db_base import DBBase
+import pytest
+import pkg_resources
+from testing_tools import DMReturnsSign, create_bot
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+BOT_SPECS = {'name': 'bot_checkpoint',
+             'order_model': {'cls': 'OrderMarket',
+                             'params': {'exec_bound_rate': 0.0001}}}
+
+
+class DBDict(DBBase):
+    """In-memory data backend."""
+
+    def connect(self, **params):
+        self.bkd = {}
+
+    def update(self, endpoint, data=[], index=[], **params):
+        data_list = self.bkd.setdefault(endpoint, [])
+        data_list[:] = [d for d in data_list
+                        if any(d[idx] != data[idx] for idx in index)]
+        data_list.append(data)
+
+    def get(self, endpoint, filter={}, **params):
+        return [d for d in self.bkd.get(endpoint, [])
+                if all(d[key] == value for key, value in filter.items())]
+
+
+def assert_same_session(bot, bot_ref):
+    orders_ref = list(bot_ref.orders_executed.values())
+    orders = list(bot.orders_executed.values())
+
+    assert len(orders_ref) > 4
+    assert [(od.side, od.dt_open, od.dt_closed, od.quote_price)
+            for od in orders] == \
+        [(od.side, od.dt_open, od.dt_closed, od.quote_price)
+         for od in orders_ref]
+    assert list(bot.orders_open.keys()) == list(bot_ref.orders_open.keys())
+    assert bot.portfolio.performance == \
+        pytest.approx(bot_ref.portfolio.performance, rel=1e-12)
+
+
+def test_btclassic_checkpoint_resume_001(data_random_walk_df, tmp_path,
+                                         monkeypatch):
+    """A resumed session ends as an uninterrupted one without replay."""
+    ohlcv_df = data_random_walk_df.iloc[:200]
+
+    bot_ref = create_bot(**BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    checkpoint_filename = str(tmp_path / "bot.ckpt")
+
+    # Session interrupted after 130 candles
+    bot = create_bot(checkpoint=mtr.BotCheckpoint(filename=checkpoint_filename,
+                                                every=20),
+                     **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df.iloc[:130])
+    uid_interrupted = bot.uid
+
+    nb_predict = []
+    predict = DMReturnsSign.predict
+
+    def predict_counted(self, ohlcv_df, **kwrds):
+        nb_predict.append(1)
+        return predict(self, ohlcv_df, **kwrds)
+
+    monkeypatch.setattr(DMReturnsSign, "predict", predict_counted)
+
+    bot = create_bot(checkpoint=mtr.BotCheckpoint(filename=checkpoint_filename,
+                                                every=20),
+                     **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df, resume=True)
+
+    # Last checkpoint holds the 120 first candles
+    assert bot.dt_resume == ohlcv_df.index[119]
+    assert len(nb_predict) == 80
+    assert bot.uid == uid_interrupted
+    assert_same_session(bot, bot_ref)
+
+    # Without checkpoint, resume starts over
+    bot = create_bot(checkpoint=mtr.BotCheckpoint(filename=str(tmp_path / "none.ckpt"),
+                                                every=20),
+                     **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df, resume=True)
+    assert bot.dt_resume is None
+    assert_same_session(bot, bot_ref)
+
+
+def test_btclassic_checkpoint_resume_002(data_random_walk_df):
+    """Online decision model state is restored from a data backend."""
+    ohlcv_fit_df = data_random_walk_df.iloc[:200]
+    ohlcv_df = data_random_walk_df.iloc[200:400]
+
+    def create_dm():
+        return mdm.DM1ML(
+            pm=mpm.PMRLS(features=[mid.SRI(length=5), mid.MFI(length=4)]),
+            buy_threshold=0.0002,
+            sell_threshold=0.0002)
+
+    bot_ref = create_bot(create_dm(), **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df, ohlcv_fit_df=ohlcv_fit_df)
+
+    db = DBDict()
+    db.connect()
+
+    bot = create_bot(create_dm(), mtr.BotCheckpoint(db=db, every=25),
+                     **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df.iloc[:110],
+              ohlcv_fit_df=ohlcv_fit_df)
+    assert len(db.get("checkpoints", filter={"key": "bot_checkpoint"})) == 1
+
+    # Resumed bot decision model is not fitted: its state comes from the checkpoint
+    bot = create_bot(create_dm(), mtr.BotCheckpoint(db=db, every=25),
+                     **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df, resume=True)
+
+    assert bot.dt_resume == ohlcv_df.index[99]
+    assert bot.decision_model.pm.coefs.to_numpy() == \
+        pytest.approx(bot_ref.decision_model.pm.coefs.to_numpy(), rel=1e-9)
+    assert_same_session(bot, bot_ref)
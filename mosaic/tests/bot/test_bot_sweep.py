@@ -0,0 +1,120 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+import numpy as np
+import os
+from testing_tools import DMReturnsSign, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+@pytest.fixture
+def bot_sweep():
+    bot_specs = {
+        'cls': 'BotTrading',
+        'name': 'bot_sweep',
+        'mode': 'btfast',
+        'order_model': {'cls': 'OrderMarket'},
+        'exchange': {'cls': 'ExchangeBase',
+                     'name': 'test_exchange',
+                     'fees_rates': {'taker': 0.001, 'maker': 0.001}},
+    }
+    bot = mtr.BotTrading.from_dict(bot_specs)
+    bot.decision_model = DMReturnsSign()
+    return bot
+
+
+param_grid = {
+    "invest_model.buy_quote_rate": [0.5, 1],
+    "exchange.fees_rates.taker": [0, 0.001, 0.01],
+}
+
+
+def test_sweep_001(bot_sweep):
+    """Parallel and sequential sweeps give the same ordered results."""
+    ohlcv_df = prepare_random_ohlcv_data()
+
+    res_seq_df = bot_sweep.sweep(param_grid, n_jobs=1,
+                                 ohlcv_trading_df=ohlcv_df)
+    res_par_df = bot_sweep.sweep(param_grid, n_jobs=2,
+                                 ohlcv_trading_df=ohlcv_df)
+
+    assert list(res_seq_df["sweep_it"]) == list(range(6))
+    assert list(res_seq_df["exchange.fees_rates.taker"]) == \
+        [0, 0.001, 0.01, 0, 0.001, 0.01]
+    assert res_seq_df["performance"].nunique() == 6
+    np.testing.assert_allclose(res_par_df["performance"],
+                               res_seq_df["performance"])
+
+
+def test_sweep_002(bot_sweep, tmp_path):
+    """An interrupted sweep is resumed from its results file."""
+    ohlcv_df = prepare_random_ohlcv_data()
+    results_filename = os.path.join(tmp_path, "sweep.csv")
+
+    res_ref_df = bot_sweep.sweep(param_grid,
+                                 ohlcv_trading_df=ohlcv_df)
+
+    # Simulate a crash after the first 4 combinations
+    bot_sweep.sweep(param_grid,
+                    results_filename=results_filename,
+                    ohlcv_trading_df=ohlcv_df)
+    pd.read_csv(results_filename).iloc[:4]\
+      .to_csv(results_filename, index=False)
+
+    res_df = bot_sweep.sweep(param_grid,
+                             results_filename=results_filename,
+                             ohlcv_trading_df=ohlcv_df)
+
+    assert len(pd.read_csv(results_filename)) == 6
+    assert list(res_df["sweep_it"]) == list(range(6))
+    np.testing.assert_allclose(res_df["performance"],
+                               res_ref_df["performance"])
+
+
+def test_sweep_003(bot_sweep, tmp_path):
+    """Resumed sweeps only skip combinations with the same parameters."""
+    ohlcv_df = prepare_random_ohlcv_data()
+    results_filename = os.path.join(tmp_path, "sweep.csv")
+
+    bot_sweep.sweep({"exchange.fees_rates.taker": [0, 0.01]},
+                    results_filename=results_filename,
+                    ohlcv_trading_df=ohlcv_df)
+
+    # A new combination shifts the grid positions
+    param_grid_new = {"exchange.fees_rates.taker": [0.001, 0, 0.01]}
+    res_df = bot_sweep.sweep(param_grid_new,
+                             results_filename=results_filename,
+                             ohlcv_trading_df=ohlcv_df)
+    res_ref_df = bot_sweep.sweep(param_grid_new,
+                                 ohlcv_trading_df=ohlcv_df)
+
+    assert len(pd.read_csv(results_filename)) == 3
+    assert list(res_df["sweep_it"]) == list(range(3))
+    assert list(res_df["exchange.fees_rates.taker"]) == [0.001, 0, 0.01]
+    np.testing.assert_allclose(res_df["performance"],
+                               res_ref_df["performance"])
+
+    # Results files without parameters fingerprint cannot be resumed
+    pd.read_csv(results_filename).drop(columns="sweep_params_hash")\
+      .to_csv(results_filename, index=False)
+    with pytest.raises(ValueError):
+        bot_sweep.sweep(param_grid_new,
+                        results_filename=results_filename,
+                        ohlcv_trading_df=ohlcv_df)
+
+
+def test_sweep_004(bot_sweep):
+    """Sequential sweeps leave the swept bot unchanged."""
+    ohlcv_df = prepare_random_ohlcv_data()
+    bot_specs = bot_sweep.dict()
+
+    bot_sweep.sweep(param_grid, n_jobs=1, ohlcv_trading_df=ohlcv_df)
+
+    assert bot_sweep.uid is None
+    assert bot_sweep.invest_model.buy_quote_rate == \
+        bot_specs["invest_model"]["buy_quote_rate"]
+    assert bot_sweep.exchange.fees_rates.taker == 0.001
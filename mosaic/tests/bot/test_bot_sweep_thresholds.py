@@ -0,0 +1,81 @@
+import mosaic.predict_model as mpm
+import mosaic.decision_model as mdm
+import mosaic.indicator as mid
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import numpy as np
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+@pytest.fixture
+def bot_thresholds(data_random_walk_df):
+    bot = mtr.BotTrading.from_dict({
+        'cls': 'BotTrading',
+        'mode': 'btfast',
+        'bt_buy_on': 'high',
+        'bt_sell_on': 'low',
+        'order_model': {'cls': 'OrderMarket'},
+        'invest_model': {'cls': 'InvestLongModel',
+                         'buy_quote_rate': 0.7,
+                         'sell_base_rate': 0.8},
+        'exchange': {'cls': 'ExchangeBase',
+                     'name': 'test_exchange',
+                     'fees_rates': {'taker': 0.001, 'maker': 0.001}},
+    })
+    bot.decision_model = mdm.DM1ML(
+        pm=mpm.PMRLS(features=[mid.SRI(length=5), mid.MFI(length=4)]))
+    bot.decision_model.fit(data_random_walk_df.iloc[:200])
+
+    return bot
+
+
+def test_sweep_thresholds_001(bot_thresholds, data_random_walk_df):
+    """Thresholds grid performance equals the btfast backtest one."""
+    buy_thresholds = [0, 0.0005, 0.001, 0.01]
+    sell_thresholds = [0, 0.001, 0.002]
+
+    res_df = bot_thresholds.sweep_thresholds(
+        buy_thresholds, sell_thresholds,
+        ohlcv_trading_df=data_random_walk_df)
+
+    assert len(res_df) == 12
+    assert res_df["performance"].nunique() > 1
+
+    for res in res_df.to_dict("records"):
+        bot_thresholds.decision_model.buy_threshold = res["buy_threshold"]
+        bot_thresholds.decision_model.sell_threshold = res["sell_threshold"]
+        bot_thresholds.start(ohlcv_trading_df=data_random_walk_df)
+
+        assert res["performance"] == \
+            pytest.approx(bot_thresholds.portfolio.performance, rel=1e-12)
+        assert res["nb_buy_orders"] == bot_thresholds.portfolio.nb_buy_orders
+        assert res["nb_sell_orders"] == \
+            bot_thresholds.portfolio.nb_sell_orders
+
+        bot_thresholds.reset()
+
+
+def test_sweep_thresholds_002(bot_thresholds, data_random_walk_df,
+                              monkeypatch):
+    """Scores are predicted once for the whole grid."""
+    nb_predicts = []
+    dm_predict = mdm.DM1ML.predict
+
+    def predict(self, *args, **kwrds):
+        nb_predicts.append(1)
+        return dm_predict(self, *args, **kwrds)
+
+    monkeypatch.setattr(mdm.DM1ML, "predict", predict)
+
+    res_df = bot_thresholds.sweep_thresholds(
+        np.linspace(0, 0.01, 20), np.linspace(0, 0.01, 30),
+        ohlcv_trading_df=data_random_walk_df)
+
+    assert len(nb_predicts) == 1
+    assert len(res_df) == 600
+    # Without signal, the portfolio keeps its initial value
+    assert (res_df.loc[res_df["nb_buy_orders"] == 0, "performance"] == 1).all()
@@ -0,0 +1,121 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+from testing_tools import create_bot, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+BOT_SPECS = {'name': 'bot_order_book',
+             'diff_thresh_buy_sell_orders': 3}
+
+def update_orders_scan(bot):
+    """Reference orders update checking every open order."""
+    for od_uid in list(bot.orders_open.keys()):
+        od = bot.orders_open[od_uid]
+        od.update(dt=bot.dt_ohlcv_current, quote_price=bot.quote_current)
+        if od.is_executable():
+            od.execute()
+            bot.portfolio.update_order(od)
+            bot.orders_executed[od_uid] = bot.orders_open.pop(od_uid)
+
+
+def test_order_book_counters_001():
+    """Counters follow registered and executed orders."""
+    bot = create_bot(order_model={'cls': 'OrderMarket',
+                                  'params': {'exec_bound_rate': 0.01}},
+                     **BOT_SPECS)
+    bot.dt_ohlcv_current = pd.Timestamp("2023-06-01 00:00:00+0200")
+    bot.quote_current = 100.
+    bot.portfolio.quote_price = 100.
+
+    bot.register_order(bot.buy())
+    bot.register_order(bot.buy())
+    bot.update_orders()
+    assert (bot.nb_buy_orders_open, bot.nb_buy_orders_executed) == (2, 0)
+
+    # Buy orders execute below 99: they are not checked above
+    order_book = bot.order_book
+    assert [bound for bound, _, _ in order_book.bounds["buy"]] == \
+        pytest.approx([99, 99])
+    assert order_book.pop_orders_to_check(99.5) == []
+    assert len(order_book.bounds["buy"]) == 2
+
+    bot.quote_current = 98.
+    bot.update_orders()
+    assert (bot.nb_buy_orders_open, bot.nb_buy_orders_executed) == (0, 2)
+    assert bot.nb_sell_orders_executed == 0
+
+    # Externally replaced orders rebuild the book
+    bot.orders_executed = {}
+    assert bot.nb_buy_orders_executed == 0
+
+
+@pytest.mark.parametrize("order_model", [
+    {'cls': 'OrderMarket', 'params': {'exec_bound_rate': 0.002}},
+    {'cls': 'OrderTrailingMarket', 'params': {'exec_bound_rate': 0.002}},
+])
+def test_order_book_btclassic_001(order_model, monkeypatch):
+    """Indexed orders update gives the same session as a full scan."""
+    ohlcv_df = prepare_random_ohlcv_data()
+
+    bot = create_bot(order_model=order_model, **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    monkeypatch.setattr(mtr.BotTrading, "update_orders", update_orders_scan)
+    bot_ref = create_bot(order_model=order_model, **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    orders_ref = list(bot_ref.orders_executed.values())
+    orders = list(bot.orders_executed.values())
+
+    assert len(orders_ref) > 4
+    assert [(od.side, od.dt_open, od.dt_closed, od.quote_price)
+            for od in orders] == \
+        [(od.side, od.dt_open, od.dt_closed, od.quote_price)
+         for od in orders_ref]
+    assert [od.dt_open for od in bot.orders_open.values()] == \
+        [od.dt_open for od in bot_ref.orders_open.values()]
+    assert bot.portfolio.performance == \
+        pytest.approx(bot_ref.portfolio.performance, rel=1e-12)
+
+
+def test_order_book_btclassic_002(monkeypatch):
+    """Orders whose bound is not crossed are not updated at each tick."""
+    ohlcv_df = prepare_random_ohlcv_data()
+    update_orders = mtr.BotTrading.update_orders
+    nb_skipped = []
+
+    def update_orders_check(bot):
+        orders_skipped = {}
+        for uid, od in bot.orders_open.items():
+            if od.quote_price_exec is None:
+                continue
+            bound_crossed = bot.quote_current <= od.quote_price_exec \
+                if od.side == "buy" \
+                else bot.quote_current >= od.quote_price_exec
+            if not bound_crossed:
+                orders_skipped[uid] = (od.dt, od.quote_price)
+
+        update_orders(bot)
+
+        for uid, dt_quote in orders_skipped.items():
+            od = bot.orders_open[uid]
+            assert (od.dt, od.quote_price) == dt_quote
+        nb_skipped.append(len(orders_skipped))
+
+    monkeypatch.setattr(mtr.BotTrading, "update_orders", update_orders_check)
+    bot = create_bot(order_model={'cls': 'OrderMarket',
+                                  'params': {'exec_bound_rate': 0.01}},
+                     **BOT_SPECS)
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    assert sum(nb_skipped) > 100
+    # Skipped orders are brought up to date at the end of the session
+    assert len(bot.orders_open) > 0
+    for od in bot.orders_open.values():
+        assert (od.dt, od.quote_price) == \
+            (bot.dt_ohlcv_current, bot.quote_current)
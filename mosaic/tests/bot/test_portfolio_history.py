@@ -0,0 +1,113 @@
+import mosaic.trading as mtr
+from mosaic.trading.portfolio_history import PortfolioHistory
+import pytest
+import pkg_resources
+import pandas as pd
+from testing_tools import create_bot, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+def test_portfolio_history_001():
+    """States are recorded by chunks, one state per timestamp."""
+    history = PortfolioHistory(chunk_size=3)
+    portfolio = mtr.Portfolio(quote_amount_init=100)
+    dt_index = pd.date_range("2023-06-01", periods=8, freq="1h",
+                             tz="Europe/Paris")
+
+    quote_values = []
+    for k, dt in enumerate(dt_index):
+        # Several states at the same timestamp: the last one is kept
+        for quote_price in [100 + k, 101 + k]:
+            portfolio.dt = dt
+            portfolio.quote_price = quote_price
+            portfolio.base_amount = 0.5
+            portfolio.quote_amount = 50 - k
+            portfolio.update()
+            history.record(portfolio)
+        quote_values.append(portfolio.quote_value)
+
+    assert len(history) == 8
+    assert len(history.chunks) == 3
+
+    history_df = history.to_df()
+    assert history_df.index.equals(dt_index.rename("dt"))
+    assert history_df["quote_price"].tolist() == list(range(101, 109))
+    assert history_df["quote_value"].tolist() == pytest.approx(quote_values)
+    assert history_df["performance"].tolist() == \
+        pytest.approx([qv/100 for qv in quote_values])
+
+    # Bulk records continue the last chunk, replacing the last state
+    history.extend(dt_index[-1:].append(dt_index[-1:] + pd.Timedelta("1h")),
+                   quote_price=[1, 2], quote_amount=[10, 20],
+                   base_amount=[1, 2], quote_value=[11, 24],
+                   performance=[0.11, 0.24])
+    history_df = history.to_df()
+    assert len(history) == 9
+    assert history_df["quote_price"].tolist()[-3:] == [107, 1, 2]
+    assert history_df.index.is_monotonic_increasing
+
+
+def test_portfolio_history_002():
+    """Equity curve, drawdown and exposure."""
+    history = PortfolioHistory(chunk_size=2)
+    dt_index = pd.date_range("2023-06-01", periods=5, freq="1d")
+    history.extend(dt_index,
+                   quote_price=[10, 11, 9, 12, 10],
+                   quote_amount=[100, 0, 0, 120, 120],
+                   base_amount=[0, 10, 10, 0, 0],
+                   quote_value=[100, 110, 90, 120, 120],
+                   performance=[1, 1.1, 0.9, 1.2, 1.2])
+
+    assert history.equity_curve().tolist() == [100, 110, 90, 120, 120]
+    assert history.drawdown().tolist() == \
+        pytest.approx([0, 0, 90/110 - 1, 0, 0])
+    assert history.max_drawdown() == pytest.approx(90/110 - 1)
+    assert history.exposure().tolist() == pytest.approx([0, 1, 1, 0, 0])
+    assert history.to_df().index.tz is None
+
+    assert PortfolioHistory().to_df().empty
+    assert PortfolioHistory().max_drawdown() == 0
+
+
+def test_portfolio_history_003(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    history = PortfolioHistory()
+    history.extend(pd.date_range("2023-06-01", periods=3, freq="1h", tz="UTC"),
+                   quote_price=[1, 2, 3], quote_amount=[1, 1, 1],
+                   base_amount=[0, 0, 0], quote_value=[1, 1, 1],
+                   performance=[1, 1, 1])
+
+    filename = tmp_path / "portfolio_history.parquet"
+    history.to_parquet(filename)
+    pd.testing.assert_frame_equal(pd.read_parquet(filename), history.to_df(),
+                                  check_freq=False)
+
+
+@pytest.mark.parametrize("mode", ["btclassic", "btfast"])
+def test_portfolio_history_bot_001(mode):
+    """Bots record the portfolio states of the session."""
+    ohlcv_df = prepare_random_ohlcv_data()
+    bot = create_bot(name='bot_portfolio_history', mode=mode,
+                     order_model={'cls': 'OrderMarket',
+                                  'params': {'exec_bound_rate': 0.002}})
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    history_df = bot.get_portfolio_history_df()
+
+    if mode == "btclassic":
+        # One state per candle
+        assert history_df.index.equals(ohlcv_df.index.rename("dt"))
+    else:
+        # One state per executed order and the final state
+        assert len(history_df) == bot.btfast_engine.nb_orders + 1
+    assert len(bot.orders_executed) > 4 or bot.btfast_engine.nb_orders > 4
+
+    assert history_df.index[-1] == bot.portfolio.dt
+    assert history_df["quote_value"].iloc[-1] == bot.portfolio.quote_value
+    assert history_df["performance"].iloc[-1] == bot.portfolio.performance
+    assert (bot.portfolio_history.drawdown() <= 0).all()
+    assert "portfolio_history" not in bot.dict()
@@ -0,0 +1,57 @@
+import mosaic.trading as mtr
+from mosaic.trading.sim_objects import SIM_PORTFOLIO_FIELDS
+import pytest
+import pkg_resources
+from testing_tools import create_bot, prepare_random_ohlcv_data
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+BOT_SPECS = {'name': 'bot_sim_objects',
+             'diff_thresh_buy_sell_orders': 2}
+
+def test_sim_portfolio_fields_001():
+    assert SIM_PORTFOLIO_FIELDS == tuple(mtr.Portfolio.__fields__)
+
+
+@pytest.mark.parametrize("order_model", [
+    {'cls': 'OrderMarket', 'params': {'exec_bound_rate': 0.002}},
+    {'cls': 'OrderTrailingMarket', 'params': {'exec_bound_rate': 0.002}},
+])
+def test_sim_objects_btclassic_001(order_model):
+    """Simulation objects give the same session as pydantic models."""
+    ohlcv_df = prepare_random_ohlcv_data()
+
+    bot_ref = create_bot(order_model=order_model, sim_objects=False,
+                         **BOT_SPECS)
+    bot_ref.start(ohlcv_trading_df=ohlcv_df)
+
+    bot = create_bot(order_model=order_model, sim_objects=True,
+                     **BOT_SPECS)
+    portfolio = bot.portfolio
+    bot.start(ohlcv_trading_df=ohlcv_df)
+
+    # Session results are pydantic models again
+    assert bot.portfolio is portfolio
+    assert all(type(od) is type(bot_ref.order_model)
+               for od in list(bot.orders_executed.values()) +
+               list(bot.orders_open.values()))
+
+    exclude = {"uid", "bot_uid", "fees"}
+    orders_ref = [od.dict(exclude=exclude | {"bkd", "db", "logger"})
+                  for od in bot_ref.orders_executed.values()]
+    orders = [od.dict(exclude=exclude | {"bkd", "db", "logger"})
+              for od in bot.orders_executed.values()]
+
+    assert len(orders_ref) > 4
+    assert orders == orders_ref
+    assert [od.fees.value for od in bot.orders_executed.values()] == \
+        [od.fees.value for od in bot_ref.orders_executed.values()]
+    assert [od.dict(exclude=exclude | {"bkd", "db", "logger"})
+            for od in bot.orders_open.values()] == \
+        [od.dict(exclude=exclude | {"bkd", "db", "logger"})
+         for od in bot_ref.orders_open.values()]
+    assert bot.portfolio.dict(exclude={"bot_uid"}) == \
+        bot_ref.portfolio.dict(exclude={"bot_uid"})
@@ -0,0 +1,106 @@
+import mosaic.predict_model as mpm
+import mosaic.decision_model as mdm
+import mosaic.indicator as mid
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+def create_dm():
+    return mdm.DM1ML(
+        pm=mpm.PMRLS(features=[mid.SRI(length=5), mid.MFI(length=4)]),
+        buy_threshold=0.001,
+        sell_threshold=0.001)
+
+
+def test_walk_forward_folds_001():
+    """Rolling and expanding fit windows."""
+    wf = mtr.WalkForward(fit_length=100, refit_every=40)
+    assert wf.compute_folds(250) == [(0, 100, 100, 140),
+                                     (40, 140, 140, 180),
+                                     (80, 180, 180, 220),
+                                     (120, 220, 220, 250)]
+
+    wf = mtr.WalkForward(fit_length=100, refit_every=40, window="expanding")
+    assert [fold[:2] for fold in wf.compute_folds(250)] == \
+        [(0, 100), (0, 140), (0, 180), (0, 220)]
+
+    assert wf.compute_folds(100) == []
+
+    with pytest.raises(ValueError):
+        mtr.WalkForward(fit_length=100, refit_every=40, window="sliding")
+
+
+def test_walk_forward_predict_001(data_random_walk_df):
+    """Each block is predicted by a model fitted on its fit window only."""
+    wf = mtr.WalkForward(fit_length=200, refit_every=100,
+                         reuse_features=False)
+    decisions_df = wf.predict(create_dm(), data_random_walk_df)
+
+    pd.testing.assert_index_equal(decisions_df.index,
+                                  data_random_walk_df.index[200:])
+
+    for fit_s, fit_e, pred_s, pred_e in wf.compute_folds(500):
+        dm = create_dm()
+        dm.fit(data_random_walk_df.iloc[fit_s:fit_e])
+        decisions_fold_df = \
+            dm.predict(data_random_walk_df.iloc[:pred_e]).iloc[pred_s:]
+        pd.testing.assert_frame_equal(decisions_df.iloc[pred_s - 200:
+                                                        pred_e - 200],
+                                      decisions_fold_df)
+
+
+def test_walk_forward_predict_002(data_random_walk_df, monkeypatch):
+    """Features are computed once and folds may run in parallel."""
+    nb_computes = []
+    sri_compute = mid.SRI.compute
+
+    def compute(self, *args, **kwrds):
+        nb_computes.append(1)
+        return sri_compute(self, *args, **kwrds)
+
+    monkeypatch.setattr(mid.SRI, "compute", compute)
+
+    wf = mtr.WalkForward(fit_length=150, refit_every=50, window="expanding")
+    decisions_df = wf.predict(create_dm(), data_random_walk_df)
+    assert len(nb_computes) == 1
+    assert (decisions_df["decision"] != "pass").any()
+
+    # Fold features are slices of the whole data features
+    dm = create_dm()
+    dm.fit(data_random_walk_df.iloc[:450])
+    pd.testing.assert_frame_equal(
+        decisions_df.iloc[-50:],
+        dm.predict(data_random_walk_df).iloc[-50:])
+
+    wf_par = wf.copy(update={"n_jobs": 2})
+    pd.testing.assert_frame_equal(
+        wf_par.predict(create_dm(), data_random_walk_df),
+        decisions_df)
+
+
+def test_walk_forward_bot_001(data_random_walk_df):
+    """Btfast bot backtests walk-forward out-of-sample decisions."""
+    bot = mtr.BotTrading.from_dict({
+        'cls': 'BotTrading',
+        'mode': 'btfast',
+        'order_model': {'cls': 'OrderMarket'},
+        'exchange': {'cls': 'ExchangeBase',
+                     'name': 'test_exchange',
+                     'fees_rates': {'taker': 0.001, 'maker': 0.001}},
+        'dm_walk_forward': {'fit_length': 200, 'refit_every': 100},
+    })
+    bot.decision_model = create_dm()
+
+    bot.start(ohlcv_trading_df=data_random_walk_df)
+
+    # Model not fitted on the whole data, no order during the first fit window
+    assert bot.decision_model.pm.bkd is None
+    assert bot.btfast_engine.nb_orders > 0
+    assert pd.Series(bot.btfast_engine.orders["dt_open"]).min() >= \
+        data_random_walk_df.index[200]
@@ -3,6 +3,8 @@ import os
 
 import pytest
 
+from testing_tools import prepare_random_walk_data
+
 pytest.RUN_TESTS_DIR = os.getcwd()
 
 def pytest_addoption(parser):
@@ -23,3 +25,8 @@ def pytest_collection_modifyitems(config, items):
     for item in items:
         if "slow" in item.keywords:
             item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def data_random_walk_df():
+    return prepare_random_walk_data()
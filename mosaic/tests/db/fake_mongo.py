@@ -0,0 +1,66 @@
+"""Minimal in-memory pymongo client stand-in used to test DBMongo."""
+import copy
+
+
+class FakeBulkWriteResult:
+
+    def __init__(self, modified_count=0, upserted_count=0):
+        self.modified_count = modified_count
+        self.upserted_count = upserted_count
+
+
+class FakeCollection:
+
+    def __init__(self, name):
+        self.name = name
+        self.docs = []
+        self.indexes = []
+        self.nb_bulk_writes = 0
+
+    def create_index(self, keys, unique=False):
+        self.indexes.append(keys)
+
+    def find_doc(self, filter):
+        for doc in self.docs:
+            if all(doc.get(k) == v for k, v in filter.items()):
+                return doc
+        return None
+
+    def bulk_write(self, requests, ordered=True):
+        self.nb_bulk_writes += 1
+        res = FakeBulkWriteResult()
+        for req in requests:
+            doc = self.find_doc(req._filter)
+            if doc is None:
+                doc = dict(copy.deepcopy(req._filter),
+                           **copy.deepcopy(req._doc.get("$setOnInsert", {})),
+                           **copy.deepcopy(req._doc.get("$set", {})))
+                self.docs.append(doc)
+                res.upserted_count += 1
+            else:
+                doc_ori = copy.deepcopy(doc)
+                doc.update(copy.deepcopy(req._doc.get("$set", {})))
+                res.modified_count += doc != doc_ori
+        return res
+
+    def count_documents(self, filter={}):
+        return len([doc for doc in self.docs
+                    if all(doc.get(k) == v for k, v in filter.items())])
+
+
+class FakeMongoClient:
+
+    def __init__(self):
+        self.dbs = {}
+
+    def __getitem__(self, db_name):
+        return self.dbs.setdefault(db_name, FakeDatabase())
+
+
+class FakeDatabase:
+
+    def __init__(self):
+        self.colls = {}
+
+    def __getitem__(self, coll_name):
+        return self.colls.setdefault(coll_name, FakeCollection(coll_name))
@@ -0,0 +1,98 @@
+import mosaic.db as mdb
+import time
+import typing
+import pydantic
+import pytest
+import pkg_resources
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+class DBRecorder(mdb.DBBase):
+    """Backend recording calls, with an optional latency."""
+
+    latency: float = pydantic.Field(0)
+    calls: typing.List = pydantic.Field([])
+
+    def connect(self, **params):
+        return True
+
+    def put(self, endpoint, data={}, index=[], **params):
+        time.sleep(self.latency)
+        self.calls.append(("put", endpoint, data, params))
+
+    def update(self, endpoint, data=[], index=[], **params):
+        time.sleep(self.latency)
+        self.calls.append(("update", endpoint, data, params))
+
+    def get(self, endpoint, filter={}, **params):
+        return [call for call in self.calls if call[1] == endpoint]
+
+
+def test_db_buffered_001():
+    """Updates with the same index are coalesced and sent in batches."""
+    db = mdb.DBBuffered(db=DBRecorder(), batch_size=1000, flush_interval=60)
+    assert db.connect()
+
+    for i in range(100):
+        db.update(endpoint="portfolio",
+                  data={"bot_uid": "bot", "value": i, f"var_{i % 2}": i},
+                  index=["bot_uid"], time_field="dt")
+        db.update(endpoint="orders", data={"uid": i % 10, "status": i},
+                  index=["uid"])
+    db.put(endpoint="orders", data=[{"uid": 100}, {"uid": 101}])
+
+    assert db.nb_pending == 1 + 10 + 2
+    assert db.db.calls == []
+
+    assert db.flush() == 13
+    assert db.db.calls == [
+        ("update", "portfolio",
+         [{"bot_uid": "bot", "value": 99, "var_0": 98, "var_1": 99}],
+         {"time_field": "dt"}),
+        ("update", "orders",
+         [{"uid": i, "status": 90 + i} for i in range(10)], {}),
+        ("put", "orders", [{"uid": 100}, {"uid": 101}], {}),
+    ]
+
+    # Reads flush pending writes first
+    db.put(endpoint="trace", data={"a": 1})
+    assert db.get(endpoint="trace") == [("put", "trace", [{"a": 1}], {})]
+    db.close()
+
+
+def test_db_buffered_002():
+    """Writes do not wait for the backend, which is fed in background."""
+    db = mdb.DBBuffered(db=DBRecorder(latency=0.05), batch_size=10,
+                        flush_interval=0.01, batch_mode=False)
+
+    tic = time.perf_counter()
+    for i in range(10):
+        db.put(endpoint="orders", data={"uid": i})
+    assert time.perf_counter() - tic < 0.05
+
+    time.sleep(0.2)
+    assert db.nb_pending == 0
+    assert len(db.db.calls) >= 1
+
+    db.close()
+    assert [call[2] for call in db.db.calls] == [{"uid": i} for i in range(10)]
+
+    with pytest.raises(ValueError):
+        db.put(endpoint="orders", data={"uid": 10})
+
+
+def test_db_buffered_003():
+    """Pending writes are bounded (backpressure)."""
+    db = mdb.DBBuffered(db=DBRecorder(latency=0.01), batch_size=2,
+                        flush_interval=0.01, max_pending=5)
+
+    for i in range(50):
+        db.update(endpoint="orders", data={"uid": i}, index="uid")
+        assert db.nb_pending <= 5
+
+    db.close()
+    assert [d["uid"] for call in db.db.calls for d in call[2]] == \
+        list(range(50))
@@ -0,0 +1,83 @@
+import mosaic.db as mdb
+import time
+import pkg_resources
+
+from fake_mongo import FakeMongoClient
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+def create_db(**params):
+    db = mdb.DBMongo(name="test", **params)
+    db.bkd = FakeMongoClient()
+    return db
+
+
+def test_db_mongo_001():
+    """Updates are sent in bulk writes and indexes created once."""
+    db = create_db(bulk_size=40)
+    data = [{"uid": i, "value": i} for i in range(100)]
+
+    res_dict = db.update(endpoint="portfolio", data=data, index=["uid"])
+    assert res_dict["ops"] == {"nb_data_processed": 100,
+                               "nb_inserts": 100,
+                               "nb_updates": 0}
+
+    data = [{"uid": i, "value": i + (i % 2)} for i in range(100)]
+    res_dict = db.update(endpoint="portfolio", data=data, index=["uid"])
+    assert res_dict["ops"] == {"nb_data_processed": 100,
+                               "nb_inserts": 0,
+                               "nb_updates": 50}
+
+    res_dict = db.update(endpoint="portfolio", data={"uid": 0, "value": -1},
+                         index=["uid"])
+    assert res_dict["ops"]["nb_updates"] == 1
+
+    coll = db.bkd["test"]["portfolio"]
+    assert coll.nb_bulk_writes == 3 + 3 + 1
+    assert len(coll.indexes) == 1
+    assert coll.find_doc({"uid": 0})["value"] == -1
+    assert coll.find_doc({"uid": 1})["value"] == 2
+
+
+def test_db_mongo_002():
+    """Write-behind buffer is flushed by size, on demand and in order."""
+    db = create_db(buffer_size=10)
+    coll = db.bkd["test"]["portfolio"]
+
+    for i in range(25):
+        res_dict = db.update(endpoint="portfolio",
+                             data={"bot_uid": "bot", "value": i},
+                             index=["bot_uid"])
+        assert res_dict["ops"]["nb_data_processed"] == 1
+
+    assert coll.nb_bulk_writes == 2
+    assert db.nb_buffered == 5
+    assert coll.find_doc({"bot_uid": "bot"})["value"] == 19
+
+    res_dict = db.flush()
+    assert res_dict["ops"]["nb_data_processed"] == 5
+    assert res_dict["ops"]["nb_updates"] == 5
+    assert db.nb_buffered == 0
+    assert coll.find_doc({"bot_uid": "bot"})["value"] == 24
+
+    assert db.flush()["ops"]["nb_data_processed"] == 0
+
+
+def test_db_mongo_003():
+    """Write-behind buffer is flushed after timeout."""
+    db = create_db(buffer_timeout=0.05)
+    coll = db.bkd["test"]["orders"]
+
+    db.update(endpoint="orders", data={"uid": 1, "status": "open"},
+              index=["uid"])
+    assert coll.count_documents() == 0
+
+    time.sleep(0.06)
+    res_dict = db.update(endpoint="orders", data={"uid": 1, "status": "executed"},
+                         index=["uid"])
+    assert res_dict["ops"]["nb_inserts"] == 1
+    assert res_dict["ops"]["nb_updates"] == 1
+    assert coll.find_doc({"uid": 1})["status"] == "executed"
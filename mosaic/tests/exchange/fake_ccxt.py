@@ -0,0 +1,64 @@
+import math
+import time
+import threading
+import ccxt
+from mosaic.utils.data_management import timeframe_to_seconds
+
+
+class FakeCCXT:
+    """Local fake ccxt exchange backend serving deterministic candles."""
+
+    def __init__(self, ts_now=None, rateLimit=50, nb_failures=0,
+                 latency=0, nb_extra=0, error_cls=ccxt.NetworkError):
+        self.ts_now = ts_now
+        self.rateLimit = rateLimit
+        self.nb_failures = nb_failures
+        self.latency = latency
+        self.nb_extra = nb_extra
+        self.error_cls = error_cls
+        self.fetch_calls = []
+        self.fetch_times = []
+        self.nb_running = 0
+        self.nb_running_max = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def candle(ts, timedelta_ms):
+        it = ts//timedelta_ms
+        price_open = 100 + 10*math.sin(it/10)
+        price_close = 100 + 10*math.sin((it + 1)/10)
+        return [ts,
+                price_open,
+                max(price_open, price_close) + 1,
+                min(price_open, price_close) - 1,
+                price_close,
+                float(it % 7)]
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=500):
+        with self.lock:
+            self.fetch_calls.append((symbol, timeframe, since, limit))
+            self.fetch_times.append(time.monotonic())
+            if self.nb_failures > 0:
+                self.nb_failures -= 1
+                raise self.error_cls("Fake exchange error")
+            self.nb_running += 1
+            self.nb_running_max = max(self.nb_running_max, self.nb_running)
+
+        time.sleep(self.latency)
+        with self.lock:
+            self.nb_running -= 1
+
+        timedelta_ms = 1000*timeframe_to_seconds(timeframe)
+        if since is None:
+            # Last candles, the current (not closed) one included
+            since = (self.ts_now//timedelta_ms - limit + 1)*timedelta_ms
+        ts_first = -(-since//timedelta_ms)*timedelta_ms
+
+        candles = []
+        for i in range(limit + self.nb_extra):
+            ts = ts_first + i*timedelta_ms
+            if self.ts_now is not None and ts > self.ts_now:
+                break
+            candles.append(self.candle(ts, timedelta_ms))
+
+        return candles
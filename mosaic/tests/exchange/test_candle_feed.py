@@ -0,0 +1,94 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+
+from fake_ccxt import FakeCCXT
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+TIMEDELTA_MS = 3600*1000
+
+
+@pytest.fixture
+def exchange():
+    exchange = mtr.ExchangeCCXT(name="binance")
+    exchange.bkd = FakeCCXT(ts_now=1000*TIMEDELTA_MS + 1234)
+    return exchange
+
+
+def assert_feed_equal_last_ohlcv(feed, exchange, nb_closed):
+    ohlcv_ref_df = exchange.get_last_ohlcv(symbol=feed.symbol,
+                                           timeframe=feed.timeframe,
+                                           nb_data=nb_closed + 1,
+                                           closed=False)
+    pd.testing.assert_frame_equal(feed.ohlcv_df, ohlcv_ref_df,
+                                  check_dtype=False)
+    assert feed.quote_current == ohlcv_ref_df["close"].iloc[-1]
+    pd.testing.assert_frame_equal(feed.ohlcv_closed_df,
+                                  feed.ohlcv_df.iloc[:-1])
+
+
+def test_candle_feed_001(exchange):
+    """Only new candles are fetched once the buffer is filled."""
+    feed = mtr.CandleFeed(exchange, "BTC/USDT", "1h", nb_closed=20)
+
+    feed.update()
+    assert exchange.bkd.fetch_calls == [("BTC/USDT", "1h", None, 21)]
+    assert_feed_equal_last_ohlcv(feed, exchange, 20)
+
+    ts_last = feed.candles[-1][0]
+    for nb_candles in [0, 1, 3]:
+        exchange.bkd.fetch_calls.clear()
+        exchange.bkd.ts_now += nb_candles*TIMEDELTA_MS
+
+        feed.update()
+        assert exchange.bkd.fetch_calls[0] == \
+            ("BTC/USDT", "1h", ts_last, 21)
+        exchange.bkd.fetch_calls.clear()
+        assert_feed_equal_last_ohlcv(feed, exchange, 20)
+        ts_last = feed.candles[-1][0]
+
+    # Too many candles missed: the buffer is filled again
+    exchange.bkd.fetch_calls.clear()
+    exchange.bkd.ts_now += 50*TIMEDELTA_MS
+    feed.update()
+    assert [call[2] for call in exchange.bkd.fetch_calls] == [ts_last, None]
+    exchange.bkd.fetch_calls.clear()
+    assert_feed_equal_last_ohlcv(feed, exchange, 20)
+
+
+def test_candle_feed_002(exchange):
+    """New candles are taken from a stream after the initial fill."""
+    candles_received = []
+
+    def stream():
+        candles = list(candles_received)
+        candles_received.clear()
+        return candles
+
+    feed = mtr.CandleFeed(exchange, "BTC/USDT", "1h", nb_closed=5,
+                          stream=stream)
+    feed.update()
+
+    for it in range(1, 4):
+        exchange.bkd.ts_now += TIMEDELTA_MS
+        # Final values of the previous candle, then the new current candle
+        candles_received.extend(exchange.bkd.fetch_ohlcv(
+            "BTC/USDT", "1h", since=feed.candles[-1][0], limit=2))
+        feed.update()
+
+    # Initial fill, then only the requests feeding the stream stand-in
+    assert len(exchange.bkd.fetch_calls) == 1 + 3
+    exchange.bkd.fetch_calls.clear()
+    assert_feed_equal_last_ohlcv(feed, exchange, 5)
+
+    # Updates of the current candle replace it
+    candle_cur = list(feed.candles[-1])
+    candle_cur[4] += 1
+    feed.push([candle_cur])
+    assert len(feed.ohlcv_df) == 6
+    assert feed.quote_current == candle_cur[4]
+    assert feed.ohlcv_df["close"].iloc[-1] == candle_cur[4]
@@ -0,0 +1,77 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+import numpy as np
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+@pytest.fixture
+def ohlcv_df():
+    rng = np.random.default_rng(56)
+    close = 100*np.exp(np.cumsum(rng.normal(0, 0.01, 50)))
+    open_ = np.concatenate([[100], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, 50))
+
+    return pd.DataFrame({"open": open_,
+                         "high": np.maximum(open_, close)*(1 + spread),
+                         "low": np.minimum(open_, close)*(1 - spread),
+                         "close": close,
+                         "volume": 1.0},
+                        index=pd.date_range("2023-06-01", periods=50,
+                                            freq="1h", tz="UTC",
+                                            name="datetime"))
+
+
+def test_iter_ohlcv_ticks_001(ohlcv_df):
+    """Lazy ticks follow the stacked open, low and high quotes."""
+    exchange = mtr.exchange.ExchangeBase()
+    quote_ref_s = ohlcv_df[["open", "low", "high"]]\
+        .stack().rename("quote").reset_index(1, drop=True)
+
+    ticks = exchange.iter_ohlcv_ticks(ohlcv_df, chunk_size=7)
+    assert not isinstance(ticks, (list, tuple))
+    ticks = list(ticks)
+
+    assert ticks == list(quote_ref_s.items())
+    assert all(type(quote) is float for _, quote in ticks)
+
+    quote_s, ohlcv_closed_df = exchange.flatten_ohlcv(ohlcv_df)
+    pd.testing.assert_series_equal(quote_s, quote_ref_s)
+    pd.testing.assert_frame_equal(ohlcv_closed_df, ohlcv_df.shift(1))
+
+
+@pytest.mark.parametrize("path,quotes_rising,quotes_falling", [
+    ("OLHC", ["open", "low", "high", "close"], ["open", "low", "high", "close"]),
+    ("OHLC", ["open", "high", "low", "close"], ["open", "high", "low", "close"]),
+    ("direction", ["open", "low", "high", "close"],
+     ["open", "high", "low", "close"]),
+])
+def test_iter_ohlcv_ticks_002(ohlcv_df, path, quotes_rising, quotes_falling):
+    """Intrabar paths visit the candle quotes in their order."""
+    exchange = mtr.exchange.ExchangeBase(intrabar_path=path)
+    ticks = list(exchange.iter_ohlcv_ticks(ohlcv_df, chunk_size=8))
+
+    assert len(ticks) == 4*len(ohlcv_df)
+    for pos, (dt, ohlcv_s) in enumerate(ohlcv_df.iterrows()):
+        quote_vars = quotes_rising if ohlcv_s["close"] >= ohlcv_s["open"] \
+            else quotes_falling
+        assert ticks[4*pos:4*pos + 4] == \
+            [(dt, ohlcv_s[var]) for var in quote_vars]
+
+    quote_s, _ = exchange.flatten_ohlcv(ohlcv_df)
+    assert list(quote_s.items()) == ticks
+
+
+def test_iter_ohlcv_ticks_003(ohlcv_df):
+    exchange = mtr.exchange.ExchangeBase(intrabar_path="OCHL")
+
+    with pytest.raises(ValueError):
+        next(exchange.iter_ohlcv_ticks(ohlcv_df))
+
+    with pytest.raises(ValueError):
+        next(mtr.exchange.ExchangeBase(intrabar_path="OHLC")
+             .iter_ohlcv_ticks(ohlcv_df[["open", "high", "low"]]))
@@ -0,0 +1,107 @@
+import mosaic.trading as mtr
+import asyncio
+import pytest
+import pkg_resources
+import pandas as pd
+
+from fake_ccxt import FakeCCXT
+from testing_tools import DMReturnsSign, create_bot
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+TIMEDELTA_MS = 3600*1000
+
+DS_TRADING_SPECS = {'cls': 'DSOHLCV',
+                    'symbol': "BTC/USDT",
+                    'timeframe': "1h"}
+
+BOT_SPECS = {'mode': 'livetest',
+             'exchange': {'cls': 'ExchangeCCXT',
+                          'name': 'binance',
+                          'fees_rates': {'taker': 0.001, 'maker': 0.001}}}
+
+
+class DMFailing(DMReturnsSign):
+
+    def predict_last(self, ohlcv_df, **kwrds):
+        raise ValueError("Broken model")
+
+
+class FakeClock:
+    """Simulated time: sleeping moves the clock and the fake exchange forward."""
+
+    def __init__(self, ts_start, bkd):
+        self.ts = ts_start
+        self.bkd = bkd
+        self.bkd.ts_now = ts_start
+        self.sleeps = []
+
+    def now(self):
+        return self.ts
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.ts += int(1000*seconds)
+        self.bkd.ts_now = self.ts
+        await asyncio.sleep(0)
+
+
+def test_live_runner_001():
+    """Bots share feeds and connections and wake up at candle closes."""
+    bkd = FakeCCXT()
+    clock = FakeClock(1000*TIMEDELTA_MS + 1234, bkd)
+
+    bots = [create_bot(name=name,
+                       ds_trading=dict(DS_TRADING_SPECS, **ds_trading),
+                       **BOT_SPECS)
+            for name, ds_trading in [("btc_1", {}),
+                                     ("btc_2", {}),
+                                     ("eth", {'symbol': "ETH/USDT"}),
+                                     ("btc_2h", {'timeframe': "2h"})]]
+    bots.append(create_bot(DMFailing(), name="broken",
+                           ds_trading=DS_TRADING_SPECS, **BOT_SPECS))
+    bots[0].exchange.bkd = bkd
+
+    runner = mtr.LiveRunner(bots, fetch_delay=2,
+                            clock=clock.now, sleep=clock.sleep)
+    assert len(runner.feeds) == 3
+    assert all(bot.exchange.bkd is bkd for bot in bots)
+
+    runner.run(nb_wakeups=41)
+
+    # One fetch per feed and candle close (2h candles close every 2 wake-ups)
+    fetch_calls_df = pd.DataFrame(bkd.fetch_calls,
+                                  columns=["symbol", "timeframe",
+                                           "since", "limit"])
+    nb_fetch = fetch_calls_df.groupby(["symbol", "timeframe"]).size()
+    assert nb_fetch[("BTC/USDT", "1h")] == 41
+    assert nb_fetch[("ETH/USDT", "1h")] == 41
+    assert nb_fetch[("BTC/USDT", "2h")] == 21
+    assert clock.ts == 1040*TIMEDELTA_MS + 2000
+    assert clock.sleeps[1:] == [3600]*39
+
+    dt_closed = pd.Timestamp((1039*TIMEDELTA_MS), unit="ms", tz="UTC")
+    for bot in bots[:3]:
+        assert bot.status == "finished"
+        assert bot.dt_ohlcv_closed == dt_closed
+        assert bot.portfolio.nb_buy_orders >= 1
+        assert bot.portfolio.nb_sell_orders >= 1
+    assert bots[3].dt_ohlcv_closed == dt_closed - pd.Timedelta("1h")
+
+    # Same data, same decisions
+    assert [od.dt_open for od in bots[0].orders_executed.values()] == \
+        [od.dt_open for od in bots[1].orders_executed.values()]
+
+    # Failing bot is aborted without stopping the others
+    assert bots[4].status == "aborted"
+    assert "Broken model" in bots[4].status_comment
+
+
+def test_live_runner_002():
+    """Only live bots can be run."""
+    bot = create_bot(name="bt", ds_trading=DS_TRADING_SPECS, **BOT_SPECS)
+    bot.mode = "btfast"
+    with pytest.raises(ValueError):
+        mtr.LiveRunner([bot])
@@ -0,0 +1,97 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import numpy as np
+import ccxt
+from datetime import datetime, timezone
+
+from fake_ccxt import FakeCCXT
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+from mosaic.trading.ohlcv_download import \
+    fetch_ohlcv_pages, compute_max_workers, compute_backoff
+
+TIMEDELTA_MS = 60*1000
+TS_START = int(datetime(2023, 1, 1, tzinfo=timezone.utc).timestamp()*1000)
+
+
+def test_ohlcv_download_001():
+    """Concurrent pages are merged, de-duplicated and sorted."""
+    bkd = FakeCCXT(rateLimit=1, latency=0.02, nb_extra=3)
+    ts_end = TS_START + 5000*TIMEDELTA_MS
+
+    ohlcv_df, stats = fetch_ohlcv_pages(bkd, "BTC/USDT", "1m",
+                                        TS_START, ts_end,
+                                        fetch_limit=500, max_workers=4)
+
+    assert stats["nb_pages"] == 10
+    assert stats["nb_candles"] == 5000
+    assert stats["candles_per_sec"] > 0
+    assert bkd.nb_running_max > 1
+    np.testing.assert_array_equal(
+        ohlcv_df["timestamp"],
+        np.arange(TS_START, ts_end, TIMEDELTA_MS))
+    np.testing.assert_allclose(
+        ohlcv_df.drop(columns="timestamp").values,
+        [FakeCCXT.candle(ts, TIMEDELTA_MS)[1:]
+         for ts in ohlcv_df["timestamp"]])
+
+
+def test_ohlcv_download_002():
+    """Requests are spaced by the backend rate limit."""
+    bkd = FakeCCXT(rateLimit=20)
+
+    fetch_ohlcv_pages(bkd, "BTC/USDT", "1m",
+                      TS_START, TS_START + 3000*TIMEDELTA_MS,
+                      fetch_limit=500)
+
+    assert len(bkd.fetch_calls) == 6
+    assert (np.diff(sorted(bkd.fetch_times)) > 0.018).all()
+    assert compute_max_workers(20) == 16
+    assert compute_max_workers(500) == 2
+    assert compute_max_workers(2000) == 1
+
+
+def test_ohlcv_download_003():
+    """Failed requests are retried with backoff until max tries."""
+    bkd = FakeCCXT(rateLimit=1, nb_failures=2)
+    ohlcv_df, stats = fetch_ohlcv_pages(bkd, "BTC/USDT", "1m",
+                                        TS_START, TS_START + 100*TIMEDELTA_MS,
+                                        max_tries=3, backoff_base=0.001)
+    assert stats["nb_retries"] == 2
+    assert len(ohlcv_df) == 100
+
+    bkd = FakeCCXT(rateLimit=1, nb_failures=3)
+    with pytest.raises(ValueError) as excinfo:
+        fetch_ohlcv_pages(bkd, "BTC/USDT", "1m",
+                          TS_START, TS_START + 100*TIMEDELTA_MS,
+                          max_tries=3, backoff_base=0.001)
+    assert isinstance(excinfo.value.__cause__, ccxt.NetworkError)
+
+    # Non transient errors are not retried
+    bkd = FakeCCXT(rateLimit=1, nb_failures=1, error_cls=ccxt.BadSymbol)
+    with pytest.raises(ccxt.BadSymbol):
+        fetch_ohlcv_pages(bkd, "BTC/USDT", "1m",
+                          TS_START, TS_START + 10*TIMEDELTA_MS,
+                          max_tries=3, backoff_base=0.001)
+    assert len(bkd.fetch_calls) == 1
+
+    backoff_list = [compute_backoff(nb_tries, backoff_base=1, backoff_max=5)
+                    for nb_tries in [1, 2, 3, 4, 5]*100]
+    assert 0 <= min(backoff_list) and max(backoff_list) <= 5
+
+
+def test_ohlcv_download_004():
+    """Exchange historic data are fetched through the scheduler."""
+    exchange = mtr.ExchangeCCXT(name="binance")
+    exchange.bkd = FakeCCXT(rateLimit=1)
+
+    ohlcv_df = exchange.fetch_historic_ohlcv(
+        TS_START, TS_START + 1200*TIMEDELTA_MS,
+        symbol="BTC/USDT", timeframe="1m")
+
+    assert len(exchange.bkd.fetch_calls) == 3
+    assert len(ohlcv_df) == 1200
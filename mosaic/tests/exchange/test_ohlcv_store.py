@@ -0,0 +1,127 @@
+import mosaic.trading as mtr
+import pytest
+import pkg_resources
+import pandas as pd
+import numpy as np
+import os
+from datetime import datetime, timezone
+
+from fake_ccxt import FakeCCXT
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+pytest.importorskip("pyarrow")
+
+TIMEDELTA_MS = 3600*1000
+
+
+def ts_utc(date_str):
+    return int(1000*datetime.fromisoformat(date_str)
+               .replace(tzinfo=timezone.utc).timestamp())
+
+
+@pytest.fixture
+def exchange(tmp_path):
+    exchange = mtr.ExchangeCCXT(
+        name="binance",
+        ohlcv_store=mtr.OHLCVStore(root_dir=str(tmp_path)))
+    exchange.bkd = FakeCCXT()
+    return exchange
+
+
+def test_ohlcv_store_001(exchange):
+    """Only missing gaps are fetched and stored data are served back."""
+    ohlcv_df = exchange.get_historic_ohlcv(
+        date_start="2023-01-01 00:00:00", date_end="2023-01-10 00:00:00",
+        symbol="BTC/USDT", timeframe="1h")
+
+    assert len(ohlcv_df) == 9*24
+    assert len(exchange.bkd.fetch_calls) == 1
+    assert ohlcv_df["timestamp"].iloc[0] == ts_utc("2023-01-01 00:00:00")
+    np.testing.assert_allclose(
+        ohlcv_df[["open", "high", "low", "close", "volume"]].values,
+        [FakeCCXT.candle(ts, TIMEDELTA_MS)[1:]
+         for ts in ohlcv_df["timestamp"]])
+
+    # Sub-range is fully served from the store
+    ohlcv_sub_df = exchange.get_historic_ohlcv(
+        date_start="2023-01-03 00:00:00", date_end="2023-01-04 00:00:00",
+        symbol="BTC/USDT", timeframe="1h")
+    assert len(exchange.bkd.fetch_calls) == 1
+    pd.testing.assert_frame_equal(
+        ohlcv_sub_df, ohlcv_df.iloc[48:72])
+
+    # Overlapping range only fetches the gap
+    ohlcv_df = exchange.get_historic_ohlcv(
+        date_start="2023-01-05 00:00:00", date_end="2023-01-15 00:00:00",
+        symbol="BTC/USDT", timeframe="1h")
+    assert len(ohlcv_df) == 10*24
+    assert exchange.bkd.fetch_calls[-1][2] == ts_utc("2023-01-10 00:00:00")
+    assert exchange.ohlcv_store.get_coverage("binance", "BTC/USDT", "1h") == \
+        [(ts_utc("2023-01-01 00:00:00"), ts_utc("2023-01-15 00:00:00"))]
+    assert not ohlcv_df.index.duplicated().any()
+
+
+def test_ohlcv_store_002(exchange):
+    """Data are partitioned by month and read with column projection."""
+    ohlcv_df = exchange.get_historic_ohlcv(
+        date_start="2023-01-25 00:00:00", date_end="2023-02-05 00:00:00",
+        symbol="BTC/USDT", timeframe="1h", columns=["close"])
+
+    store_dir = exchange.ohlcv_store.partition_dir("binance", "BTC/USDT", "1h")
+    assert sorted(os.listdir(store_dir)) == \
+        ["2023-01.parquet", "2023-02.parquet", "coverage.json"]
+
+    assert list(ohlcv_df.columns) == ["timestamp", "close"]
+    assert ohlcv_df.index.name == "datetime"
+    assert len(ohlcv_df) == 11*24
+
+
+def test_ohlcv_store_003(tmp_path):
+    """Open candle is not recorded as covered."""
+    store = mtr.OHLCVStore(root_dir=str(tmp_path))
+    ts_start = ts_utc("2023-01-01 00:00:00")
+    ts_now = ts_start + 10*TIMEDELTA_MS + 1000
+    fake_bkd = FakeCCXT(ts_now=ts_now)
+
+    def fetch_fun(ts_s, ts_e):
+        limit = (ts_e - ts_s)//TIMEDELTA_MS
+        return pd.DataFrame(fake_bkd.fetch_ohlcv("BTC/USDT", "1h",
+                                                 since=ts_s, limit=limit),
+                            columns=mtr.ohlcv_store.OHLCV_STORE_VAR)
+
+    ohlcv_df = store.get_ohlcv("fake", "BTC/USDT", "1h",
+                               ts_start, ts_start + 24*TIMEDELTA_MS,
+                               fetch_fun=fetch_fun, ts_now=ts_now)
+
+    assert len(ohlcv_df) == 10
+    assert store.find_gaps("fake", "BTC/USDT", "1h",
+                           ts_start, ts_start + 24*TIMEDELTA_MS) == \
+        [(ts_start + 10*TIMEDELTA_MS, ts_start + 24*TIMEDELTA_MS)]
+
+
+def test_ohlcv_store_004(exchange):
+    """Bot OHLCV data are read from the store without fetching."""
+    exchange.get_historic_ohlcv(
+        date_start="2023-01-01 00:00:00", date_end="2023-02-01 00:00:00",
+        symbol="BTC/USDT", timeframe="1h")
+
+    bot = mtr.BotTrading.from_dict({
+        'cls': 'BotTrading',
+        'name': 'bot_store',
+        'mode': 'btfast',
+        'ds_trading': {'symbol': 'BTC/USDT', 'timeframe': '1h',
+                       'dt_start': '2023-01-02 00:00:00+00:00',
+                       'dt_end': '2023-01-20 00:00:00+00:00'},
+        'exchange': exchange.dict(),
+    })
+    bot.exchange.bkd = FakeCCXT()
+    bot.load_ohlcv_data()
+
+    assert len(bot.exchange.bkd.fetch_calls) == 0
+
+    ohlcv_df = bot.ohlcv_trading_dfd[bot.ds_trading_code]
+    assert len(ohlcv_df) == 18*24
+    assert ohlcv_df["timestamp"].iloc[0] == ts_utc("2023-01-02 00:00:00")
@@ -0,0 +1,105 @@
+import mosaic.indicator as mid
+import mosaic.predict_model as mpm
+import mosaic.decision_model as mdm
+import pytest
+import pkg_resources
+import pandas as pd
+import os
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture
+def data_btc_usdc_1000_df():
+
+    data_filename = os.path.join(DATA_PATH, "data_btc_usdc_1000.csv")
+    data_df = pd.read_csv(data_filename, sep=";", index_col="datetime")
+    return data_df
+
+
+@pytest.fixture
+def sri_compute_counter(monkeypatch):
+
+    nb_computes = []
+    sri_compute = mid.SRI.compute
+
+    def compute(self, ohlcv_df, **kwrds):
+        nb_computes.append(self.length)
+        return sri_compute(self, ohlcv_df, **kwrds)
+
+    monkeypatch.setattr(mid.SRI, "compute", compute)
+    return nb_computes
+
+
+def test_features_cache_001(data_btc_usdc_1000_df, sri_compute_counter):
+    """Features are computed once per dataset across models."""
+    dm = mdm.DM2ML(
+        pm_buy=mpm.PMOLS(features=[mid.SRI(length=5)]),
+        pm_sell=mpm.PMOLS(features=[mid.SRI(length=5), mid.Candle()]),
+        features_cache=mid.FeaturesCache())
+
+    features_buy_df = dm.pm_buy.compute_features(data_btc_usdc_1000_df)
+    features_sell_df = dm.pm_sell.compute_features(data_btc_usdc_1000_df)
+    dm.pm_buy.compute_features(data_btc_usdc_1000_df.copy())
+    assert sri_compute_counter == [5]
+    assert dm.features_cache.nb_entries == 2
+
+    pd.testing.assert_frame_equal(
+        features_buy_df,
+        mid.SRI(length=5).compute(data_btc_usdc_1000_df))
+    pd.testing.assert_frame_equal(
+        features_sell_df,
+        pd.concat([mid.SRI(length=5).compute(data_btc_usdc_1000_df),
+                   mid.Candle().compute(data_btc_usdc_1000_df)], axis=1))
+
+    # Returned features are copies
+    sri_compute_counter.clear()
+    features_buy_df.iloc[:] = 0
+    pd.testing.assert_frame_equal(
+        dm.pm_buy.compute_features(data_btc_usdc_1000_df),
+        features_sell_df[features_buy_df.columns])
+
+    # Other data or other parameters
+    dm.pm_buy.compute_features(data_btc_usdc_1000_df.iloc[1:])
+    mpm.PMOLS(features=[mid.SRI(length=6)],
+              features_cache=dm.features_cache)\
+       .compute_features(data_btc_usdc_1000_df)
+    assert sri_compute_counter == [5, 6]
+
+
+def test_features_cache_002(data_btc_usdc_1000_df, sri_compute_counter):
+    """Least recently used features are evicted from memory."""
+    features_cache = mid.FeaturesCache(max_entries=2)
+    for length in [3, 4, 3, 5, 3, 4]:
+        features_cache.compute([mid.SRI(length=length)],
+                               data_btc_usdc_1000_df)
+
+    assert sri_compute_counter == [3, 4, 5, 4]
+    assert features_cache.nb_entries == 2
+
+
+def test_features_cache_003(data_btc_usdc_1000_df, sri_compute_counter,
+                            tmp_path):
+    """Features are shared across runs with the disk cache."""
+    pytest.importorskip("pyarrow")
+
+    indicators = [mid.SRI(length=5), mid.RSI(length=3)]
+    features_df_list = \
+        mid.FeaturesCache(cache_dir=str(tmp_path))\
+           .compute(indicators, data_btc_usdc_1000_df)
+    assert len(os.listdir(tmp_path)) == 2
+
+    features_cache = mid.FeaturesCache(cache_dir=str(tmp_path))
+    features_cached_df_list = \
+        features_cache.compute(indicators, data_btc_usdc_1000_df)
+    assert sri_compute_counter == [5]
+    assert features_cache.nb_entries == 2
+
+    for features_df, features_cached_df in \
+            zip(features_df_list, features_cached_df_list):
+        pd.testing.assert_frame_equal(features_df, features_cached_df)
@@ -114,3 +114,42 @@ def test_sri_005(data_btc_usdc_20_df):
     indic_expect = [[np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [np.nan, 0.0, 0.0], [-1.0, 2.0, 3.0], [-1.0, 3.0, 3.0], [-0.6568888888888371, 4.0, 3.0], [-0.5700740740740138, 5.0, 2.0], [-0.9558320373250953, 6.0, 2.0], [-1.0, 2.0, 1.0], [-1.0, 1.0, 6.0], [-1.0, 1.0, 5.0], [-1.0, 2.0, 4.0], [-1.0, 1.0, 4.0]]
 
     np.testing.assert_allclose(indic_df, indic_expect)
+
+
+@pytest.mark.parametrize("length", [1, 7, 50, 300])
+def test_sri_006(length):
+    """Sliding window hit counts equal the shifted columns reference."""
+    rng = np.random.default_rng(length)
+    data_df = pd.DataFrame(rng.normal(0, 1, (1000, 4)).cumsum(axis=0),
+                           columns=["open", "high", "low", "close"])
+    data_df.iloc[500] = np.nan
+
+    indic = mid.SRI(length=length)
+    indic_df, data_range_min, data_range_max = \
+        indic.compute(data_df, return_range=True)
+
+    hl_expect = pd.concat([(data_df["low"].shift(i) < data_range_min)
+                           for i in range(length)], axis=1).sum(axis=1)
+    hh_expect = pd.concat([(data_df["high"].shift(i) > data_range_max)
+                           for i in range(length)], axis=1).sum(axis=1)
+
+    np.testing.assert_array_equal(indic_df[indic.names("hl")], hl_expect)
+    np.testing.assert_array_equal(indic_df[indic.names("hh")], hh_expect)
+
+
+@pytest.mark.parametrize("side", ["lower", "upper"])
+def test_sri_007(side, monkeypatch):
+    """Rolling sorted window counts equal shift by shift counts."""
+    rng = np.random.default_rng(7)
+    data = rng.normal(0, 1, 2000)
+    bound = rng.normal(0, 1, 2000)
+    data[[10, 400, 401]] = np.nan
+    bound[[3, 1500]] = np.nan
+
+    for length in [1, 25, 1300]:
+        monkeypatch.setattr(mid.sri, "WINDOW_HITS_SHIFT_MAX_LENGTH", 10**6)
+        hits_shift = mid.sri.count_window_hits(data, bound, length, side=side)
+        monkeypatch.setattr(mid.sri, "WINDOW_HITS_SHIFT_MAX_LENGTH", 0)
+        hits_rolling = mid.sri.count_window_hits(data, bound, length, side=side)
+
+        np.testing.assert_array_equal(hits_rolling, hits_shift)
@@ -0,0 +1,89 @@
+import mosaic.indicator as mid
+import pytest
+import pkg_resources
+import pandas as pd
+import numpy as np
+import os
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data")
+
+NB_HISTORY = 300
+
+
+@pytest.fixture
+def data_btc_usdc_1000_df():
+
+    data_filename = os.path.join(DATA_PATH, "data_btc_usdc_1000.csv")
+    data_df = pd.read_csv(data_filename, sep=";", index_col="datetime")
+    return data_df
+
+
+def compute_streaming(indic, ohlcv_df, nb_history=NB_HISTORY):
+    """Initialize indicator state with history and update with next bars."""
+    indic.init_state(ohlcv_df.iloc[:nb_history])
+    return pd.DataFrame([indic.update(ohlcv_df.iloc[i])
+                         for i in range(nb_history, len(ohlcv_df))])
+
+
+@pytest.mark.parametrize("indic", [
+    mid.Returns(),
+    mid.Returns(horizon=-3),
+    mid.ReturnsRolling(horizon=-3),
+    mid.ReturnsRolling(horizon=-2, fun="min", var="low"),
+    mid.RSI(length=14),
+    mid.RSI(length=5, mode="simple"),
+    mid.MFI(),
+    mid.MFI(length=1),
+    mid.sri.RangeIndex(length=5),
+    mid.SRI(length=10),
+    mid.SRI(length=1),
+    mid.Candle(),
+    mid.Candle(variation_length=3),
+])
+def test_streaming_001(indic, data_btc_usdc_1000_df):
+    """Streaming updates are bit-for-bit equal to batch computation."""
+    indic_df = indic.compute(data_btc_usdc_1000_df).iloc[NB_HISTORY:]
+    indic_stream_df = compute_streaming(indic, data_btc_usdc_1000_df)
+
+    assert list(indic_stream_df.columns) == list(indic_df.columns)
+    assert (indic_stream_df.index == indic_df.index).all()
+    np.testing.assert_array_equal(indic_stream_df.values,
+                                  indic_df.values.astype(float))
+
+
+def test_streaming_002(data_btc_usdc_1000_df):
+    """Generic window recomputation for indicators without dedicated state."""
+    indic = mid.ReturnsRolling(horizon=-2, fun="mean")
+    indic_df = indic.compute(data_btc_usdc_1000_df).iloc[NB_HISTORY:]
+    indic_stream_df = compute_streaming(indic, data_btc_usdc_1000_df)
+
+    np.testing.assert_allclose(indic_stream_df.values, indic_df.values,
+                               rtol=0, atol=1e-15)
+
+
+def test_streaming_003(data_btc_usdc_1000_df):
+    """Future dependent values are not available when streaming."""
+    indic = mid.Returns(horizon=2)
+    indic_stream_df = compute_streaming(indic, data_btc_usdc_1000_df)
+
+    assert indic_stream_df.isna().all().all()
+
+
+def test_streaming_004(data_btc_usdc_1000_df):
+    """Streaming state handles missing values and constant prices as batch."""
+    data_df = data_btc_usdc_1000_df.iloc[:400].copy()
+    data_df.iloc[310:330] = data_df.iloc[310]
+    data_df.iloc[350] = np.nan
+
+    for indic in [mid.RSI(), mid.RSI(mode="simple"), mid.MFI(length=5),
+                  mid.SRI(length=5), mid.Candle(variation_length=2)]:
+        indic_df = indic.compute(data_df).iloc[NB_HISTORY:]
+        indic_stream_df = compute_streaming(indic, data_df)
+
+        np.testing.assert_array_equal(indic_stream_df.values,
+                                      indic_df.values.astype(float))
@@ -0,0 +1,78 @@
+import mosaic.predict_model as mpm
+import mosaic.decision_model as mdm
+import mosaic.indicator as mid
+import os
+import time
+import pytest
+import pkg_resources
+import pandas as pd
+from mosaic.core import ObjMOSAIC
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+@pytest.fixture
+def pm_fit_counter(monkeypatch):
+
+    nb_fits = []
+    pmols_fit = mpm.PMOLS.fit
+
+    def fit(self, ohlcv_df, **kwrds):
+        nb_fits.append(1)
+        return pmols_fit(self, ohlcv_df, **kwrds)
+
+    monkeypatch.setattr(mpm.PMOLS, "fit", fit)
+    return nb_fits
+
+
+def create_dm(cache_dir, length=5, max_entries=10):
+    return mdm.DM1ML(
+        pm=mpm.PMOLS(features=[mid.SRI(length=length)]),
+        fit_cache=mpm.PMCache(cache_dir=str(cache_dir),
+                              max_entries=max_entries))
+
+
+def test_pm_cache_001(data_random_walk_df, pm_fit_counter, tmp_path):
+    """Models already fitted on the same data are loaded from cache."""
+    train_df = data_random_walk_df.iloc[:400]
+
+    dm = create_dm(tmp_path)
+    dm.fit(train_df)
+    assert len(pm_fit_counter) == 1
+
+    dm_cached = ObjMOSAIC.from_dict(dm.dict())
+    dm_cached.fit(train_df.copy())
+    assert len(pm_fit_counter) == 1
+    assert dm_cached.pm.var_features == dm.pm.var_features
+    pd.testing.assert_series_equal(dm_cached.pm.bkd.params,
+                                   dm.pm.bkd.params)
+    pd.testing.assert_frame_equal(dm_cached.predict(data_random_walk_df),
+                                  dm.predict(data_random_walk_df))
+
+    # Other data or other model configuration
+    create_dm(tmp_path).fit(data_random_walk_df.iloc[:401])
+    create_dm(tmp_path, length=6).fit(train_df)
+    assert len(pm_fit_counter) == 3
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_pm_cache_002(data_random_walk_df, pm_fit_counter, tmp_path):
+    """Least recently used models are evicted."""
+    for length in [3, 4, 5]:
+        create_dm(tmp_path, length=length, max_entries=2)\
+            .fit(data_random_walk_df)
+        time.sleep(0.01)
+    assert len(os.listdir(tmp_path)) == 2
+
+    # Length 4 model is used, then length 5 model is evicted
+    create_dm(tmp_path, length=4, max_entries=2).fit(data_random_walk_df)
+    time.sleep(0.01)
+    create_dm(tmp_path, length=6, max_entries=2).fit(data_random_walk_df)
+    assert len(pm_fit_counter) == 4
+
+    create_dm(tmp_path, length=4, max_entries=2).fit(data_random_walk_df)
+    assert len(pm_fit_counter) == 4
+    create_dm(tmp_path, length=5, max_entries=2).fit(data_random_walk_df)
+    assert len(pm_fit_counter) == 5
@@ -513,3 +513,109 @@ def test_pm_lstm_009(data_btc_usdc_800_df,
                 test_id=test_id,
                 expected_results=expected_results,
                 update_expect=update_expect)
+
+
+@pytest.mark.parametrize("seq_length", [1, 3, 10])
+def test_pm_lstm_windows_001(data_random_walk_df, seq_length):
+    """Sequences are zero-copy views equal to the former iloc windows."""
+    model = mpm.PMLSTM(features=[mid.Candle(variation_length=2)],
+                       sk_preproc="MinMaxScaler",
+                       params=dict(seq_length=seq_length))
+
+    features_arr, target_arr = model.prepare_data_fit(data_random_walk_df)
+    features_df, target_s = \
+        mpm.PMReturns.prepare_data_fit(model, data_random_walk_df)
+
+    nb_seq = len(features_df) - seq_length + 1
+    features_expect_arr = np.array(
+        [features_df.iloc[i:(i + seq_length)].values for i in range(nb_seq)])
+    target_expect_arr = np.array(
+        [target_s.iloc[i + seq_length - 1] for i in range(nb_seq)])
+
+    assert features_arr.shape == (nb_seq, seq_length, len(model.var_features))
+    np.testing.assert_array_equal(features_arr, features_expect_arr)
+    np.testing.assert_array_equal(target_arr, target_expect_arr)
+    assert features_arr.base is not None
+
+    features_pred_arr = model.prepare_data_predict(data_random_walk_df,
+                                                   dropna=False)
+    features_pred_df = mpm.PMReturns.prepare_data_predict(
+        model, data_random_walk_df, dropna=False)
+    assert len(features_pred_arr) == len(data_random_walk_df) - seq_length + 1
+    np.testing.assert_array_equal(
+        features_pred_arr,
+        np.array([features_pred_df.iloc[i:(i + seq_length)].values
+                  for i in range(len(features_pred_arr))]))
+
+
+def test_pm_lstm_windows_002(data_random_walk_df):
+    """Batches streamed from views rebuild the whole sequences tensor."""
+    model = mpm.PMLSTM(features=[mid.Candle()], params=dict(seq_length=4))
+    features_arr, target_arr = model.prepare_data_fit(data_random_walk_df)
+
+    batches = list(mpm.pm_lstm.iter_batches(32, features_arr, target_arr))
+    assert all(len(features_b) <= 32 for features_b, _ in batches)
+    assert all(features_b.flags["C_CONTIGUOUS"] for features_b, _ in batches)
+    np.testing.assert_array_equal(
+        np.concatenate([features_b for features_b, _ in batches]),
+        features_arr)
+
+    np.random.seed(56)
+    batches = list(mpm.pm_lstm.iter_batches(32, features_arr, target_arr,
+                                            shuffle=True))
+    features_shuffle_arr = np.concatenate([b for b, _ in batches])
+    target_shuffle_arr = np.concatenate([b for _, b in batches])
+    order = np.lexsort(features_shuffle_arr[:, -1, :].T)
+    order_expect = np.lexsort(features_arr[:, -1, :].T)
+    np.testing.assert_array_equal(features_shuffle_arr[order],
+                                  features_arr[order_expect])
+    np.testing.assert_array_equal(target_shuffle_arr[order],
+                                  target_arr[order_expect])
+
+    assert mpm.pm_lstm.compute_windows(features_arr[:2, 0], 4).shape == \
+        (0, 4, features_arr.shape[2])
+
+
+class FakeNet:
+    """Network stand-in: sum of each sequence features."""
+
+    def __init__(self):
+        self.nb_calls = 0
+        self.nb_predict = 0
+
+    def __call__(self, features_arr, training=False):
+        self.nb_calls += 1
+        return features_arr.sum(axis=(1, 2)).reshape(-1, 1)
+
+    def predict(self, features_arr):
+        self.nb_predict += 1
+        return self(np.asarray(features_arr))
+
+
+def test_pm_lstm_predict_last_001(data_random_walk_df):
+    """Last-only prediction equals the last full prediction."""
+    model = mpm.PMLSTM(features=[mid.Candle(variation_length=2),
+                                 mid.SRI(length=5)],
+                       sk_preproc="StandardScaler",
+                       params=dict(seq_length=3))
+    model.prepare_data_fit(data_random_walk_df.iloc[:300])
+    model.bkd = FakeNet()
+
+    bw_length = model.bw_length
+    for i in range(300, 340):
+        ohlcv_cur_df = data_random_walk_df.iloc[i - bw_length - 20:i]
+        pred_last_s = model.predict_last(ohlcv_cur_df)
+        pred_s = model.predict(ohlcv_cur_df)
+
+        assert len(pred_last_s) == 1
+        assert pred_last_s.index[0] == ohlcv_cur_df.index[-1]
+        assert pred_last_s.iloc[0] == pytest.approx(pred_s.iloc[-1],
+                                                    rel=1e-12)
+
+    # One direct network call per bar
+    assert model.bkd.nb_calls == 40 + model.bkd.nb_predict
+
+    # Non contiguous data rebuilds the features buffer
+    ohlcv_cur_df = data_random_walk_df.iloc[400:450]
+    assert model.predict_last(ohlcv_cur_df).iloc[0] == \
+        pytest.approx(model.predict(ohlcv_cur_df).iloc[-1], rel=1e-12)
@@ -0,0 +1,95 @@
+import mosaic.predict_model as mpm
+import mosaic.decision_model as mdm
+import mosaic.indicator as mid
+import pytest
+import pkg_resources
+import pandas as pd
+import numpy as np
+import statsmodels.api as sm
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb
+
+
+def fit_statsmodels(model, ohlcv_df, forgetting_factor=1):
+    features_df, target_s = \
+        mpm.PMReturns.prepare_data_fit(model, ohlcv_df)
+    features_df = sm.add_constant(features_df, has_constant="add")
+    weights = forgetting_factor**np.arange(len(target_s) - 1, -1, -1)
+    return sm.WLS(target_s, features_df, weights=weights).fit().params
+
+
+@pytest.mark.parametrize("forgetting_factor", [1, 0.99])
+@pytest.mark.parametrize("returns_horizon", [0, 2])
+def test_pm_rls_001(data_random_walk_df, forgetting_factor, returns_horizon):
+    """Recursive updates give batch (weighted) least squares estimates."""
+    model_params = dict(features=[mid.SRI(length=5), mid.RSI(length=3),
+                                  mid.MFI(length=4)],
+                        returns_horizon=returns_horizon)
+    model = mpm.PMRLS(forgetting_factor=forgetting_factor,
+                      record_coefs=True, **model_params)
+
+    model.fit(data_random_walk_df.iloc[:200])
+    pd.testing.assert_series_equal(
+        model.coefs,
+        fit_statsmodels(model, data_random_walk_df.iloc[:200],
+                        forgetting_factor),
+        check_names=False, rtol=1e-8)
+
+    model.update(data_random_walk_df)
+    pd.testing.assert_series_equal(
+        model.coefs,
+        fit_statsmodels(model, data_random_walk_df, forgetting_factor),
+        check_names=False, rtol=1e-6)
+
+    # One snapshot per update
+    coefs_history_df = model.coefs_history
+    assert len(coefs_history_df) == 500 - 200 + 1
+    assert coefs_history_df.index[-1] == \
+        data_random_walk_df.index[-2 - returns_horizon]
+    pd.testing.assert_series_equal(coefs_history_df.iloc[-1], model.coefs,
+                                   check_names=False)
+
+
+def test_pm_rls_002(data_random_walk_df):
+    """Per bar updates on sliding windows equal one update on all data."""
+    model_bar = mpm.PMRLS(features=[mid.SRI(length=5)],
+                          forgetting_factor=0.995, returns_horizon=1)
+    model_all = model_bar.copy(deep=True)
+    dm = mdm.DM1ML(pm=model_bar)
+    assert dm.online
+
+    dm.fit(data_random_walk_df.iloc[:200])
+    model_all.fit(data_random_walk_df.iloc[:200])
+
+    bw_length = dm.bw_length
+    for i in range(201, 300):
+        ohlcv_cur_df = data_random_walk_df.iloc[i - bw_length - 1:i]
+        dm.update(ohlcv_cur_df)
+        score_last = dm.predict_last(ohlcv_cur_df)["score"].iloc[-1]
+        assert score_last == \
+            pytest.approx(dm.predict(ohlcv_cur_df)["score"].iloc[-1])
+
+    model_all.update(data_random_walk_df.iloc[:299])
+    pd.testing.assert_series_equal(dm.pm.coefs, model_all.coefs,
+                                   rtol=1e-10)
+
+
+def test_pm_rls_003(data_random_walk_df):
+    """Coefficients snapshots are optional and bounded."""
+    model = mpm.PMRLS(features=[mid.SRI(length=5)])
+    model.fit(data_random_walk_df.iloc[:200])
+    model.update(data_random_walk_df)
+    assert len(model.coefs_history) == 0
+
+    model = mpm.PMRLS(features=[mid.SRI(length=5)],
+                      record_coefs=True, coefs_history_length=50)
+    model.fit(data_random_walk_df.iloc[:200])
+    model.update(data_random_walk_df)
+
+    coefs_history_df = model.coefs_history
+    assert len(coefs_history_df) == 50
+    assert coefs_history_df.index[-1] == data_random_walk_df.index[-2]
+    pd.testing.assert_series_equal(coefs_history_df.iloc[-1], model.coefs,
+                                   check_names=False)
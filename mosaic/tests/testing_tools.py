@@ -0,0 +1,95 @@
+"""Helpers shared by the tests and the benchmarks."""
+from datetime import timedelta
+import typing
+import pkg_resources
+import pandas as pd
+import numpy as np
+import mosaic.indicator as mid
+import mosaic.decision_model as mdm
+import mosaic.trading as mtr
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class DMReturnsSign(mdm.DMDR):
+    """A dummy decision model buying after rises and selling after falls."""
+
+    features: typing.Dict[str, mid.Indicator] = {
+        "ret": mid.Returns(horizon=0),
+    }
+
+    def compute_signal_idx(self, features_df):
+
+        ret_s = features_df["ret_close_0"]
+        idx_buy = ret_s > 0.001
+        idx_sell = ret_s < -0.001
+
+        return idx_buy, idx_sell
+
+
+def prepare_random_ohlcv_data(nb_data=300, seed=42,
+                              dt_start='2023-06-01 00:00:00+0200',
+                              tdelta=timedelta(minutes=5)):
+    """Prepares a random walk OHLCV DataFrame."""
+    rng = np.random.default_rng(seed)
+    close = 100*np.exp(np.cumsum(rng.normal(0, 0.003, nb_data)))
+    open_ = np.concatenate([[100], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, nb_data))
+    high = np.maximum(open_, close)*(1 + spread)
+    low = np.minimum(open_, close)*(1 - spread)
+    index = pd.date_range(pd.Timestamp(dt_start), periods=nb_data, freq=tdelta)
+
+    return pd.DataFrame({"open": open_, "high": high, "low": low,
+                         "close": close, "volume": 1.0}, index=index)
+
+
+def prepare_random_walk_data(nb_data=500, seed=56):
+    """Prepares an hourly random walk OHLCV DataFrame with random volumes."""
+    rng = np.random.default_rng(seed)
+    close = 100*np.exp(np.cumsum(rng.normal(0, 0.01, nb_data)))
+    open_ = np.concatenate([[100], close[:-1]])
+    data_df = pd.DataFrame(
+        {"open": open_,
+         "high": np.maximum(open_, close)*(1 + rng.uniform(0, 0.01, nb_data)),
+         "low": np.minimum(open_, close)*(1 - rng.uniform(0, 0.01, nb_data)),
+         "close": close,
+         "volume": rng.uniform(1, 10, nb_data)},
+        index=pd.date_range("2023-01-01", periods=nb_data, freq="1h",
+                            name="datetime"))
+    return data_df
+
+
+def create_bot(decision_model=None, checkpoint=None, fees=0.001, exchange={},
+               **specs):
+    """Creates a test trading bot.
+
+    The default bot runs a btclassic session of market orders on a test
+    exchange, with `DMReturnsSign` decisions.
+
+    Args:
+        decision_model (DMBase): Bot decision model, a new `DMReturnsSign`
+            by default.
+        checkpoint (BotCheckpoint): Bot checkpoint, set after the bot
+            creation so that its data backend is not copied.
+        fees (float): Exchange taker and maker fees rate.
+        exchange (dict): Exchange specs overriding the default ones.
+        **specs: Bot specs overriding the default ones.
+    """
+    bot_specs = {
+        'cls': 'BotTrading',
+        'name': 'bot_test',
+        'mode': 'btclassic',
+        'order_model': {'cls': 'OrderMarket'},
+        'exchange': {'cls': 'ExchangeBase',
+                     'name': 'test_exchange',
+                     'fees_rates': {'taker': fees, 'maker': fees},
+                     **exchange},
+    }
+    bot_specs.update(specs)
+    bot = mtr.BotTrading.from_dict(bot_specs)
+    bot.decision_model = DMReturnsSign() if decision_model is None \
+        else decision_model
+    bot.checkpoint = checkpoint
+    return bot
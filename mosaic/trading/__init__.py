@@ -1,4 +1,12 @@
 # Trading package
 from .orders import OrderBase, OrderMarket, OrderTrailingMarket
 from .bot import BotTrading, Portfolio
+from .bt_fast import BTFastEngine, BTFillEngine
+from .portfolio_history import PortfolioHistory
+from .bot_sweep import sweep_bot
+from .walk_forward import WalkForward
+from .candle_feed import CandleFeed
+from .live_runner import LiveRunner
+from .checkpoint import BotCheckpoint
 from .exchange import ExchangeCCXT
+from .ohlcv_store import OHLCVStore
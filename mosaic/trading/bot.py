@@ -23,14 +23,31 @@ if 'colored' in installed_pkg:
     import colored # noqa: F401
 
 from ..core import ObjMOSAIC
-from .orders import OrderBase, OrderMarket
+from .orders import OrderBase, OrderMarket, OrderTrailingMarket
 from .exchange import ExchangeBase
+from .bot_sweep import sweep_bot
+from .walk_forward import WalkForward
+from .candle_feed import CandleFeed
+from .checkpoint import BotCheckpoint
+from .order_book import OrderBook
+from .portfolio_history import PortfolioHistory
+from .portfolio_update import PortfolioUpdateMixin
+from .sim_objects import SimOrder, SimPortfolio, SIM_ORDER_CLASSES
+from .bt_fast import \
+    BTFastEngine, \
+    BTFillEngine, \
+    compute_order_signals, \
+    compute_threshold_grid_performance, \
+    decision_to_code, \
+    decisions_to_codes, \
+    SIDE_BUY
 #from ..bot.bot_base import BotBase
 from ..db.db_base import DBBase
 from ..decision_model.dm_base import DMBase
 from ..invest_model.invest_model import InvestModelBase, InvestLongModel
 from ..utils.data_management import \
     DSOHLCV, \
+    INTRABAR_PATHS, \
     fmt_currency, \
     timeframe_to_seconds, \
     timeframe_to_timedelta
@@ -42,7 +59,7 @@ PandasDataFrame = typing.TypeVar('pandas.core.frame.DataFrame')
 PandasSeries = typing.TypeVar('pandas.core.frame.Series')
 
 
-class Portfolio(pydantic.BaseModel):
+class Portfolio(pydantic.BaseModel, PortfolioUpdateMixin):
     """Keeps track of the current state of the trading portfolio.
     Includes current performance metrics and current amounts in base and quote currency.
     """
@@ -171,46 +188,6 @@ class Portfolio(pydantic.BaseModel):
         self.quote_amount = self.quote_amount_init
 
         self.update()
-        
-    def update_order(self, od):
-
-        if od.side == "buy":
-
-            self.quote_amount -= od.quote_amount
-            self.base_amount += od.base_amount
-            self.nb_buy_orders += 1
-            self.last_buy_order_dt = self.dt
-            if self.last_sell_order_dt:
-                self.intertrade_duration_cum += \
-                    (self.last_buy_order_dt - self.last_sell_order_dt).total_seconds()
-
-        elif od.side == "sell":
-            
-            self.quote_amount += od.quote_amount
-            self.base_amount -= od.base_amount
-            self.nb_sell_orders += 1
-            self.last_sell_order_dt = self.dt
-            if self.last_buy_order_dt:
-                self.intratrade_duration_cum += \
-                    (self.last_sell_order_dt - self.last_buy_order_dt).total_seconds()
-
-        else:
-
-            raise ValueError(f"Unrecognized order side {od.side}")
-
-        self.update()
-
-    def update(self):
-
-        self.quote_exposed = 0 if self.quote_price is None \
-            else self.base_amount*self.quote_price*(1 - self.fees_taker)
-
-        self.quote_value = self.quote_amount + self.quote_exposed
-
-        self.asset_performance = 0 if self.quote_price_init is None \
-            else self.quote_price/self.quote_price_init
-
-        self.performance = self.quote_value/self.quote_amount_init
 
     
 class BotTrading(ObjMOSAIC):
@@ -233,6 +210,25 @@ class BotTrading(ObjMOSAIC):
         bt_buy_on (str): The backtest buy price hypothesis.
         bt_sell_on (str): The backtest sell price hypothesis.
         mode (str): The bot mode. Can be 'btfast', 'btclassic', 'livetest', or 'live'.
+        dm_precompute (bool): In btclassic mode, compute the causal decision series once
+            instead of predicting on a sliding window at each candle. Not applied with
+            online decision models, which are updated at each candle.
+        dm_predict_last (bool): In btclassic mode, without precomputed decisions, predict
+            the last candle only with the decision model `predict_last` method, as in
+            live mode. Models with a features buffer then stream the features of new
+            candles from the whole session history instead of the sliding window.
+        dm_walk_forward (WalkForward): In btfast mode, refit the decision model on rolling
+            or expanding windows and backtest its out-of-sample decisions.
+        checkpoint (BotCheckpoint): Periodic session state checkpoints in btclassic
+            and live modes, used to resume an interrupted session.
+        dt_resume (datetime): Last closed candle of the checkpoint the session resumed from.
+        sim_objects (bool): In btclassic mode, simulate market orders and portfolio with
+            lightweight slotted objects instead of pydantic models. Disabled by default;
+            with a database, orders are still converted into pydantic models each time
+            they are stored.
+        btfast_fills (bool): In btfast mode, execute market orders on the exchange
+            intrabar path quotes when their execution or trailing bound is crossed,
+            as in btclassic mode.
         status (str): The current status of the bot.
         status_comment (str): Additional status info, mostly used when something goes wrong.
         portfolio (Portfolio): The current portfolio of the bot.
@@ -249,6 +245,8 @@ class BotTrading(ObjMOSAIC):
         ohlcv_fit_dfd (dict): The bot's modeling data for fitting.
         ohlcv_dm_dfd (dict): The bot's modeling data for decision making.
         ohlcv_trading_dfd (dict): The bot's trading modeling data.
+        btfast_engine (BTFastEngine): Engine holding btfast orders and portfolio states arrays.
+        portfolio_history (PortfolioHistory): Portfolio states recorded along the session.
         db (DBBase): The bot's status data backend.
         db_trace (DBBase): The bot's trading data backend.
         logger (any): Used for logging architecture.
@@ -304,6 +302,27 @@ class BotTrading(ObjMOSAIC):
         user_input=['btfast', 'btclassic', 'livetest', 'live'],
     )
 
+    dm_precompute: bool = pydantic.Field(
+        False, description="In btclassic mode, compute decisions once on the whole closed OHLCV data instead of on a sliding window at each candle. Requires a causal decision model")
+
+    dm_predict_last: bool = pydantic.Field(
+        False, description="In btclassic mode, without precomputed decisions, predict the last candle only with the decision model predict_last method (streamed features) instead of predicting on the whole sliding window")
+
+    dm_walk_forward: WalkForward = pydantic.Field(
+        None, description="In btfast mode, walk-forward fit/predict engine used instead of a single decision model fit")
+
+    checkpoint: BotCheckpoint = pydantic.Field(
+        None, description="Periodic session state checkpoints (btclassic and live modes)")
+
+    dt_resume: datetime = pydantic.Field(
+        None, description="Last closed candle of the checkpoint the session resumed from")
+
+    sim_objects: bool = pydantic.Field(
+        False, description="In btclassic mode, simulate market orders and portfolio with lightweight slotted objects, converted into pydantic models for persistence and reporting")
+
+    btfast_fills: bool = pydantic.Field(
+        False, description="In btfast mode, execute market orders on intrabar quotes when their execution or trailing bound is crossed, as in btclassic mode")
+
     status: str = pydantic.Field(
         "waiting", description="Current bot status")
 
@@ -350,6 +369,12 @@ class BotTrading(ObjMOSAIC):
     ohlcv_trading_dfd: dict = pydantic.Field(
         {}, description="Bot trading modeling data")
 
+    btfast_engine: typing.Any = pydantic.Field(
+        None, description="Array-backed engine holding btfast orders and portfolio states")
+
+    portfolio_history: typing.Any = pydantic.Field(
+        None, description="Array-backed portfolio states recorded along the session")
+
     exchange: ExchangeBase = pydantic.Field(
         ExchangeBase(), description="Trading architecture exchange")
     
@@ -362,6 +387,10 @@ class BotTrading(ObjMOSAIC):
     logger: typing.Any = pydantic.Field(
         None, description="Trading architecture logger")
 
+    _order_book: OrderBook = pydantic.PrivateAttr(None)
+
+    _simulating: bool = pydantic.PrivateAttr(False)
+
     @pydantic.validator("orders_open", pre=True, always=True)
     def validate_orders_open(cls, value):
         if isinstance(value, list):
@@ -440,18 +469,32 @@ class BotTrading(ObjMOSAIC):
             f"{self.ds_fit.dt_s}{self.ds_fit.dt_e}"
 
     
+    @property
+    def order_book(self):
+        """Order counters and indexes of the current orders.
+
+        The book is rebuilt when orders dicts are replaced or modified
+        without the bot order methods.
+        """
+        if self._order_book is None or \
+           not self._order_book.is_synced(self.orders_open,
+                                          self.orders_executed):
+            self._order_book = OrderBook(self.orders_open,
+                                         self.orders_executed)
+        return self._order_book
+
     @property
     def nb_buy_orders_open(self):
-        return len([od for od in self.orders_open.values() if od.side == "buy"])
+        return self.order_book.nb_open["buy"]
     @property
     def nb_buy_orders_executed(self):
-        return len([od for od in self.orders_executed.values() if od.side == "buy"])
+        return self.order_book.nb_executed["buy"]
     @property
     def nb_sell_orders_open(self):
-        return len([od for od in self.orders_open.values() if od.side == "sell"])
+        return self.order_book.nb_open["sell"]
     @property
     def nb_sell_orders_executed(self):
-        return len([od for od in self.orders_executed.values() if od.side == "sell"])
+        return self.order_book.nb_executed["sell"]
 
     def __init__(self, clean_db=False, **data: typing.Any):
         super().__init__(**data)
@@ -476,11 +519,14 @@ class BotTrading(ObjMOSAIC):
             "dt_ohlcv_closed",
             "dt_session_start",
             "dt_session_end",
+            "dt_resume",
             "quote_current",
             # "orders_open",
             # "orders_executed",
             # "orders_cancelled",
             "progress",
+            "btfast_engine",
+            "portfolio_history",
         ]
         for attr in attr_reset:
             setattr(self, attr, self.__fields__[attr].default)
@@ -502,6 +548,8 @@ class BotTrading(ObjMOSAIC):
             "ohlcv_fit_dfd",
             "ohlcv_dm_dfd",
             "ohlcv_trading_dfd",
+            "btfast_engine",
+            "portfolio_history",
         }
 
         if kwrds.get("exclude"):
@@ -517,6 +565,20 @@ class BotTrading(ObjMOSAIC):
                 order_key = f"orders_{state}"
                 self_dict[order_key] = list(getattr(self, order_key).keys())
 
+        if self._simulating:
+            # Simulation objects are converted at persistence boundaries
+            if "portfolio" in self_dict:
+                self_dict["portfolio"] = self.portfolio.dict(
+                    exclude_none=kwrds.get("exclude_none", False))
+            for state in ["open", "executed", "cancelled"]:
+                order_key = f"orders_{state}"
+                if not orders_ids and order_key in self_dict:
+                    self_dict[order_key] = \
+                        {od_uid: od.dict() if isinstance(od, SimOrder) else od_dict
+                         for (od_uid, od), od_dict in
+                         zip(getattr(self, order_key).items(),
+                             self_dict[order_key].values())}
+
         return self_dict
 
     def __str__(self):
@@ -614,6 +676,8 @@ class BotTrading(ObjMOSAIC):
                      custom_format={},
                      ):
 
+        self.refresh_orders_open()
+
         summary_str = f"""
         Trading
         Current time    : {self.dt_ohlcv_current}
@@ -637,6 +701,8 @@ class BotTrading(ObjMOSAIC):
 
     def db_update(self):
 
+        self.refresh_orders_open()
+
         attr_excluded = {
             #"decision_model",
             #"invest_model",
@@ -655,13 +721,59 @@ class BotTrading(ObjMOSAIC):
                            index=["uid"])
 
     def db_get_portelio_history(self):
-        pass
+        return self.get_portfolio_history_df()
+
+    def get_portfolio_history_df(self):
+        """Portfolio states recorded along the session as a DataFrame."""
+        if self.portfolio_history is None:
+            return None
+
+        return self.portfolio_history.to_df()
+
+    def record_portfolio(self):
+        """Records the current portfolio state in the session history."""
+        if self.portfolio_history is not None:
+            self.portfolio_history.record(self.portfolio)
         
     def start(self,
               ohlcv_trading_df=None,
               ohlcv_dm_df=None,
               ohlcv_fit_df=None,
+              resume=False,
               **kwrds):
+        """Run a trading session.
+
+        Args:
+            resume (bool): Continue from the last checkpoint (if any)
+                after its last closed candle, instead of starting over.
+        """
+        self.start_session(ohlcv_fit_df=ohlcv_fit_df, resume=resume, **kwrds)
+
+        # Start session !
+        getattr(self, f"start_{self.mode}")(
+            ohlcv_trading_df=ohlcv_trading_df,
+            ohlcv_dm_df=ohlcv_dm_df,
+            **kwrds)
+        
+        self.finish()
+
+    def start_session(self, ohlcv_fit_df=None, resume=False, **kwrds):
+        """Initialize the trading session before running it.
+
+        Sets the bot uid, status and fees, and fits the decision model.
+        When resuming, the bot state and decision model fitted state are
+        restored from the last checkpoint instead.
+        """
+        self.dt_resume = None
+        if self.checkpoint:
+            self.checkpoint.reset()
+            if resume:
+                self.dt_resume = self.checkpoint.restore(self)
+
+        # History recorded before an interruption is kept when resuming
+        if self.dt_resume is None or self.portfolio_history is None:
+            self.portfolio_history = PortfolioHistory()
+
         local_tz = pytz.timezone(get_localzone().key)
         
         self.dt_session_start = local_tz.localize(datetime.now())
@@ -687,22 +799,19 @@ class BotTrading(ObjMOSAIC):
         if self.logger:
             self.logger.info(self.summary_header())
 
-        if (self.ds_fit or ohlcv_fit_df) and hasattr(self.decision_model, "fit"):
+        if (self.ds_fit or ohlcv_fit_df is not None) and \
+           hasattr(self.decision_model, "fit") and \
+           not (self.mode == "btfast" and self.dm_walk_forward) and \
+           self.dt_resume is None:
             self.fit_dm(ohlcv_fit_df=ohlcv_fit_df, **kwrds)
 
         if self.ds_dm is None:
             self.ds_dm = self.ds_trading
-            
-        # Start session !
-        getattr(self, f"start_{self.mode}")(
-            ohlcv_trading_df=ohlcv_trading_df,
-            ohlcv_dm_df=ohlcv_dm_df,
-            **kwrds)
-        
-        self.finish()
 
     def finish(self):
-        
+
+        self.refresh_orders_open()
+
         # Set date_end to the current timestamp
         local_tz = pytz.timezone(get_localzone().key)
         self.dt_session_end = local_tz.localize(datetime.now())
@@ -714,6 +823,12 @@ class BotTrading(ObjMOSAIC):
         #if self.db:
             #self.db_update()
 
+        # Send buffered writes
+        if self.db:
+            self.db.flush()
+        if self.db_trace:
+            self.db_trace.flush()
+
         if self.logger:
             log_msg_str = f"Trading session {self.name} closed at {self.dt_session_end}"
             self.logger.info(log_msg_str)
@@ -732,11 +847,137 @@ class BotTrading(ObjMOSAIC):
 
         if self.db:
             self.db_update()
+            self.db.flush()
 
         if self.logger:
             log_msg_str = f"Trading bot {self.name} aborted at {self.dt_session_end} : {abort_message}"
             self.logger.info(log_msg_str)
 
+    def load_ohlcv_data(self, data_dir=".", progress_mode=False):
+        """Fetch OHLCV data of the bot data sources.
+
+        Data are stored in the `ohlcv_*_dfd` dictionaries used by the
+        session start methods. Data already loaded are not fetched again.
+        When the exchange has an `ohlcv_store`, data are read from the
+        store and only missing gaps are fetched.
+        """
+        ds_dfd_list = [
+            (self.ds_trading, self.timeframe, "ohlcv_trading_dfd"),
+            (self.ds_fit, self.ds_fit.timeframe if self.ds_fit else None,
+             "ohlcv_fit_dfd"),
+        ]
+        if self.ds_dm and (self.ds_dm != self.ds_trading):
+            ds_dfd_list.append((self.ds_dm, self.timeframe, "ohlcv_dm_dfd"))
+
+        for ds, timeframe, dfd_attr in ds_dfd_list:
+            if ds is None:
+                continue
+
+            ohlcv_dfd = getattr(self, dfd_attr)
+            ds_code = f"{ds.symbol}{ds.timeframe}{ds.dt_s}{ds.dt_e}"
+            if not (ds_code in ohlcv_dfd.keys()):
+                ohlcv_dfd[ds_code] = \
+                    self.exchange.get_historic_ohlcv(
+                        date_start=ds.dt_s,
+                        date_end=ds.dt_e,
+                        symbol=ds.symbol,
+                        timeframe=timeframe,
+                        index="datetime",
+                        data_dir=data_dir,
+                        force_reload=False,
+                        progress_mode=progress_mode,
+                    )
+
+    def sweep(self, param_grid, n_jobs=1, results_filename=None,
+              progress_mode=False, **kwrds):
+        """Backtest the bot over a grid of parameters combinations.
+
+        See `sweep_bot` for details.
+
+        Returns:
+            pd.DataFrame: Parameters and portfolio state of each combination.
+        """
+        return sweep_bot(self, param_grid,
+                         n_jobs=n_jobs,
+                         results_filename=results_filename,
+                         progress_mode=progress_mode,
+                         **kwrds)
+
+    def sweep_thresholds(self,
+                         buy_thresholds,
+                         sell_thresholds,
+                         ohlcv_trading_df=None,
+                         ohlcv_dm_df=None,
+                         ohlcv_fit_df=None,
+                         progress_mode=False,
+                         data_dir=".",
+                         **kwrds):
+        """Btfast backtest of a grid of decision thresholds.
+
+        The decision model score is predicted once, then the btfast
+        performance of every (buy_threshold, sell_threshold) pair is
+        computed with vectorized portfolio updates (see
+        `compute_threshold_grid_performance`). Requires a decision model
+        providing a `score` and an `InvestLongModel`.
+
+        Returns:
+            pd.DataFrame: One row per thresholds pair with performance and
+            number of orders.
+        """
+        if not isinstance(self.invest_model, InvestLongModel):
+            raise ValueError(
+                "Thresholds sweep requires an InvestLongModel invest model")
+
+        self.exchange.set_trading_fees(self.symbol)
+
+        if (self.ds_fit or ohlcv_fit_df is not None) and \
+           not self.dm_walk_forward:
+            self.fit_dm(ohlcv_fit_df=ohlcv_fit_df,
+                        progress_mode=progress_mode,
+                        data_dir=data_dir)
+
+        if self.ds_dm is None:
+            self.ds_dm = self.ds_trading
+
+        ohlcv_trading_df, ohlcv_dm_df = \
+            self.get_btfast_data(ohlcv_trading_df=ohlcv_trading_df,
+                                 ohlcv_dm_df=ohlcv_dm_df,
+                                 progress_mode=progress_mode,
+                                 data_dir=data_dir)
+
+        decisions_df = self.predict_btfast(ohlcv_dm_df,
+                                           progress_mode=progress_mode,
+                                           **kwrds)
+        if not ("score" in decisions_df.columns):
+            raise ValueError(
+                f"Decision model {self.decision_model.__class__.__name__} "
+                "does not provide any score")
+
+        perf_dict = compute_threshold_grid_performance(
+            score=decisions_df["score"].reindex(ohlcv_trading_df.index)
+                                       .to_numpy(dtype=float),
+            buy_thresholds=buy_thresholds,
+            sell_thresholds=sell_thresholds,
+            quote_price_buy=ohlcv_trading_df[
+                self.ohlcv_names.get(self.bt_buy_on)].to_numpy(dtype=float),
+            quote_price_sell=ohlcv_trading_df[
+                self.ohlcv_names.get(self.bt_sell_on)].to_numpy(dtype=float),
+            quote_price_close=ohlcv_trading_df[
+                self.ohlcv_names.get("close")].to_numpy(dtype=float),
+            fees_taker=self.exchange.fees_rates.taker,
+            buy_quote_rate=self.invest_model.buy_quote_rate,
+            sell_base_rate=self.invest_model.sell_base_rate,
+            quote_amount_init=self.portfolio.quote_amount_init,
+        )
+
+        buy_th_grid, sell_th_grid = np.meshgrid(buy_thresholds,
+                                                sell_thresholds,
+                                                indexing="ij")
+        return pd.DataFrame(dict(
+            buy_threshold=buy_th_grid.ravel(),
+            sell_threshold=sell_th_grid.ravel(),
+            **{var: values.ravel() for var, values in perf_dict.items()}))
+
     def fit_dm(self,
                ohlcv_fit_df=None,
                progress_mode=False,
@@ -767,8 +1008,48 @@ class BotTrading(ObjMOSAIC):
     def start_btfast(self,
                      ohlcv_trading_df=None,
                      ohlcv_dm_df=None,
-                     progress_mode=False, data_dir=".", **kwrds):
+                     progress_mode=False, data_dir=".",
+                     use_engine=True,
+                     build_orders=False,
+                     **kwrds):
+
+        ohlcv_trading_df, ohlcv_dm_df = \
+            self.get_btfast_data(ohlcv_trading_df=ohlcv_trading_df,
+                                 ohlcv_dm_df=ohlcv_dm_df,
+                                 progress_mode=progress_mode,
+                                 data_dir=data_dir)
+
+        self.portfolio.quote_price_init = \
+            ohlcv_trading_df[self.ohlcv_names.get("close")].iloc[0]
 
+        decisions_df = self.predict_btfast(ohlcv_dm_df,
+                                           progress_mode=progress_mode,
+                                           **kwrds)
+
+        if use_engine and \
+           isinstance(self.invest_model, InvestLongModel) and \
+           isinstance(self.order_model, OrderMarket):
+            if self.btfast_fills:
+                self.execute_btfast_fills(ohlcv_trading_df, decisions_df,
+                                          build_orders=build_orders)
+            else:
+                self.execute_btfast_engine(ohlcv_trading_df, decisions_df,
+                                           build_orders=build_orders)
+        else:
+            self.execute_btfast_orders(ohlcv_trading_df, decisions_df,
+                                       progress_mode=progress_mode)
+
+        return
+
+    def get_btfast_data(self,
+                        ohlcv_trading_df=None,
+                        ohlcv_dm_df=None,
+                        progress_mode=False, data_dir="."):
+        """Get btfast trading and decision model OHLCV data.
+
+        Returns:
+            (pd.DataFrame, pd.DataFrame): Trading and decision model data.
+        """
         if self.logger:
             self.logger.info("Getting trading data")
 
@@ -787,9 +1068,6 @@ class BotTrading(ObjMOSAIC):
                     )
             ohlcv_trading_df = self.ohlcv_trading_dfd[self.ds_trading_code]
             
-        self.portfolio.quote_price_init = \
-            ohlcv_trading_df[self.ohlcv_names.get("close")].iloc[0]
-                
         if self.logger:
             self.logger.info("Getting decision model data")
 
@@ -810,26 +1088,238 @@ class BotTrading(ObjMOSAIC):
                             progress_mode=progress_mode
                         )
                 ohlcv_dm_df = self.ohlcv_dm_dfd[self.ds_dm_code]
-        
-        decisions_df = \
-            self.decision_model.predict(ohlcv_dm_df.shift(1), **kwrds)
-
-        idx_pass = decisions_df["decision"] == "pass"
 
-        decision_s = decisions_df["decision"].loc[~idx_pass]
-        decision_s = decision_s.loc[decision_s.shift() != decision_s]
+        return ohlcv_trading_df, ohlcv_dm_df
 
-        idx_buy = decision_s == "buy"
-        dt_buy = decision_s.index[idx_buy]
+    def predict_btfast(self, ohlcv_dm_df, progress_mode=False, **kwrds):
+        """Decisions of the whole btfast session.
 
-        idx_sell = decision_s == "sell"
-        if len(dt_buy) > 0:
-            idx_sell &= (decision_s.index >= dt_buy[0])
+        Decisions at each timestamp are predicted from the previous
+        candles only.
+        """
+        if self.dm_walk_forward:
+            # Out-of-sample decisions, no signal during the first fit window
+            decisions_df = self.dm_walk_forward.predict(
+                self.decision_model, ohlcv_dm_df.shift(1),
+                progress_mode=progress_mode)\
+                .reindex(ohlcv_dm_df.index)
+            decisions_df["decision"] = self.decision_model\
+                .fillna_decision(decisions_df["decision"])
         else:
-            # If no buy => force no sell
-            idx_sell[idx_sell] = False
-            
-        dt_sell = decision_s.index[idx_sell]
+            decisions_df = \
+                self.decision_model.predict(ohlcv_dm_df.shift(1), **kwrds)
+
+        return decisions_df
+
+    def execute_btfast_engine(self, ohlcv_trading_df, decisions_df,
+                              build_orders=False):
+        """Execute btfast decisions with the array-backed engine.
+
+        Executed orders are kept as arrays in `btfast_engine`. Pydantic
+        orders are only built into `orders_executed` when `build_orders`
+        is True or when orders must be stored in the trading data backend.
+        """
+        decisions_s = decisions_df["decision"]\
+            .reindex(ohlcv_trading_df.index)
+        order_pos, order_side = compute_order_signals(
+            decisions_to_codes(decisions_s))
+
+        var_close = self.ohlcv_names.get("close")
+        self.btfast_engine = BTFastEngine(
+            fees_taker=self.portfolio.fees_taker,
+            buy_quote_rate=self.invest_model.buy_quote_rate,
+            sell_base_rate=self.invest_model.sell_base_rate,
+        )
+        self.btfast_engine.run(
+            dt_index=pd.DatetimeIndex(ohlcv_trading_df.index),
+            quote_price_buy=ohlcv_trading_df[
+                self.ohlcv_names.get(self.bt_buy_on)].to_numpy(dtype=float),
+            quote_price_sell=ohlcv_trading_df[
+                self.ohlcv_names.get(self.bt_sell_on)].to_numpy(dtype=float),
+            quote_price_close=ohlcv_trading_df[var_close].to_numpy(dtype=float),
+            order_pos=order_pos,
+            order_side=order_side,
+            portfolio=self.portfolio,
+        )
+
+        if self.btfast_engine.nb_orders > 0:
+            self.dt_ohlcv_current = self.btfast_engine.orders["dt_open"][-1]
+            self.quote_current = self.portfolio.quote_price
+
+        if build_orders or self.db_trace:
+            self.orders_executed.update(self.btfast_build_orders())
+
+        # Register portfolio value at the last timestamp
+        self.portfolio.dt = ohlcv_trading_df.index[-1]
+        self.portfolio.quote_price = \
+            ohlcv_trading_df.loc[self.portfolio.dt,
+                                 self.ohlcv_names.get(self.bt_sell_on)]
+        self.portfolio.update()
+
+        self.record_btfast_history()
+        self.btfast_trace()
+
+    def execute_btfast_fills(self, ohlcv_trading_df, decisions_df,
+                             build_orders=False):
+        """Execute btfast decisions on intrabar quotes with the fill engine.
+
+        Orders are placed at the open of candles with a decision and
+        executed on the following quotes of the exchange intrabar path as
+        in btclassic mode (see `BTFillEngine`), so that the session gives
+        the btclassic results of the same decisions. Pydantic orders are
+        only built into `orders_executed` and `orders_open` when
+        `build_orders` is True or when orders must be stored in the
+        trading data backend.
+        """
+        decisions_s = decisions_df["decision"]\
+            .reindex(ohlcv_trading_df.index)
+
+        order_params = self.order_model.params
+        exec_trailing_rate = None
+        if isinstance(self.order_model, OrderTrailingMarket):
+            exec_trailing_rate = order_params.exec_bound_rate \
+                if order_params.exec_trailing_rate is None \
+                else order_params.exec_trailing_rate
+
+        self.btfast_engine = BTFillEngine(
+            fees_taker=self.portfolio.fees_taker,
+            buy_quote_rate=self.invest_model.buy_quote_rate,
+            sell_base_rate=self.invest_model.sell_base_rate,
+            exec_bound_rate=order_params.exec_bound_rate,
+            exec_trailing_rate=exec_trailing_rate,
+            diff_thresh=self.diff_thresh_buy_sell_orders,
+            intrabar_path=self.exchange.intrabar_path,
+        )
+
+        quote_open = ohlcv_trading_df[
+            self.ohlcv_names.get("open")].to_numpy(dtype=float)
+        # Portfolio is valued on intrabar quotes, starting from the first one
+        self.portfolio.quote_price_init = quote_open[0]
+        self.btfast_engine.run(
+            dt_index=pd.DatetimeIndex(ohlcv_trading_df.index),
+            quote_open=quote_open,
+            quote_low=ohlcv_trading_df[
+                self.ohlcv_names.get("low")].to_numpy(dtype=float),
+            quote_high=ohlcv_trading_df[
+                self.ohlcv_names.get("high")].to_numpy(dtype=float),
+            decision_codes=decisions_to_codes(decisions_s),
+            portfolio=self.portfolio,
+            quote_close=ohlcv_trading_df[
+                self.ohlcv_names.get("close")].to_numpy(dtype=float),
+        )
+
+        self.dt_ohlcv_current = self.portfolio.dt
+        self.quote_current = self.portfolio.quote_price
+
+        if build_orders or self.db_trace:
+            self.orders_executed.update(self.btfast_build_orders())
+            orders_open = self.btfast_engine.to_orders_open(
+                order_model=self.order_model,
+                bot_uid=self.uid,
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+            )
+            for od in orders_open.values():
+                if self.exchange:
+                    od.bkd = self.exchange
+                od.test_mode = not (self.mode in ["live"])
+            self.orders_open.update(orders_open)
+
+        self.record_btfast_history()
+        self.btfast_trace()
+
+    def record_btfast_history(self):
+        """Records btfast engine portfolio states and the final portfolio state."""
+        if self.portfolio_history is None:
+            return
+
+        engine_portfolio = self.btfast_engine.portfolio
+        if self.btfast_engine.nb_orders > 0:
+            self.portfolio_history.extend(
+                engine_portfolio["dt"],
+                **{var: engine_portfolio[var]
+                   for var in self.portfolio_history.variables})
+        self.record_portfolio()
+
+    def btfast_trace(self):
+        """Store btfast engine portfolio states and orders in the trading data backend."""
+        if self.db_trace:
+            portfolio_index_var = ["bot_uid"]
+            portfolio_df = pd.concat(
+                [self.btfast_engine.portfolio_df(**self.btfast_portfolio_specs()),
+                 pd.DataFrame([self.portfolio.dict()])],
+                axis=0, ignore_index=True)\
+                .drop_duplicates(subset=portfolio_index_var,
+                                 keep="last")
+
+            self.db_trace.put(endpoint="portfolio",
+                              data=portfolio_df.to_dict("records"),
+                              index=portfolio_index_var,
+                              time_field="dt")
+
+            # Use dt_closed as time field
+            self.db.put(endpoint="orders",
+                        data=[od.dict()
+                              for od in self.orders_executed.values()],
+                        index=["bot_uid"],
+                        time_field="dt_closed")
+
+    def btfast_portfolio_specs(self):
+        return dict(
+            cls=self.portfolio.__class__.__name__,
+            bot_uid=self.portfolio.bot_uid,
+            fees_taker=self.portfolio.fees_taker,
+            quote_price_init=self.portfolio.quote_price_init,
+            quote_amount_init=self.portfolio.quote_amount_init,
+        )
+
+    def btfast_build_orders(self):
+        """Build pydantic orders executed by the btfast engine."""
+        if self.btfast_engine is None:
+            return {}
+
+        orders = self.btfast_engine.to_orders(
+            base=self.base,
+            quote=self.quote,
+            order_model=self.order_model,
+            bot_uid=self.uid,
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+        )
+        for od in orders.values():
+            if self.exchange:
+                od.bkd = self.exchange
+            od.test_mode = not (self.mode in ["live"])
+
+        return orders
+
+    def btfast_orders_df(self):
+        """Orders executed by the btfast engine as a DataFrame."""
+        if self.btfast_engine is None:
+            return None
+
+        return self.btfast_engine.orders_df(bot_uid=self.uid,
+                                            symbol=self.symbol,
+                                            timeframe=self.timeframe)
+
+    def btfast_portfolio_df(self):
+        """Portfolio states after each btfast executed order as a DataFrame."""
+        if self.btfast_engine is None:
+            return None
+
+        return self.btfast_engine.portfolio_df(**self.btfast_portfolio_specs())
+
+    def execute_btfast_orders(self, ohlcv_trading_df, decisions_df,
+                              progress_mode=False):
+        """Execute btfast decisions through pydantic orders.
+
+        Used when invest or order models are not supported by the
+        btfast engine.
+        """
+        order_pos, order_side = compute_order_signals(
+            decisions_to_codes(decisions_df["decision"]))
+        dt_buy = decisions_df.index[order_pos[order_side == SIDE_BUY]]
+        dt_sell = decisions_df.index[order_pos[order_side != SIDE_BUY]]
 
         orders_list = []
         for self.dt_ohlcv_current in tqdm.tqdm(dt_buy,
@@ -849,7 +1339,6 @@ class BotTrading(ObjMOSAIC):
 
         orders_list = sorted(orders_list,
                              key=lambda od: (od.dt_open, od.side == 'buy'))
-        portfolio_list = []
         for od in tqdm.tqdm(orders_list,
                             disable=not progress_mode,
                             desc="Executing orders",
@@ -891,8 +1380,7 @@ class BotTrading(ObjMOSAIC):
             self.portfolio.dt = od.dt_closed
             self.portfolio.quote_price = self.quote_current
             self.portfolio.update_order(od)
-            
-            portfolio_list.append(self.portfolio.dict())
+            self.record_portfolio()
             
             self.orders_executed[od.uid] = od
 
@@ -902,18 +1390,13 @@ class BotTrading(ObjMOSAIC):
             ohlcv_trading_df.loc[self.portfolio.dt,
                                  self.ohlcv_names.get(self.bt_sell_on)]
         self.portfolio.update()
-        portfolio_list.append(self.portfolio.dict())
-            
+        self.record_portfolio()
+
         if self.db_trace:
-            portfolio_index_var = ["bot_uid"]
-            portfolio_df = \
-                pd.DataFrame(portfolio_list)\
-                  .drop_duplicates(subset=portfolio_index_var,
-                                   keep="last")
-                
+            # Portfolio states are indexed by bot: the last one is stored
             self.db_trace.put(endpoint="portfolio",
-                              data=portfolio_df.to_dict("records"),
-                              index=portfolio_index_var,
+                              data=[self.portfolio.dict()],
+                              index=["bot_uid"],
                               time_field="dt")
             
             # Use dt_closed as time field
@@ -964,12 +1447,24 @@ class BotTrading(ObjMOSAIC):
                         )
                     ohlcv_dm_df = self.ohlcv_dm_dfd[self.ds_dm_code]
    
-        quote_current_trading_s, ohlcv_closed_trading_df = \
-            self.exchange.flatten_ohlcv(ohlcv_trading_df)
-        quote_current_dm_s, ohlcv_closed_dm_df = \
-            self.exchange.flatten_ohlcv(ohlcv_trading_df)
-        
-        self.portfolio.quote_price_init = quote_current_trading_s.iloc[0]
+        ohlcv_closed_dm_df = ohlcv_trading_df.shift(1)
+
+        ohlcv_replay_df = ohlcv_trading_df
+        if self.dt_resume is None:
+            # Intrabar paths start with the open quote
+            self.portfolio.quote_price_init = \
+                ohlcv_trading_df[self.ohlcv_names.get("open")].iloc[0]
+            self.dt_ohlcv_closed = None
+        else:
+            # Candles processed before the checkpoint are not replayed
+            ohlcv_replay_df = ohlcv_trading_df.loc[
+                ohlcv_trading_df.index > self.dt_resume]
+            self.dt_ohlcv_closed = self.dt_resume
+
+        # Quotes are replayed lazily from the OHLCV arrays
+        nb_ticks = len(ohlcv_replay_df)*\
+            len(INTRABAR_PATHS[self.exchange.intrabar_path])
+        quote_ticks = self.exchange.iter_ohlcv_ticks(ohlcv_replay_df)
 
         #self.ds_trading.dt_s = ohlcv_closed_df.index[0]
         #self.ds_trading.dt_e = ohlcv_closed_df.index[-1]
@@ -977,125 +1472,206 @@ class BotTrading(ObjMOSAIC):
         if self.timeframe:
             tdelta = timeframe_to_timedelta(self.timeframe)
         else:
-            tdelta = quote_current_trading_s.index[1] - quote_current_trading_s.index[0]
+            tdelta = ohlcv_trading_df.index[1] - ohlcv_trading_df.index[0]
         # ohlcv_cur_df = \
         #     self.exchange.get_last_ohlcv(closed=False)
 
-        self.dt_ohlcv_closed = None
+        # Online decision models are updated at each candle
+        dm_precompute = self.dm_precompute and not self.decision_model.online
+
+        if dm_precompute:
+            # Decisions are computed once for all closed candles
+            decisions_s = \
+                self.decision_model.predict(ohlcv_closed_dm_df, **kwrds)\
+                                   ["decision"]
+            decisions_d = dict(zip(decisions_s.index,
+                                   decisions_to_codes(decisions_s)))
+
+        # Orders and portfolio are simulated with lightweight objects
+        sim_objects = self.sim_objects and \
+            type(self.order_model) in SIM_ORDER_CLASSES
+        if sim_objects:
+            portfolio = self.start_sim_objects()
+
+        try:
+            with tqdm.tqdm(total=nb_ticks, disable=not progress_mode) as pbar:
+                for self.dt_ohlcv_current, self.quote_current in quote_ticks:
+
+                    # Decision is evaluated on the first tick of each candle only
+                    if self.dt_ohlcv_current != self.dt_ohlcv_closed:
+                        # Previous candle is closed: state is checkpointed before the new decision
+                        if self.checkpoint and self.dt_ohlcv_closed is not None:
+                            self.checkpoint.step(self)
+
+                        if dm_precompute:
+                            decision_code = decisions_d.get(
+                                self.dt_ohlcv_current, 0)
+                        else:
+                            dt_start = \
+                                self.dt_ohlcv_current - tdelta*self.decision_model.bw_length
+                            ohlcv_cur_dm_df = \
+                                ohlcv_closed_dm_df.loc[dt_start:self.dt_ohlcv_current]
+                            self.decision_model.update(ohlcv_cur_dm_df, **kwrds)
+                            if self.dm_predict_last:
+                                # Features of the new candle may be streamed
+                                decision_df = \
+                                    self.decision_model.predict_last(ohlcv_cur_dm_df, **kwrds)\
+                                                       .iloc[-1]
+                            else:
+                                decision_df = \
+                                    self.decision_model.predict(ohlcv_cur_dm_df, **kwrds)\
+                                                       .loc[self.dt_ohlcv_current]
+                            decision_code = \
+                                decision_to_code(decision_df["decision"])
+
+                        # Create Buy / Sell order
+                        if decision_code != 0:
+                            order = self.buy() if decision_code == SIDE_BUY \
+                                else self.sell()
+                            self.register_order(order)
+
+                    # Update orders
+                    self.update_orders()
+
+                    # Updating portfolio
+                    self.portfolio.dt = self.dt_ohlcv_current
+                    self.portfolio.quote_price = self.quote_current
+                    self.portfolio.update()
+                    self.record_portfolio()
+                    self.progress_update()
+                    if self.db:
+                        self.db.update(endpoint="portfolio",
+                                       data=self.portfolio.dict(),
+                                       index=["bot_uid"],
+                                       time_field="dt")
+
+                        if (pbar.n % 1000) == 0:
+                            self.db_update()
+
+                    # Updating variables
+                    #ipdb.set_trace()
+                    if progress_mode:
+                        update_console(self.__str__())
+
+                    self.dt_ohlcv_closed = self.dt_ohlcv_current
+
+                    pbar.update()
+        finally:
+            if sim_objects:
+                self.stop_sim_objects(portfolio)
 
-        with tqdm.tqdm(total=len(quote_current_trading_s), disable=not progress_mode) as pbar:
-            for self.dt_ohlcv_current, self.quote_current in quote_current_trading_s.items():
+        return
 
-                if self.dt_ohlcv_current != self.dt_ohlcv_closed:
-                    dt_start = \
-                        self.dt_ohlcv_current - tdelta*self.decision_model.bw_length
-                    ohlcv_cur_dm_df = \
-                        ohlcv_closed_dm_df.loc[dt_start:self.dt_ohlcv_current]
-                    decision_df = \
-                        self.decision_model.predict(ohlcv_cur_dm_df, **kwrds)\
-                                           .loc[self.dt_ohlcv_current]
-                    decision = decision_df["decision"]
 
-                    # Create Buy / Sell order
-                    if decision != "pass":
-                        order = getattr(self, decision)()
-                        self.register_order(order)
+    def start_sim_objects(self):
+        """Switch the portfolio and orders to simulation objects.
 
-                # Update orders
-                self.update_orders()
+        Returns:
+            Portfolio: The pydantic portfolio, to be updated by `stop_sim_objects`.
+        """
+        portfolio = self.portfolio
+        self.portfolio = SimPortfolio.from_portfolio(portfolio)
+        for state in ["open", "executed", "cancelled"]:
+            order_key = f"orders_{state}"
+            setattr(self, order_key,
+                    {od_uid: SimOrder.from_order(od)
+                     if type(od) in SIM_ORDER_CLASSES else od
+                     for od_uid, od in getattr(self, order_key).items()})
+        self._simulating = True
+
+        return portfolio
+
+    def stop_sim_objects(self, portfolio):
+        """Convert back the simulation portfolio and orders into pydantic models."""
+        self._simulating = False
+        self.portfolio = self.portfolio.to_portfolio(portfolio)
+        for state in ["open", "executed", "cancelled"]:
+            order_key = f"orders_{state}"
+            setattr(self, order_key,
+                    {od_uid: od.to_order() if isinstance(od, SimOrder) else od
+                     for od_uid, od in getattr(self, order_key).items()})
 
-                # Updating portfolio
-                self.portfolio.dt = self.dt_ohlcv_current
-                self.portfolio.quote_price = self.quote_current
-                self.portfolio.update()
-                self.progress_update()
-                if self.db:
-                    self.db.update(endpoint="portfolio",
-                                   data=self.portfolio.dict(),
-                                   index=["bot_uid"],
-                                   time_field="dt")
+    def start_live(self, progress_mode=False, data_dir=".", **kwrds):
 
-                    if (pbar.n % 1000) == 0:
-                        self.db_update()
+        if self.dt_resume is None:
+            self.dt_ohlcv_closed = None
 
-                # Updating variables
-                #ipdb.set_trace()
-                if progress_mode:
-                    update_console(self.__str__())
+        # Closed candles needed by the decision model and current candle
+        candle_feed = CandleFeed(self.exchange, self.symbol, self.timeframe,
+                                 nb_closed=self.decision_model.bw_length + 1)
 
-                self.dt_ohlcv_closed = self.dt_ohlcv_current
+        while True:
 
-                pbar.update()
+            candle_feed.update()
+            self.live_step(candle_feed.ohlcv_df, **kwrds)
 
+            if progress_mode:
+                update_console(self.summary_live())
+                
+            self.live_sleeping(progress_mode=progress_mode)
+                    
         return
 
+    def start_livetest(self, progress_mode=False, data_dir=".", **kwrds):
+        """Live session on live data with simulated orders."""
+        return self.start_live(progress_mode=progress_mode,
+                               data_dir=data_dir,
+                               **kwrds)
 
-    def start_live(self, progress_mode=False, data_dir=".", **kwrds):
+    def live_step(self, ohlcv_df, **kwrds):
+        """Process the last live candles.
 
-        self.dt_ohlcv_closed = None
+        Decision is taken once per closed candle, then open orders and
+        portfolio are updated with the current quote.
 
-        while True:
+        Args:
+            ohlcv_df (pd.DataFrame): Last OHLCV candles. The last row is
+                the current (not closed) candle, previous rows are closed
+                candles.
+        """
+        self.dt_ohlcv_current = ohlcv_df.index[-1]
+        self.quote_current = \
+            ohlcv_df[self.ohlcv_names.get("close")].iloc[-1]
 
-            ohlcv_current_df = \
-                self.exchange.get_last_ohlcv(
-                    symbol=self.symbol,
-                    timeframe=self.timeframe,
-                    index="datetime",
-                    nb_data=1,
-                    closed=False,
-                )
+        if self.portfolio.quote_price_init is None:
+            self.portfolio.quote_price_init = self.quote_current
 
-            self.dt_ohlcv_current = ohlcv_current_df.index[0]
-            
-            self.quote_current = \
-                ohlcv_current_df.loc[self.dt_ohlcv_current,
-                                     self.ohlcv_names.get("close")]
+        ohlcv_closed_cur_df = \
+            ohlcv_df.iloc[:-1].iloc[-(self.decision_model.bw_length + 1):]
 
-            if self.portfolio.quote_price_init is None:
-                self.portfolio.quote_price_init = self.quote_current
-            
-            if self.dt_ohlcv_current != self.dt_ohlcv_closed:
+        if len(ohlcv_closed_cur_df) == 0 or \
+           ohlcv_closed_cur_df.index[-1] == self.dt_ohlcv_closed:
+            return
 
-                ohlcv_closed_cur_df = \
-                    self.exchange.get_last_ohlcv(
-                        symbol=self.symbol,
-                        timeframe=self.timeframe,
-                        index="datetime",
-                        nb_data=self.decision_model.bw_length + 1,
-                        closed=True,
-                    )
-                self.dt_ohlcv_closed = ohlcv_closed_cur_df.index[-1]
-                signal, signal_score = \
-                    self.decision_model.predict(ohlcv_closed_cur_df, **kwrds)\
-                                       .replace({np.nan: None})\
-                                       .iloc[-1]
+        self.dt_ohlcv_closed = ohlcv_closed_cur_df.index[-1]
+        self.decision_model.update(ohlcv_closed_cur_df, **kwrds)
+        decision_code = decision_to_code(
+            self.decision_model.predict_last(ohlcv_closed_cur_df, **kwrds)
+                               ["decision"].iloc[-1])
 
-                # Create Buy / Sell order
-                if signal:
-                    order = getattr(self, signal)()
-                    self.register_order(order)
+        # Create Buy / Sell order
+        if decision_code != 0:
+            order = self.buy() if decision_code == SIDE_BUY \
+                else self.sell()
+            self.register_order(order)
 
+        # Update orders, valuing the portfolio at the current quote
+        self.portfolio.dt = self.dt_ohlcv_current
+        self.portfolio.quote_price = self.quote_current
+        self.update_orders()
 
-                # Update orders
-                self.update_orders()
-                
-                # Updating portfolio
-                self.portfolio.dt = self.dt_ohlcv_current
-                self.portfolio.quote_price = self.quote_current
-                self.portfolio.update()
-                self.progress_update()
-                if self.db:
-                    self.db.update(endpoint="portfolio",
-                                   data=self.portfolio.dict(),
-                                   index=["bot_uid"],
-                                   time_field="dt")
+        # Updating portfolio
+        self.portfolio.update()
+        self.record_portfolio()
+        self.progress_update()
+        if self.db:
+            self.db.update(endpoint="portfolio",
+                           data=self.portfolio.dict(),
+                           index=["bot_uid"],
+                           time_field="dt")
 
-            if progress_mode:
-                update_console(self.summary_live())
-                
-            self.live_sleeping(progress_mode=progress_mode)
-                    
-        return
+        if self.checkpoint:
+            self.checkpoint.step(self)
 
     def live_sleeping(self, progress_mode=False):
 
@@ -1172,13 +1748,25 @@ class BotTrading(ObjMOSAIC):
         if (order.side == "sell" and self.is_sell_allowed()) or \
            (order.side == "buy" and self.is_buy_allowed()):
 
+            order_book = self.order_book
             self.orders_open[order.uid] = order
+            order_book.add_open(order.uid, order)
 
         else:
 
             if self.logger:
                 self.logger.debug(f"Order {order.uid} of side {order.side} not allowed : Buy/Sell threshold not respected")
     
+    def create_order(self, order_specs):
+        """Order of the order model, as a simulation order during simulations."""
+        if self._simulating:
+            return SimOrder(type(self.order_model),
+                            self.order_model.params.copy(),
+                            **order_specs)
+
+        return OrderBase.from_dict(dict(order_specs,
+                                        **self.order_model.dict_params()))
+
     def buy(self, no_db=False, **kwrds):
 
         order_specs = dict(
@@ -1188,11 +1776,10 @@ class BotTrading(ObjMOSAIC):
             dt_open=self.dt_ohlcv_current,
             side="buy",
             quote_amount=self.invest_model.get_buy_quote_amount(self.portfolio),
-            **self.order_model.dict_params(),
         )
 
-        order = OrderBase.from_dict(order_specs)
-        
+        order = self.create_order(order_specs)
+
         if no_db:
             order.db = None
         else:
@@ -1214,10 +1801,9 @@ class BotTrading(ObjMOSAIC):
             dt_open=self.dt_ohlcv_current,
             side="sell",
             base_amount=self.invest_model.get_sell_base_amount(self.portfolio),
-            **self.order_model.dict_params(),
         )
         
-        order = OrderBase.from_dict(order_specs)
+        order = self.create_order(order_specs)
         if no_db:
             order.db = None
         else:
@@ -1234,20 +1820,20 @@ class BotTrading(ObjMOSAIC):
     def update_orders(self):
         """Update open orders with the current date and price, and execute if possible.
 
-        Iterates over all open orders and updates them with the current OHLCV date and
-        quote price. If an order is deemed executable (according to its `is_executable`
-        method), it is executed, the portfolio is updated accordingly, and the order is
-        moved from the open orders to the executed orders list. When iterating through 
-        open orders, a copy of the keys is used since the dictionary's structure may
-        be modified during the process.
+        Iterates over the open orders that may be executed at the current quote price
+        (see `OrderBook`) and updates them with the current OHLCV date and quote price.
+        Orders whose fixed execution bound is not crossed are skipped: their date and
+        price are brought up to date by `refresh_orders_open` when the orders are read
+        (checkpoint, database update, live summary and session end). If an order is
+        deemed executable (according to its `is_executable` method), it is executed,
+        the portfolio is updated accordingly, and the order is moved from the open
+        orders to the executed orders list.
 
         Returns:
             None
         """
-        # Iterate through a copy of the order keys to avoid modifying the
-        # dictionary during iteration. 
-        for od_uid in list(self.orders_open.keys()):
-            od = self.orders_open[od_uid]
+        order_book = self.order_book
+        for od_uid, od in order_book.pop_orders_to_check(self.quote_current):
             # Update the order with the latest date and quote price.
             od.update(
                 dt=self.dt_ohlcv_current,
@@ -1259,3 +1845,19 @@ class BotTrading(ObjMOSAIC):
                 res = od.execute()
                 self.portfolio.update_order(od)
                 self.orders_executed[od_uid] = self.orders_open.pop(od_uid)
+                order_book.set_executed(od_uid, od)
+            else:
+                order_book.index_open(od_uid, od)
+
+    def refresh_orders_open(self):
+        """Update the orders skipped by `update_orders` with the current date and price."""
+        if self.dt_ohlcv_current is None or self.quote_current is None:
+            return
+
+        for od in self.orders_open.values():
+            if od.dt != self.dt_ohlcv_current or \
+               od.quote_price != self.quote_current:
+                od.update(
+                    dt=self.dt_ohlcv_current,
+                    quote_price=self.quote_current,
+                )
@@ -0,0 +1,192 @@
+import os
+import hashlib
+import json
+import concurrent.futures
+import multiprocessing
+import pandas as pd
+import tqdm
+import pkg_resources
+
+from ..core import ObjMOSAIC
+from ..utils.data_management import \
+    compute_combinations, \
+    set_obj_attrs
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+SWEEP_IT_VAR = "sweep_it"
+SWEEP_PARAMS_HASH_VAR = "sweep_params_hash"
+
+# Bot used by the current sweep worker process
+_sweep_bot = None
+_sweep_start_kwrds = {}
+
+
+def sweep_worker_init(bot_specs, ohlcv_dfd, start_kwrds):
+    """Initialize a sweep worker process.
+
+    The bot and its OHLCV data are sent once per worker and kept in the
+    worker globals for all the combinations it runs.
+    """
+    global _sweep_bot, _sweep_start_kwrds
+
+    _sweep_bot = build_sweep_bot(bot_specs, ohlcv_dfd)
+    _sweep_start_kwrds = start_kwrds
+
+
+def build_sweep_bot(bot_specs, ohlcv_dfd):
+    """Bot copy running sweep combinations, with already loaded OHLCV data."""
+    bot = ObjMOSAIC.from_dict(bot_specs)
+    for attr, data_dfd in ohlcv_dfd.items():
+        getattr(bot, attr).update(data_dfd)
+    return bot
+
+
+def sweep_worker_run(it, params):
+    """Run the sweep worker bot for one parameters combination."""
+    return run_bot_params(_sweep_bot, it, params, **_sweep_start_kwrds)
+
+
+def compute_params_hash(params):
+    """SHA-256 fingerprint of a parameters combination."""
+    params_json = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(params_json.encode("utf-8")).hexdigest()
+
+
+def run_bot_params(bot, it, params, **start_kwrds):
+    """Backtest one parameters combination and return its portfolio record."""
+    set_obj_attrs(bot, params)
+
+    bot.uid = f"{it:06}"
+    bot.start(**start_kwrds)
+
+    res = dict({SWEEP_IT_VAR: it,
+                SWEEP_PARAMS_HASH_VAR: compute_params_hash(params)},
+               **params, **bot.portfolio.dict())
+
+    # Reset the bot for the next parameters combination
+    bot.reset()
+
+    return res
+
+
+def sweep_bot(bot,
+              param_grid,
+              n_jobs=1,
+              results_filename=None,
+              progress_mode=False,
+              mp_context=None,
+              **start_kwrds):
+    """Backtest a bot over a grid of parameters combinations.
+
+    Combinations are fanned out to a process pool. OHLCV data are loaded
+    once in the calling process and shared with each worker at startup.
+    When `results_filename` is given, each result is appended to this CSV
+    file as soon as it is available and combinations already present in
+    the file (with the same parameters) are skipped, which allows to
+    resume an interrupted sweep. Combinations are run on copies of the
+    bot, which is left unchanged.
+
+    Args:
+        bot (BotTrading): Bot to be backtested.
+        param_grid (dict or list): Dict of parameters values lists (see
+            `compute_combinations`) or list of parameters combinations.
+        n_jobs (int): Number of worker processes. 1 runs the sweep in the
+            calling process, None uses all available CPUs.
+        results_filename (str): CSV file used to store results and resume.
+        progress_mode (bool): Display sweep progress bar.
+        mp_context (str): Multiprocessing start method.
+        **start_kwrds: Keyword arguments passed to `BotTrading.start`.
+
+    Returns:
+        pd.DataFrame: One row per combination with parameters and portfolio
+        state, sorted by combination index.
+    """
+    params_list = compute_combinations(**param_grid) \
+        if isinstance(param_grid, dict) else list(param_grid)
+
+    params_hash_list = [compute_params_hash(params) for params in params_list]
+
+    res_done_df = None
+    if results_filename and os.path.exists(results_filename):
+        res_done_df = pd.read_csv(results_filename)
+        if not (SWEEP_PARAMS_HASH_VAR in res_done_df.columns):
+            raise ValueError(
+                f"Sweep results file {results_filename} has no "
+                f"{SWEEP_PARAMS_HASH_VAR} column: results cannot be "
+                f"matched with the parameters grid to resume")
+        # Only results of the current grid combinations are kept,
+        # indexed by their position in the current grid
+        it_from_hash = {params_hash: it
+                        for it, params_hash in enumerate(params_hash_list)}
+        res_done_df = res_done_df.loc[
+            res_done_df[SWEEP_PARAMS_HASH_VAR].isin(it_from_hash)]\
+            .drop_duplicates(subset=SWEEP_PARAMS_HASH_VAR, keep="last")
+        res_done_df[SWEEP_IT_VAR] = \
+            res_done_df[SWEEP_PARAMS_HASH_VAR].map(it_from_hash)
+        it_done = set(res_done_df[SWEEP_IT_VAR])
+    else:
+        it_done = set()
+
+    params_todo = [(it, params) for it, params in enumerate(params_list)
+                   if not (it in it_done)]
+
+    if bot.logger:
+        bot.logger.info(f"Sweep over {len(params_list)} combinations "
+                        f"({len(it_done)} already done)")
+
+    bot.load_ohlcv_data(data_dir=start_kwrds.get("data_dir", "."),
+                        progress_mode=progress_mode)
+
+    res_list = []
+
+    def register_result(res):
+        res_list.append(res)
+        if results_filename:
+            pd.DataFrame([res]).to_csv(
+                results_filename, mode="a", index=False,
+                header=not os.path.exists(results_filename))
+
+    bot_specs = bot.dict(exclude={"logger"})
+    ohlcv_dfd = {attr: getattr(bot, attr)
+                 for attr in ["ohlcv_trading_dfd",
+                              "ohlcv_dm_dfd",
+                              "ohlcv_fit_dfd"]}
+
+    with tqdm.tqdm(total=len(params_list), initial=len(it_done),
+                   disable=not progress_mode, desc="Sweep") as pbar:
+
+        if n_jobs == 1:
+            bot_sweep = build_sweep_bot(bot_specs, ohlcv_dfd)
+            bot_sweep.logger = bot.logger
+            for it, params in params_todo:
+                register_result(run_bot_params(bot_sweep, it, params,
+                                               **start_kwrds))
+                pbar.update()
+        else:
+            ctx = multiprocessing.get_context(mp_context)
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=n_jobs,
+                    mp_context=ctx,
+                    initializer=sweep_worker_init,
+                    initargs=(bot_specs, ohlcv_dfd, start_kwrds)) as executor:
+
+                futures = [executor.submit(sweep_worker_run, it, params)
+                           for it, params in params_todo]
+                for future in concurrent.futures.as_completed(futures):
+                    register_result(future.result())
+                    pbar.update()
+
+    res_df = pd.DataFrame(res_list)
+    if res_done_df is not None:
+        res_df = pd.concat([res_done_df, res_df],
+                           axis=0, ignore_index=True)
+
+    if res_df.empty:
+        return res_df
+
+    return res_df.sort_values(SWEEP_IT_VAR)\
+                 .reset_index(drop=True)
@@ -0,0 +1,926 @@
+import heapq
+import typing
+import pandas as pd
+import numpy as np
+import pkg_resources
+
+from .orders import OrderBase
+from ..utils.data_management import compute_intrabar_quotes, INTRABAR_PATHS
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+PandasDataFrame = typing.TypeVar('pandas.core.frame.DataFrame')
+PandasSeries = typing.TypeVar('pandas.core.frame.Series')
+
+
+# Order side codes used in engine arrays
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+
+def decisions_to_codes(decision_s, no_signal_code="pass"):
+    """Convert decisions into int8 codes.
+
+    Buy decisions are coded +1, sell decisions -1 and no signal 0.
+    Integer decision codes are used as is (missing values meaning no
+    signal), categorical labels are converted through their categories
+    and only other labels are compared as strings.
+    """
+    if isinstance(getattr(decision_s, "dtype", None), pd.CategoricalDtype):
+        categories_codes = np.array(
+            [decision_to_code(cat) for cat in decision_s.cat.categories] + [0],
+            dtype=np.int8)
+        # Missing values have category code -1, i.e. the last code
+        return categories_codes[decision_s.cat.codes.to_numpy()]
+
+    decision_arr = np.asarray(decision_s)
+    if np.issubdtype(decision_arr.dtype, np.number):
+        return np.nan_to_num(decision_arr, nan=0).astype(np.int8)
+
+    decision_arr = decision_arr.astype(object)
+    codes = np.zeros(len(decision_arr), dtype=np.int8)
+    codes[decision_arr == "buy"] = SIDE_BUY
+    codes[decision_arr == "sell"] = SIDE_SELL
+
+    return codes
+
+
+def decision_to_code(decision):
+    """Convert a single decision label or code into its int8 code."""
+    if isinstance(decision, str):
+        return SIDE_BUY if decision == "buy" \
+            else SIDE_SELL if decision == "sell" else 0
+    if decision is None or decision != decision:
+        return 0
+
+    return int(decision)
+
+
+def compute_order_signals(decision_codes):
+    """Get positions and sides of the orders to be placed in btfast mode.
+
+    No-signal decisions and consecutive identical decisions are dropped,
+    and sell decisions occurring before the first buy decision are ignored.
+    The resulting sequence therefore alternates buy and sell orders.
+
+    Returns:
+        tuple: Positions (in the decision array) and side codes of orders.
+    """
+    decision_codes = np.asarray(decision_codes)
+
+    pos = np.flatnonzero(decision_codes != 0)
+    codes = decision_codes[pos]
+
+    idx_change = np.ones(len(codes), dtype=bool)
+    idx_change[1:] = codes[1:] != codes[:-1]
+    pos = pos[idx_change]
+    codes = codes[idx_change]
+
+    idx_buy = np.flatnonzero(codes == SIDE_BUY)
+    if len(idx_buy) == 0:
+        # If no buy => force no sell
+        return pos[:0], codes[:0]
+
+    return pos[idx_buy[0]:], codes[idx_buy[0]:]
+
+
+def compute_threshold_grid_performance(score,
+                                       buy_thresholds,
+                                       sell_thresholds,
+                                       quote_price_buy,
+                                       quote_price_sell,
+                                       quote_price_close,
+                                       fees_taker=0,
+                                       buy_quote_rate=1,
+                                       sell_base_rate=1,
+                                       quote_amount_init=1):
+    """Btfast performance of a grid of buy/sell threshold pairs.
+
+    Decisions follow `DMBase.compute_signal` (buy if score > buy threshold,
+    sell if score < -sell threshold, sell prevailing) and orders are
+    executed as in `BTFastEngine` with the `InvestLongModel` logic. The
+    portfolios of all threshold pairs are updated together with NumPy
+    operations on 2-D arrays, only at candles where at least one pair gets
+    a signal, so the score series is computed once for the whole grid.
+
+    Args:
+        score (np.ndarray): Decision score aligned on trading data.
+        buy_thresholds (array-like): Buy thresholds (grid rows).
+        sell_thresholds (array-like): Sell thresholds (grid columns).
+        quote_price_buy (np.ndarray): Buy prices.
+        quote_price_sell (np.ndarray): Sell prices.
+        quote_price_close (np.ndarray): Close prices.
+
+    Returns:
+        dict: Final performance, number of buy orders and number of sell
+        orders arrays of shape (len(buy_thresholds), len(sell_thresholds)).
+    """
+    score = np.asarray(score, dtype=float)
+    buy_th = np.asarray(buy_thresholds, dtype=float)[:, np.newaxis]
+    sell_th = np.asarray(sell_thresholds, dtype=float)[np.newaxis, :]
+    shape = (buy_th.shape[0], sell_th.shape[1])
+
+    quote_amount = np.full(shape, float(quote_amount_init))
+    base_amount = np.zeros(shape)
+    quote_exposed = np.zeros(shape)
+    last_side = np.zeros(shape, dtype=np.int8)
+    nb_buy = np.zeros(shape, dtype=np.int64)
+    nb_sell = np.zeros(shape, dtype=np.int64)
+
+    pos_signal = np.flatnonzero((score > buy_th.min(initial=np.inf)) |
+                                (score < -sell_th.min(initial=np.inf)))
+
+    for pos in pos_signal:
+        is_sell = score[pos] < -sell_th
+        is_buy = (score[pos] > buy_th) & ~is_sell
+
+        # Orders alternate, starting with a buy order
+        od_buy = is_buy & (last_side != SIDE_BUY)
+        od_sell = is_sell & (last_side == SIDE_BUY)
+
+        if od_buy.any():
+            od_qa = (quote_amount + quote_exposed)*buy_quote_rate
+            od_ba = od_qa/quote_price_buy[pos]
+            od_ba -= od_ba*fees_taker
+            quote_amount = np.where(od_buy, quote_amount - od_qa, quote_amount)
+            base_amount = np.where(od_buy, base_amount + od_ba, base_amount)
+            nb_buy += od_buy
+            last_side[od_buy] = SIDE_BUY
+
+        if od_sell.any():
+            od_ba = base_amount*sell_base_rate
+            od_qa = od_ba*quote_price_sell[pos]
+            od_qa -= od_qa*fees_taker
+            quote_amount = np.where(od_sell, quote_amount + od_qa, quote_amount)
+            base_amount = np.where(od_sell, base_amount - od_ba, base_amount)
+            nb_sell += od_sell
+            last_side[od_sell] = SIDE_SELL
+
+        quote_exposed = np.where(
+            od_buy | od_sell,
+            base_amount*quote_price_close[pos]*(1 - fees_taker),
+            quote_exposed)
+
+    # Portfolio valued at the last timestamp sell price
+    quote_value = quote_amount + \
+        base_amount*quote_price_sell[-1]*(1 - fees_taker)
+
+    return dict(performance=quote_value/quote_amount_init,
+                nb_buy_orders=nb_buy,
+                nb_sell_orders=nb_sell)
+
+
+# Size of the first quotes window scanned to find an order fill, doubled
+# at each window without fill
+FILL_SCAN_SIZE = 16
+
+
+def flatten_quotes(quote_open, quote_low, quote_high, quote_close=None,
+                   intrabar_path="OLH"):
+    """Intrabar quotes of OHLC arrays.
+
+    Quotes follow `ExchangeBase.flatten_ohlcv`: the intrabar path quotes
+    of each candle (by default open, low and high quotes), candle after
+    candle. With `k` quotes per candle, the quotes of candle `pos` are
+    at ticks `k*pos` to `k*pos + k - 1`.
+    """
+    return compute_intrabar_quotes(quote_open, quote_low, quote_high,
+                                   quote_close=quote_close,
+                                   path=intrabar_path).ravel()
+
+
+def scan_first(quotes, tick_start, cond, scan_size=FILL_SCAN_SIZE):
+    """First tick from `tick_start` where quotes satisfy a condition.
+
+    Quotes are scanned by windows of growing size, so that close fills
+    only read a few quotes while far fills need a logarithmic number of
+    NumPy operations.
+
+    Args:
+        quotes (np.ndarray): Tick quotes.
+        tick_start (int): First tick scanned.
+        cond (callable): Vectorized condition on a quotes window.
+
+    Returns:
+        int: First tick satisfying the condition, -1 if none.
+    """
+    nb_ticks = len(quotes)
+    while tick_start < nb_ticks:
+        idx = np.flatnonzero(cond(quotes[tick_start:tick_start + scan_size]))
+        if len(idx) > 0:
+            return tick_start + idx[0]
+        tick_start += scan_size
+        scan_size *= 2
+
+    return -1
+
+
+def find_fill_tick(quotes, tick_open, side,
+                   exec_bound_rate=0,
+                   exec_trailing_rate=None,
+                   scan_size=FILL_SCAN_SIZE):
+    """Execution tick of a market order placed at a given tick.
+
+    The order execution bound is the placing quote shifted by
+    `exec_bound_rate` (below for buy orders, above for sell orders), as
+    in `OrderMarket`. Without trailing rate, the order is executed at the
+    first tick crossing its bound. With a trailing rate, the crossing
+    activates a trailing bound following the lowest (buy) or highest
+    (sell) quote since activation, and the order is executed at the
+    first tick crossing back the trailing bound, as in
+    `OrderTrailingMarket`.
+
+    Args:
+        quotes (np.ndarray): Tick quotes (see `flatten_quotes`).
+        tick_open (int): Tick at which the order is placed.
+        side (int): Order side code (+1 buy, -1 sell).
+        exec_bound_rate (float): Execution bound rate.
+        exec_trailing_rate (float): Trailing bound rate, None for
+            orders without trailing bound.
+
+    Returns:
+        tuple: Execution tick and bound crossing tick (-1 if none).
+    """
+    sign = 1 if side == SIDE_BUY else -1
+    quote_price_exec = quotes[tick_open]*(1 - sign*exec_bound_rate)
+
+    if side == SIDE_BUY:
+        tick_active = scan_first(quotes, tick_open,
+                                 lambda q: q <= quote_price_exec, scan_size)
+    else:
+        tick_active = scan_first(quotes, tick_open,
+                                 lambda q: q >= quote_price_exec, scan_size)
+
+    if exec_trailing_rate is None or tick_active < 0:
+        return tick_active, tick_active
+
+    # Trailing bound is ratcheted on the running quote extremum
+    bound_factor = 1 + sign*exec_trailing_rate
+    extremum_ufunc = np.minimum if side == SIDE_BUY else np.maximum
+    extremum = quotes[tick_active]
+    nb_ticks = len(quotes)
+    tick_start = tick_active
+    while tick_start < nb_ticks:
+        window = quotes[tick_start:tick_start + scan_size]
+        extrema = extremum_ufunc(extremum_ufunc.accumulate(window), extremum)
+        bounds = extrema*bound_factor
+        idx = np.flatnonzero(window >= bounds if side == SIDE_BUY
+                             else window <= bounds)
+        if len(idx) > 0:
+            return tick_start + idx[0], tick_active
+        extremum = extrema[-1]
+        tick_start += scan_size
+        scan_size *= 2
+
+    return -1, tick_active
+
+
+def compute_fills(quote_open, quote_low, quote_high,
+                  order_pos, order_side,
+                  exec_bound_rate=0,
+                  exec_trailing_rate=None,
+                  quote_close=None,
+                  intrabar_path="OLH"):
+    """Execution of market orders placed at the open of given candles.
+
+    Args:
+        quote_open (np.ndarray): Open prices.
+        quote_low (np.ndarray): Low prices.
+        quote_high (np.ndarray): High prices.
+        order_pos (np.ndarray): Candle positions of orders.
+        order_side (np.ndarray): Side codes of orders (+1 buy, -1 sell).
+        exec_bound_rate (float): Execution bound rate.
+        exec_trailing_rate (float): Trailing bound rate, None for
+            orders without trailing bound.
+        quote_close (np.ndarray): Close prices, required by intrabar
+            paths visiting the close.
+        intrabar_path (str): Intrabar path (see `INTRABAR_PATHS`).
+
+    Returns:
+        dict: Execution tick, candle position and price of orders
+        (-1, -1 and NaN for orders never executed).
+    """
+    nb_quotes_candle = len(INTRABAR_PATHS[intrabar_path])
+    quotes = flatten_quotes(quote_open, quote_low, quote_high,
+                            quote_close=quote_close,
+                            intrabar_path=intrabar_path)
+    tick_fill = np.array(
+        [find_fill_tick(quotes, nb_quotes_candle*pos, side,
+                        exec_bound_rate=exec_bound_rate,
+                        exec_trailing_rate=exec_trailing_rate)[0]
+         for pos, side in zip(order_pos, order_side)],
+        dtype=np.int64)
+
+    is_filled = tick_fill >= 0
+    return dict(tick=tick_fill,
+                pos=np.where(is_filled, tick_fill//nb_quotes_candle, -1),
+                quote_price=np.where(is_filled,
+                                     quotes[np.maximum(tick_fill, 0)],
+                                     np.nan))
+
+
+class BTFastEngine:
+    """Array-backed execution engine of the btfast backtest mode.
+
+    Market orders are executed at the decision timestamps with the
+    `InvestLongModel` logic and taker fees, keeping orders and portfolio
+    states in NumPy arrays. Pydantic orders are only built on demand
+    with `to_orders`.
+
+    Attributes:
+        fees_taker (float): Taker fees rate.
+        buy_quote_rate (float): Fraction of quote portfolio used to buy asset.
+        sell_base_rate (float): Fraction of base portfolio used to sell asset.
+        orders (dict): Executed orders arrays.
+        portfolio (dict): Portfolio state arrays after each executed order.
+    """
+
+    orders_var = ["dt_open", "side", "quote_price", "quote_amount",
+                  "base_amount", "fees_value"]
+
+    portfolio_var = ["dt", "quote_price", "quote_amount", "base_amount",
+                     "quote_exposed", "quote_value", "asset_performance",
+                     "performance", "nb_buy_orders", "nb_sell_orders",
+                     "intratrade_duration_cum", "intertrade_duration_cum",
+                     "last_buy_order_dt", "last_sell_order_dt"]
+
+    def __init__(self, fees_taker=0, buy_quote_rate=1, sell_base_rate=1):
+        self.fees_taker = fees_taker
+        self.buy_quote_rate = buy_quote_rate
+        self.sell_base_rate = sell_base_rate
+        self.orders = {}
+        self.portfolio = {}
+
+    @property
+    def nb_orders(self):
+        return len(self.orders.get("side", []))
+
+    def run(self,
+            dt_index,
+            quote_price_buy,
+            quote_price_sell,
+            quote_price_close,
+            order_pos,
+            order_side,
+            portfolio):
+        """Execute orders and update portfolio in one pass.
+
+        Args:
+            dt_index (pd.DatetimeIndex): Trading data timestamps.
+            quote_price_buy (np.ndarray): Buy prices aligned on `dt_index`.
+            quote_price_sell (np.ndarray): Sell prices aligned on `dt_index`.
+            quote_price_close (np.ndarray): Close prices aligned on `dt_index`.
+            order_pos (np.ndarray): Positions of orders in `dt_index`.
+            order_side (np.ndarray): Side codes of orders (+1 buy, -1 sell).
+            portfolio (Portfolio): Portfolio to start from, updated
+                with the final state.
+
+        Returns:
+            BTFastEngine: The instance itself.
+        """
+        nb_orders = len(order_pos)
+        dt_ns = dt_index.asi8
+
+        od_quote_price = np.empty(nb_orders)
+        od_quote_amount = np.empty(nb_orders)
+        od_base_amount = np.empty(nb_orders)
+        od_fees_value = np.empty(nb_orders)
+
+        pf_arrays = {var: np.empty(nb_orders)
+                     for var in self.portfolio_var
+                     if not (var in ["dt", "nb_buy_orders", "nb_sell_orders",
+                                     "last_buy_order_dt", "last_sell_order_dt"])}
+        pf_nb_buy = np.empty(nb_orders, dtype=np.int64)
+        pf_nb_sell = np.empty(nb_orders, dtype=np.int64)
+        pf_last_buy_pos = np.empty(nb_orders, dtype=np.int64)
+        pf_last_sell_pos = np.empty(nb_orders, dtype=np.int64)
+
+        fees_taker = self.fees_taker
+        quote_amount_init = portfolio.quote_amount_init
+        quote_price_init = portfolio.quote_price_init
+        quote_amount = portfolio.quote_amount
+        base_amount = portfolio.base_amount
+        quote_price = portfolio.quote_price
+        quote_exposed = portfolio.quote_exposed
+        nb_buy = portfolio.nb_buy_orders
+        nb_sell = portfolio.nb_sell_orders
+        intratrade_duration_cum = portfolio.intratrade_duration_cum
+        intertrade_duration_cum = portfolio.intertrade_duration_cum
+
+        # Last order timestamps are tracked as int ns with their position
+        # (-1 when the order comes from the initial portfolio state)
+        last_buy_ns = None if portfolio.last_buy_order_dt is None \
+            else pd.Timestamp(portfolio.last_buy_order_dt).value
+        last_sell_ns = None if portfolio.last_sell_order_dt is None \
+            else pd.Timestamp(portfolio.last_sell_order_dt).value
+        last_buy_pos = last_sell_pos = -1
+
+        for k in range(nb_orders):
+            pos = order_pos[k]
+
+            if order_side[k] == SIDE_BUY:
+                od_qp = quote_price_buy[pos]
+                od_qa = (quote_amount + quote_exposed)*self.buy_quote_rate
+                od_ba = od_qa/od_qp
+                od_fees = od_ba*fees_taker
+                od_ba -= od_fees
+
+                quote_amount -= od_qa
+                base_amount += od_ba
+                nb_buy += 1
+                last_buy_ns = dt_ns[pos]
+                last_buy_pos = pos
+                if last_sell_ns is not None:
+                    intertrade_duration_cum += \
+                        (last_buy_ns - last_sell_ns)/1e9
+            else:
+                od_qp = quote_price_sell[pos]
+                od_ba = base_amount*self.sell_base_rate
+                od_qa = od_ba*od_qp
+                od_fees = od_qa*fees_taker
+                od_qa -= od_fees
+
+                quote_amount += od_qa
+                base_amount -= od_ba
+                nb_sell += 1
+                last_sell_ns = dt_ns[pos]
+                last_sell_pos = pos
+                if last_buy_ns is not None:
+                    intratrade_duration_cum += \
+                        (last_sell_ns - last_buy_ns)/1e9
+
+            quote_price = quote_price_close[pos]
+            quote_exposed = base_amount*quote_price*(1 - fees_taker)
+            quote_value = quote_amount + quote_exposed
+
+            od_quote_price[k] = od_qp
+            od_quote_amount[k] = od_qa
+            od_base_amount[k] = od_ba
+            od_fees_value[k] = od_fees
+
+            pf_arrays["quote_price"][k] = quote_price
+            pf_arrays["quote_amount"][k] = quote_amount
+            pf_arrays["base_amount"][k] = base_amount
+            pf_arrays["quote_exposed"][k] = quote_exposed
+            pf_arrays["quote_value"][k] = quote_value
+            pf_arrays["asset_performance"][k] = \
+                0 if quote_price_init is None else quote_price/quote_price_init
+            pf_arrays["performance"][k] = quote_value/quote_amount_init
+            pf_arrays["intratrade_duration_cum"][k] = intratrade_duration_cum
+            pf_arrays["intertrade_duration_cum"][k] = intertrade_duration_cum
+            pf_nb_buy[k] = nb_buy
+            pf_nb_sell[k] = nb_sell
+            pf_last_buy_pos[k] = last_buy_pos
+            pf_last_sell_pos[k] = last_sell_pos
+
+        dt_orders = dt_index[order_pos]
+
+        self.orders = dict(
+            dt_open=dt_orders,
+            side=np.asarray(order_side, dtype=np.int8),
+            quote_price=od_quote_price,
+            quote_amount=od_quote_amount,
+            base_amount=od_base_amount,
+            fees_value=od_fees_value,
+        )
+
+        self.portfolio = dict(
+            dt=dt_orders,
+            nb_buy_orders=pf_nb_buy,
+            nb_sell_orders=pf_nb_sell,
+            last_buy_order_dt=self._dt_from_pos(
+                dt_index, pf_last_buy_pos, portfolio.last_buy_order_dt),
+            last_sell_order_dt=self._dt_from_pos(
+                dt_index, pf_last_sell_pos, portfolio.last_sell_order_dt),
+            **pf_arrays)
+
+        # Report final state into the portfolio object
+        if nb_orders > 0:
+            portfolio.dt = dt_orders[-1]
+            portfolio.quote_price = quote_price
+            portfolio.quote_amount = quote_amount
+            portfolio.base_amount = base_amount
+            portfolio.nb_buy_orders = nb_buy
+            portfolio.nb_sell_orders = nb_sell
+            portfolio.intratrade_duration_cum = intratrade_duration_cum
+            portfolio.intertrade_duration_cum = intertrade_duration_cum
+            if last_buy_pos >= 0:
+                portfolio.last_buy_order_dt = dt_index[last_buy_pos]
+            if last_sell_pos >= 0:
+                portfolio.last_sell_order_dt = dt_index[last_sell_pos]
+            portfolio.update()
+
+        return self
+
+    @staticmethod
+    def _dt_from_pos(dt_index, pos, dt_default=None):
+        dt_s = pd.Series(dt_index[np.maximum(pos, 0)])
+        return dt_s.where(pos >= 0, dt_default)
+
+    def orders_df(self, **specs):
+        """Executed orders as a DataFrame.
+
+        Args:
+            **specs: Constant order attributes added as columns
+                (e.g. bot_uid, symbol, timeframe).
+        """
+        dt_open = self.orders.get("dt_open", [])
+        orders_df = pd.DataFrame({
+            "dt_open": dt_open,
+            "dt_closed": self.orders.get("dt_closed", dt_open),
+            "side": np.where(self.orders.get("side", []) == SIDE_BUY,
+                             "buy", "sell"),
+            "quote_price": self.orders.get("quote_price", []),
+            "quote_amount": self.orders.get("quote_amount", []),
+            "base_amount": self.orders.get("base_amount", []),
+            "fees_value": self.orders.get("fees_value", []),
+        })
+        for attr, value in specs.items():
+            orders_df[attr] = value
+
+        return orders_df
+
+    def portfolio_df(self, **specs):
+        """Portfolio states after each executed order as a DataFrame.
+
+        Args:
+            **specs: Constant portfolio attributes added as columns
+                (e.g. bot_uid, fees_taker).
+        """
+        portfolio_df = pd.DataFrame({var: self.portfolio.get(var, [])
+                                     for var in self.portfolio_var})
+        for attr, value in specs.items():
+            portfolio_df[attr] = value
+
+        return portfolio_df
+
+    def to_orders(self, base, quote, order_model=None, **specs):
+        """Build pydantic orders from engine arrays.
+
+        Args:
+            base (str): Base asset name (fees asset of buy orders).
+            quote (str): Quote asset name (fees asset of sell orders).
+            order_model (OrderBase): Order model providing order class
+                and parameters.
+            **specs: Common order attributes (e.g. bot_uid, symbol, timeframe).
+
+        Returns:
+            dict: Executed orders indexed by their uid.
+        """
+        order_params = order_model.dict_params() if order_model \
+            else {"cls": OrderBase.__name__}
+
+        orders = {}
+        for od_rec in self.orders_df().to_dict("records"):
+            side = od_rec["side"]
+            order_specs = dict(
+                dt_open=od_rec["dt_open"],
+                side=side,
+                **specs,
+                **order_params,
+            )
+            od = OrderBase.from_dict(order_specs)
+            od.update(
+                dt=od_rec["dt_open"],
+                quote_price=od_rec["quote_price"],
+                quote_amount=od_rec["quote_amount"],
+                base_amount=od_rec["base_amount"],
+            )
+            od.fees.value = od_rec["fees_value"]
+            od.fees.asset = base if side == "buy" else quote
+            od.dt_closed = od_rec["dt_closed"]
+            od.status = "executed"
+            orders[od.uid] = od
+
+        return orders
+
+
+class BTFillEngine(BTFastEngine):
+    """Array-backed engine executing market orders on intrabar quotes.
+
+    Decisions are taken at the open of each candle and orders are
+    executed on the intrabar path quotes (by default open, low and high)
+    of the following candles as in the btclassic mode: `OrderMarket` orders when their execution
+    bound is crossed and `OrderTrailingMarket` orders when their trailing
+    bound is crossed back (see `find_fill_tick`). Several orders can be
+    open at the same time, within the bot buy/sell orders difference
+    threshold.
+
+    Fill ticks are found with NumPy scans of the quotes, so that the
+    Python loop runs over decisions and fills only.
+
+    Attributes:
+        exec_bound_rate (float): Orders execution bound rate.
+        exec_trailing_rate (float): Orders trailing bound rate, None
+            for orders without trailing bound.
+        diff_thresh (int): Bot buy/sell orders difference threshold.
+        intrabar_path (str): Quotes visited within each candle (see
+            `INTRABAR_PATHS`).
+        quotes (np.ndarray): Tick quotes of the session.
+        orders_open (dict): Arrays of orders still open at the end of
+            the session.
+    """
+
+    orders_var = BTFastEngine.orders_var + ["dt_closed"]
+
+    def __init__(self, fees_taker=0, buy_quote_rate=1, sell_base_rate=1,
+                 exec_bound_rate=0, exec_trailing_rate=None, diff_thresh=0,
+                 intrabar_path="OLH"):
+        super().__init__(fees_taker=fees_taker,
+                         buy_quote_rate=buy_quote_rate,
+                         sell_base_rate=sell_base_rate)
+        self.exec_bound_rate = exec_bound_rate
+        self.exec_trailing_rate = exec_trailing_rate
+        self.diff_thresh = diff_thresh
+        self.intrabar_path = intrabar_path
+        self.nb_quotes_candle = len(INTRABAR_PATHS[intrabar_path])
+        self.quotes = np.empty(0)
+        self.dt_index = None
+        self.orders_open = {}
+
+    def run(self,
+            dt_index,
+            quote_open,
+            quote_low,
+            quote_high,
+            decision_codes,
+            portfolio,
+            quote_close=None):
+        """Place, execute orders and update portfolio in one pass.
+
+        Args:
+            dt_index (pd.DatetimeIndex): Trading data timestamps.
+            quote_open (np.ndarray): Open prices aligned on `dt_index`.
+            quote_low (np.ndarray): Low prices aligned on `dt_index`.
+            quote_high (np.ndarray): High prices aligned on `dt_index`.
+            decision_codes (np.ndarray): Decision codes aligned on
+                `dt_index` (+1 buy, -1 sell, 0 no signal).
+            portfolio (Portfolio): Portfolio to start from, updated
+                with the final state.
+            quote_close (np.ndarray): Close prices aligned on `dt_index`,
+                required by intrabar paths visiting the close.
+
+        Returns:
+            BTFillEngine: The instance itself.
+        """
+        decision_codes = np.asarray(decision_codes)
+        self.dt_index = dt_index
+        self.quotes = quotes = flatten_quotes(quote_open, quote_low, quote_high,
+                                              quote_close=quote_close,
+                                              intrabar_path=self.intrabar_path)
+        nb_quotes_candle = self.nb_quotes_candle
+        fees_taker = self.fees_taker
+        quote_price_init = portfolio.quote_price_init
+
+        state = dict(
+            quote_amount=portfolio.quote_amount,
+            base_amount=portfolio.base_amount,
+            nb_buy=portfolio.nb_buy_orders,
+            nb_sell=portfolio.nb_sell_orders,
+            intratrade_duration_cum=portfolio.intratrade_duration_cum,
+            intertrade_duration_cum=portfolio.intertrade_duration_cum,
+            last_buy_dt=portfolio.last_buy_order_dt,
+            last_sell_dt=portfolio.last_sell_order_dt,
+        )
+        nb_open = {SIDE_BUY: 0, SIDE_SELL: 0}
+
+        # Placed orders, indexed by placing sequence
+        placed = dict(tick_open=[], tick_active=[], tick_fill=[], side=[],
+                      quote_amount=[], base_amount=[])
+        # Executed orders (placing sequence) and portfolio states, in
+        # execution order
+        executed_seq = []
+        executed = {var: [] for var in ["quote_price", "quote_amount",
+                                        "base_amount", "fees_value"]}
+        pf_states = {var: [] for var in self.portfolio_var}
+        # Pending fills as (tick, sequence) heap
+        fills = []
+
+        def tick_dt(tick):
+            return dt_index[tick//nb_quotes_candle]
+
+        def execute_fills(tick_end):
+            # Orders are executed before the portfolio is updated at
+            # their tick, as in btclassic: the portfolio timestamp is the
+            # one of the previous tick
+            while fills and fills[0][0] < tick_end:
+                tick, seq = heapq.heappop(fills)
+                side = placed["side"][seq]
+                od_qp = quotes[tick]
+                dt_pf = portfolio.dt if tick == 0 else tick_dt(tick - 1)
+                dt_pf_ns = None if dt_pf is None else pd.Timestamp(dt_pf).value
+
+                if side == SIDE_BUY:
+                    od_qa = placed["quote_amount"][seq]
+                    od_ba = od_qa/od_qp
+                    od_fees = od_ba*fees_taker
+                    od_ba -= od_fees
+
+                    state["quote_amount"] -= od_qa
+                    state["base_amount"] += od_ba
+                    state["nb_buy"] += 1
+                    state["last_buy_dt"] = dt_pf
+                    if state["last_sell_dt"] and dt_pf_ns is not None:
+                        state["intertrade_duration_cum"] += \
+                            (dt_pf_ns - pd.Timestamp(state["last_sell_dt"]).value)/1e9
+                else:
+                    od_ba = placed["base_amount"][seq]
+                    od_qa = od_ba*od_qp
+                    od_fees = od_qa*fees_taker
+                    od_qa -= od_fees
+
+                    state["quote_amount"] += od_qa
+                    state["base_amount"] -= od_ba
+                    state["nb_sell"] += 1
+                    state["last_sell_dt"] = dt_pf
+                    if state["last_buy_dt"] and dt_pf_ns is not None:
+                        state["intratrade_duration_cum"] += \
+                            (dt_pf_ns - pd.Timestamp(state["last_buy_dt"]).value)/1e9
+
+                nb_open[side] -= 1
+                executed_seq.append(seq)
+                executed["quote_price"].append(od_qp)
+                executed["quote_amount"].append(od_qa)
+                executed["base_amount"].append(od_ba)
+                executed["fees_value"].append(od_fees)
+
+                # Portfolio state at the end of the fill tick
+                quote_exposed = state["base_amount"]*od_qp*(1 - fees_taker)
+                quote_value = state["quote_amount"] + quote_exposed
+                pf_states["dt"].append(tick_dt(tick))
+                pf_states["quote_price"].append(od_qp)
+                pf_states["quote_amount"].append(state["quote_amount"])
+                pf_states["base_amount"].append(state["base_amount"])
+                pf_states["quote_exposed"].append(quote_exposed)
+                pf_states["quote_value"].append(quote_value)
+                pf_states["asset_performance"].append(
+                    0 if quote_price_init is None else od_qp/quote_price_init)
+                pf_states["performance"].append(
+                    quote_value/portfolio.quote_amount_init)
+                pf_states["nb_buy_orders"].append(state["nb_buy"])
+                pf_states["nb_sell_orders"].append(state["nb_sell"])
+                for var in ["intratrade_duration_cum", "intertrade_duration_cum"]:
+                    pf_states[var].append(state[var])
+                pf_states["last_buy_order_dt"].append(state["last_buy_dt"])
+                pf_states["last_sell_order_dt"].append(state["last_sell_dt"])
+
+        for pos in np.flatnonzero(decision_codes != 0):
+            tick_open = nb_quotes_candle*pos
+            execute_fills(tick_open)
+
+            side = SIDE_BUY if decision_codes[pos] == SIDE_BUY else SIDE_SELL
+            nb_buy = state["nb_buy"]
+            nb_sell = state["nb_sell"]
+            if side == SIDE_BUY:
+                if nb_buy + nb_open[SIDE_BUY] - nb_sell > self.diff_thresh:
+                    continue
+                # Exposed quote valued at the previous tick quote
+                quote_price_prev = portfolio.quote_price if tick_open == 0 \
+                    else quotes[tick_open - 1]
+                quote_exposed = 0 if quote_price_prev is None \
+                    else state["base_amount"]*quote_price_prev*(1 - fees_taker)
+                od_qa = (state["quote_amount"] + quote_exposed)*self.buy_quote_rate
+                od_ba = None
+            else:
+                if nb_buy - (nb_open[SIDE_SELL] + nb_sell) != self.diff_thresh + 1:
+                    continue
+                od_qa = None
+                od_ba = state["base_amount"]*self.sell_base_rate
+
+            tick_fill, tick_active = find_fill_tick(
+                quotes, tick_open, side,
+                exec_bound_rate=self.exec_bound_rate,
+                exec_trailing_rate=self.exec_trailing_rate)
+
+            seq = len(placed["side"])
+            placed["tick_open"].append(tick_open)
+            placed["tick_active"].append(tick_active)
+            placed["tick_fill"].append(tick_fill)
+            placed["side"].append(side)
+            placed["quote_amount"].append(od_qa)
+            placed["base_amount"].append(od_ba)
+            nb_open[side] += 1
+            if tick_fill >= 0:
+                heapq.heappush(fills, (tick_fill, seq))
+
+        execute_fills(len(quotes))
+
+        executed_seq = np.array(executed_seq, dtype=np.int64)
+        placed_arr = {var: np.array(values, dtype=np.int64)
+                      for var, values in placed.items()
+                      if var in ["tick_open", "tick_active", "tick_fill", "side"]}
+        self.orders = dict(
+            dt_open=dt_index[placed_arr["tick_open"][executed_seq]//nb_quotes_candle],
+            dt_closed=dt_index[placed_arr["tick_fill"][executed_seq]//nb_quotes_candle],
+            side=placed_arr["side"][executed_seq].astype(np.int8),
+            tick_open=placed_arr["tick_open"][executed_seq],
+            tick_active=placed_arr["tick_active"][executed_seq],
+            tick_fill=placed_arr["tick_fill"][executed_seq],
+            **{var: np.array(values, dtype=float)
+               for var, values in executed.items()})
+
+        seq_open = np.flatnonzero(placed_arr["tick_fill"] < 0) \
+            if len(placed_arr["tick_fill"]) > 0 else executed_seq[:0]
+        self.orders_open = dict(
+            dt_open=dt_index[placed_arr["tick_open"][seq_open]//nb_quotes_candle],
+            side=placed_arr["side"][seq_open].astype(np.int8),
+            tick_open=placed_arr["tick_open"][seq_open],
+            tick_active=placed_arr["tick_active"][seq_open],
+            quote_amount=[placed["quote_amount"][seq] for seq in seq_open],
+            base_amount=[placed["base_amount"][seq] for seq in seq_open])
+
+        self.portfolio = dict(
+            {var: pd.Series(values, dtype=object)
+             for var, values in pf_states.items()
+             if var in ["dt", "last_buy_order_dt", "last_sell_order_dt"]},
+            **{var: np.array(values, dtype=np.int64 if var.startswith("nb_")
+                             else float)
+               for var, values in pf_states.items()
+               if not (var in ["dt", "last_buy_order_dt", "last_sell_order_dt"])})
+
+        # Report final state into the portfolio object, valued at the
+        # last quote of the session
+        if len(quotes) > 0:
+            portfolio.dt = dt_index[-1]
+            portfolio.quote_price = quotes[-1]
+            portfolio.quote_amount = state["quote_amount"]
+            portfolio.base_amount = state["base_amount"]
+            portfolio.nb_buy_orders = state["nb_buy"]
+            portfolio.nb_sell_orders = state["nb_sell"]
+            portfolio.intratrade_duration_cum = state["intratrade_duration_cum"]
+            portfolio.intertrade_duration_cum = state["intertrade_duration_cum"]
+            portfolio.last_buy_order_dt = state["last_buy_dt"]
+            portfolio.last_sell_order_dt = state["last_sell_dt"]
+            portfolio.update()
+
+        return self
+
+    def to_orders(self, base, quote, order_model=None, **specs):
+        """Build pydantic executed orders from engine arrays.
+
+        See `BTFastEngine.to_orders`. Orders also get their placing
+        quote, execution bound and trailing state.
+        """
+        orders = super().to_orders(base, quote, order_model=order_model, **specs)
+
+        for k, od in enumerate(orders.values()):
+            self._set_order_state(od,
+                                  tick_open=self.orders["tick_open"][k],
+                                  tick_active=self.orders["tick_active"][k],
+                                  tick_end=self.orders["tick_fill"][k])
+        return orders
+
+    def to_orders_open(self, order_model=None, **specs):
+        """Build pydantic orders still open at the end of the session.
+
+        Args:
+            order_model (OrderBase): Order model providing order class
+                and parameters.
+            **specs: Common order attributes (e.g. bot_uid, symbol, timeframe).
+
+        Returns:
+            dict: Open orders indexed by their uid.
+        """
+        order_params = order_model.dict_params() if order_model \
+            else {"cls": OrderBase.__name__}
+
+        orders = {}
+        for k in range(len(self.orders_open.get("side", []))):
+            od = OrderBase.from_dict(dict(
+                dt_open=self.orders_open["dt_open"][k],
+                side="buy" if self.orders_open["side"][k] == SIDE_BUY else "sell",
+                quote_amount=self.orders_open["quote_amount"][k],
+                base_amount=self.orders_open["base_amount"][k],
+                **specs,
+                **order_params))
+            self._set_order_state(od,
+                                  tick_open=self.orders_open["tick_open"][k],
+                                  tick_active=self.orders_open["tick_active"][k],
+                                  tick_end=len(self.quotes) - 1)
+            orders[od.uid] = od
+
+        return orders
+
+    def _set_order_state(self, od, tick_open, tick_active, tick_end):
+        # Order state as updated at tick `tick_end`
+        sign = 1 if od.side == "buy" else -1
+        od.quote_price_at_create = self.quotes[tick_open]
+        od.quote_price_exec = \
+            od.quote_price_at_create*(1 - sign*self.exec_bound_rate)
+        od.quote_price = self.quotes[tick_end]
+        od.quote_price_rate_open_exec = \
+            od.quote_price/od.quote_price_at_create - 1
+        od.dt = self.dt_index[tick_end//self.nb_quotes_candle]
+
+        if self.exec_trailing_rate is not None and \
+           hasattr(od, "is_trailing_activated"):
+            od.params.exec_trailing_rate = self.exec_trailing_rate
+            if tick_active >= 0 and tick_active <= tick_end:
+                quotes_active = self.quotes[tick_active:tick_end + 1]
+                extremum = quotes_active.min() if od.side == "buy" \
+                    else quotes_active.max()
+                od.is_trailing_activated = True
+                od.quote_price_trailing_bound = \
+                    extremum*(1 + sign*self.exec_trailing_rate)
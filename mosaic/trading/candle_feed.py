@@ -0,0 +1,116 @@
+import collections
+import pandas as pd
+import pkg_resources
+
+from ..utils.data_management import timeframe_to_seconds
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+OHLCV_FEED_VAR = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+class CandleFeed:
+    """Rolling buffer of the last live candles of a (symbol, timeframe).
+
+    The buffer holds the last `nb_closed` closed candles followed by the
+    current (not closed) candle, as raw [timestamp (UTC ms), open, high,
+    low, close, volume] lists. The first update fills the buffer, then
+    each update requests only the candles since the last buffered one (to
+    get the final values of the previous current candle) in a single
+    call. When a `stream` is given (e.g. a websocket client queue), new
+    candles are taken from it instead of the exchange REST API. The
+    current quote and the decision window are served from memory.
+
+    Attributes:
+        exchange (ExchangeCCXT): Exchange used to fetch candles.
+        symbol (str): Trading symbol.
+        timeframe (str): Candles timeframe.
+        stream (callable): Function returning the candles received since
+            its previous call.
+        bots (list): Bots trading on this feed (see `LiveRunner`).
+        ts_next (int): Next candle close timestamp (ms), None before the
+            first update.
+    """
+
+    def __init__(self, exchange, symbol, timeframe, nb_closed=1,
+                 stream=None):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.timedelta_ms = 1000*timeframe_to_seconds(timeframe)
+        self.stream = stream
+        self.candles = collections.deque(maxlen=nb_closed + 1)
+        self.bots = []
+        self.ts_next = None
+        self._ohlcv_df = None
+
+    @property
+    def nb_closed(self):
+        """Number of closed candles kept in the buffer."""
+        return self.candles.maxlen - 1
+
+    @nb_closed.setter
+    def nb_closed(self, value):
+        if value != self.nb_closed:
+            self.candles = collections.deque(self.candles, maxlen=value + 1)
+            self._ohlcv_df = None
+
+    def fetch(self, since=None, limit=None):
+        return self.exchange.bkd.fetch_ohlcv(self.symbol,
+                                             timeframe=self.timeframe,
+                                             since=since,
+                                             limit=limit)
+
+    def update(self):
+        """Append new candles with a single request (or from the stream)."""
+        capacity = self.candles.maxlen
+
+        if self.candles:
+            if self.stream is not None:
+                self.push(self.stream())
+                return
+
+            candles = self.fetch(since=self.candles[-1][0], limit=capacity)
+            if len(candles) < capacity:
+                self.push(candles)
+                return
+            # Candles may have been missed: the buffer is filled again
+
+        self.candles.clear()
+        self.push(self.fetch(limit=capacity))
+
+    def push(self, candles):
+        """Merge candles sorted by timestamp into the buffer.
+
+        A candle with the timestamp of the last buffered candle updates
+        it, older candles are ignored.
+        """
+        for candle in candles:
+            if self.candles and candle[0] <= self.candles[-1][0]:
+                if candle[0] == self.candles[-1][0]:
+                    self.candles[-1] = list(candle)
+                continue
+            self.candles.append(list(candle))
+
+        self._ohlcv_df = None
+
+    def update_ts_next(self, ts_now):
+        self.ts_next = (ts_now//self.timedelta_ms + 1)*self.timedelta_ms
+
+    @property
+    def quote_current(self):
+        return self.candles[-1][4] if self.candles else None
+
+    @property
+    def ohlcv_df(self):
+        """Buffered closed candles followed by the current candle."""
+        if self._ohlcv_df is None:
+            self._ohlcv_df = self.exchange.format_ohlcv(
+                pd.DataFrame(list(self.candles), columns=OHLCV_FEED_VAR))
+        return self._ohlcv_df
+
+    @property
+    def ohlcv_closed_df(self):
+        return self.ohlcv_df.iloc[:-1]
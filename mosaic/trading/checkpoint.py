@@ -0,0 +1,177 @@
+import os
+import pickle
+import tempfile
+import pydantic
+import typing
+from ..core import ObjMOSAIC
+from ..db.db_base import DBBase
+from .orders import OrderBase
+
+import pkg_resources
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+# Bot session attributes stored in checkpoints
+CHECKPOINT_BOT_ATTR = [
+    "uid",
+    "dt_ohlcv_current",
+    "dt_ohlcv_closed",
+    "quote_current",
+]
+
+CHECKPOINT_ORDERS_ATTR = [
+    "orders_open",
+    "orders_executed",
+    "orders_cancelled",
+]
+
+
+class BotCheckpoint(ObjMOSAIC):
+    """Periodic binary checkpoints of a bot session state.
+
+    A checkpoint holds the bot session attributes, its portfolio, its
+    open/executed/cancelled orders and the fitted state of its decision
+    model predict models (e.g. online models coefficients). It is taken
+    every `every` closed candles and pickled into a local file (written
+    atomically) and/or a data backend. Resuming a session restores the
+    last checkpoint and continues after its last closed candle.
+    """
+
+    filename: str = pydantic.Field(
+        None, description="Local checkpoint file")
+
+    db: DBBase = pydantic.Field(
+        None, description="Checkpoint data backend")
+
+    endpoint: str = pydantic.Field(
+        "checkpoints", description="Checkpoint data backend endpoint")
+
+    key: str = pydantic.Field(
+        None, description="Checkpoint identifier in the data backend (bot name by default)")
+
+    every: int = pydantic.Field(
+        100, description="Number of closed candles between two checkpoints",
+        gt=0)
+
+    logger: typing.Any = pydantic.Field(
+        None, description="Logger")
+
+    _nb_candles: int = pydantic.PrivateAttr(0)
+
+    def dict(self, **kwrds):
+
+        if kwrds.get("exclude"):
+            kwrds["exclude"].add("logger")
+        else:
+            kwrds["exclude"] = {"logger"}
+
+        return super().dict(**kwrds)
+
+    def get_key(self, bot):
+        key = self.key or bot.name
+        if key is None:
+            raise ValueError(
+                "Checkpoint key or bot name is required to use a checkpoint data backend")
+        return key
+
+    def get_state(self, bot):
+        """Bot session state as a picklable dict."""
+        # Orders skipped at the last ticks are brought up to date
+        bot.refresh_orders_open()
+        state = {attr: getattr(bot, attr) for attr in CHECKPOINT_BOT_ATTR}
+        state["portfolio"] = bot.portfolio.dict()
+        for attr in CHECKPOINT_ORDERS_ATTR:
+            state[attr] = {uid: od.dict()
+                           for uid, od in getattr(bot, attr).items()}
+        state["decision_model"] = bot.decision_model.get_fitted_state()
+
+        return state
+
+    def set_state(self, bot, state):
+        """Restores a bot session state given by `get_state`."""
+        for attr in CHECKPOINT_BOT_ATTR:
+            setattr(bot, attr, state[attr])
+
+        for attr, value in state["portfolio"].items():
+            setattr(bot.portfolio, attr, value)
+
+        for attr in CHECKPOINT_ORDERS_ATTR:
+            orders = {}
+            for uid, od_dict in state[attr].items():
+                od = OrderBase.from_dict(od_dict)
+                od.bkd = bot.exchange
+                od.db = bot.db
+                orders[uid] = od
+            setattr(bot, attr, orders)
+
+        bot.decision_model.set_fitted_state(state["decision_model"])
+
+    def save(self, bot):
+        """Saves the bot state up to its last closed candle."""
+        state = self.get_state(bot)
+        state_bin = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if self.filename:
+            # Written to a temporary file first to never leave a partial checkpoint
+            checkpoint_dir = os.path.dirname(os.path.abspath(self.filename))
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            fd, tmp_filename = tempfile.mkstemp(dir=checkpoint_dir,
+                                                suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(state_bin)
+            os.replace(tmp_filename, self.filename)
+
+        if self.db:
+            self.db.update(endpoint=self.endpoint,
+                           data={"key": self.get_key(bot),
+                                 "dt": bot.dt_ohlcv_closed,
+                                 "state": state_bin},
+                           index=["key"])
+            self.db.flush()
+
+        if self.logger:
+            self.logger.info(
+                f"Bot {bot.name} checkpoint saved at {bot.dt_ohlcv_closed}")
+
+    def load(self, bot):
+        """Last saved bot state, None if no checkpoint exists."""
+        state_bin = None
+        if self.filename and os.path.exists(self.filename):
+            with open(self.filename, "rb") as checkpoint_file:
+                state_bin = checkpoint_file.read()
+        elif self.db:
+            checkpoints = self.db.get(endpoint=self.endpoint,
+                                      filter={"key": self.get_key(bot)})
+            if checkpoints:
+                state_bin = checkpoints[-1]["state"]
+
+        return pickle.loads(state_bin) if state_bin is not None else None
+
+    def reset(self):
+        self._nb_candles = 0
+
+    def restore(self, bot):
+        """Restores the last checkpoint into the bot.
+
+        Returns:
+            datetime: Last closed candle of the checkpoint, None if no
+            checkpoint exists.
+        """
+        state = self.load(bot)
+        if state is None:
+            return None
+
+        self.set_state(bot, state)
+
+        if self.logger:
+            self.logger.info(
+                f"Bot {bot.name} resumed from checkpoint at {bot.dt_ohlcv_closed}")
+
+        return bot.dt_ohlcv_closed
+
+    def step(self, bot):
+        """Counts a new closed candle and saves the bot state when due."""
+        self._nb_candles += 1
+        if self._nb_candles % self.every == 0:
+            self.save(bot)
@@ -7,12 +7,16 @@ import time
 
 from datetime import datetime, timedelta
 import ccxt
-import tqdm
 import pytz
 
 import pandas as pd
 from ..core import ObjMOSAIC
-from ..utils.data_management import timeframe_to_seconds
+from ..utils.data_management import \
+    compute_intrabar_quotes, \
+    INTRABAR_PATHS, \
+    timeframe_to_seconds
+from .ohlcv_store import OHLCVStore
+from .ohlcv_download import fetch_ohlcv_pages
 
 from textwrap import indent
 
@@ -25,6 +29,24 @@ PandasDataFrame = typing.TypeVar('pandas.core.frame.DataFrame')
 PandasSeries = typing.TypeVar('pandas.core.frame.Series')
 
 
+def date_to_timestamp(date):
+    """Converts a date (ms timestamp, datetime or ISO string) into UTC ms.
+
+    Naive ISO strings are considered as UTC dates.
+    """
+    if isinstance(date, int):
+        return date
+    elif isinstance(date, datetime):
+        return int(1000*date.timestamp())
+    elif isinstance(date, str):
+        dt = pd.Timestamp(date)
+        if dt.tzinfo is None:
+            dt = dt.tz_localize("UTC")
+        return int(1000*dt.timestamp())
+    else:
+        raise ValueError(f"Date of type {type(date)} not supported")
+
+
 class FeesRates(pydantic.BaseModel):
     taker: float = pydantic.Field(
         None, description="Taker fees (market orders)")
@@ -52,6 +74,11 @@ class ExchangeBase(ObjMOSAIC):
         {v: v for v in ["open", "high", "low", "close", "volume"]},
         description="OHLCV variable name dictionnary")
 
+    intrabar_path: str = pydantic.Field(
+        "OLH", description="Quotes visited within each candle when replaying OHLCV data: "
+        "'OLH', 'OLHC', 'OHLC' or 'direction' (low first in rising candles, high first in falling ones)",
+        user_input=list(INTRABAR_PATHS))
+
     bkd: typing.Any = pydantic.Field(
         None, description="Exchange backend")
 
@@ -92,23 +119,66 @@ class ExchangeBase(ObjMOSAIC):
         return self.portfolio.to_df().to_string()
 
     def flatten_ohlcv(self, ohlcv_df):
-        """ Transform OHLCV dataframe into a OHL vector to simulate live data.
+        """ Transform OHLCV dataframe into a quotes vector to simulate live data.
 
-        For each timestep, the vector contains opening quote value, then
-        low quote value and finally high quote value.
+        For each timestep, the vector contains the quotes of the exchange
+        intrabar path, by default opening quote value, then low quote
+        value and finally high quote value.
 
         Then the vector goes to the next timestep and so on.
+
+        The whole vector is built in memory: use `iter_ohlcv_ticks` to
+        replay quotes lazily.
         """
-        var_open = self.ohlcv_names.get("open", "open")
-        var_low = self.ohlcv_names.get("low", "low")
-        var_high = self.ohlcv_names.get("high", "high")
-        
-        quote_flatten_s = ohlcv_df[[
-            var_open, var_low, var_high,
-        ]].stack().rename("quote").reset_index(1, drop=True)
+        quotes = self.compute_intrabar_quotes(ohlcv_df)
+        quote_flatten_s = pd.Series(
+            quotes.ravel(),
+            index=ohlcv_df.index.repeat(quotes.shape[1]),
+            name="quote")
 
         return quote_flatten_s, ohlcv_df.shift(1)
 
+    def compute_intrabar_quotes(self, ohlcv_df, path=None):
+        """Intrabar quotes of OHLCV data, of shape (nb candles, nb quotes per candle).
+
+        Args:
+            ohlcv_df (pd.DataFrame): OHLCV data.
+            path (str): Intrabar path, the exchange `intrabar_path` by default.
+        """
+        path = path or self.intrabar_path
+        var_close = self.ohlcv_names.get("close", "close")
+
+        return compute_intrabar_quotes(
+            ohlcv_df[self.ohlcv_names.get("open", "open")].to_numpy(),
+            ohlcv_df[self.ohlcv_names.get("low", "low")].to_numpy(),
+            ohlcv_df[self.ohlcv_names.get("high", "high")].to_numpy(),
+            quote_close=ohlcv_df[var_close].to_numpy()
+            if var_close in ohlcv_df.columns else None,
+            path=path)
+
+    def iter_ohlcv_ticks(self, ohlcv_df, path=None, chunk_size=4096):
+        """Lazy intrabar quotes of OHLCV data to simulate live data.
+
+        Quotes are read from the OHLCV arrays by chunks of candles and
+        yielded as (datetime, quote) pairs, in the same order as
+        `flatten_ohlcv`, without building the whole quotes vector.
+        Candle timestamps are boxed once per candle.
+
+        Args:
+            ohlcv_df (pd.DataFrame): OHLCV data.
+            path (str): Intrabar path, the exchange `intrabar_path` by default.
+            chunk_size (int): Number of candles read at once.
+
+        Yields:
+            tuple: Candle timestamp and quote.
+        """
+        for idx_start in range(0, len(ohlcv_df), chunk_size):
+            ohlcv_chunk_df = ohlcv_df.iloc[idx_start:idx_start + chunk_size]
+            quotes = self.compute_intrabar_quotes(ohlcv_chunk_df, path=path)
+            for dt, candle_quotes in zip(ohlcv_chunk_df.index, quotes.tolist()):
+                for quote in candle_quotes:
+                    yield dt, quote
+
     def set_trading_fees(self, *args, **kwrds):
 
         if self.fees_rates.maker is None:
@@ -138,7 +208,10 @@ class ExchangeOnline(ExchangeBase):
 
 
 class ExchangeCCXT(ExchangeOnline):
-    
+
+    ohlcv_store: OHLCVStore = pydantic.Field(
+        None, description="Local OHLCV store used to serve historic data")
+
     def init_portfolio(self, assets_list):
         if self.portfolio_init_from_exchange:
             self.update_portfolio(assets_list)
@@ -389,15 +462,45 @@ class ExchangeCCXT(ExchangeOnline):
                            progress_mode=False,
                            fetching_pause=5,
                            fetching_max_tries=3,
+                           columns=None,
                            ):
+        """Get OHLCV data between two dates.
 
+        When the exchange has an `ohlcv_store`, data are served from the
+        local store and only the missing gaps are fetched from the
+        exchange. Otherwise, each request is cached in a bz2 CSV file in
+        `data_dir`.
+
+        Args:
+            columns (list): OHLCV columns to be returned (store only).
+        """
         # Get local time zone
         local_tz_name = get_localzone().key
         local_tz = pytz.timezone(local_tz_name)
 
         if date_end is None:
             date_end = local_tz.localize(datetime.now())
-        
+
+        if self.ohlcv_store:
+            ts_start = date_to_timestamp(date_start)
+            ts_end = date_to_timestamp(date_end)
+
+            def fetch_fun(ts_s, ts_e):
+                return self.fetch_historic_ohlcv(
+                    ts_s, ts_e,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    progress_mode=progress_mode,
+                    fetching_pause=fetching_pause,
+                    fetching_max_tries=fetching_max_tries)
+
+            ohlcv_df = self.ohlcv_store.get_ohlcv(
+                self.name, symbol, timeframe, ts_start, ts_end,
+                fetch_fun=fetch_fun if self.bkd else None,
+                columns=columns)
+
+            return self.format_ohlcv(ohlcv_df, index=index)
+
         source_filename = os.path.join(
             data_dir,
             f"ohlcv_{self.name}_{symbol.replace('/',':')}"\
@@ -422,109 +525,75 @@ class ExchangeCCXT(ExchangeOnline):
             self.logger.info(
                 "Fetching data from exchange")
         
-        if isinstance(date_start, int):
-            ts_start = date_start
-        elif isinstance(date_start, datetime):
-            ts_start = int(1000*date_start.timestamp())
-        elif isinstance(date_start, str):
-            ts_start = self.bkd.parse8601(date_start)
-        else:
-            raise ValueError(f"data_start of type {type(date_start)} not supported")
-
-        if isinstance(date_end, int):
-            ts_end = date_end
-        elif isinstance(date_end, datetime):
-            ts_end = int(1000*date_end.timestamp())
-        elif isinstance(date_end, str):
-            ts_end = self.bkd.parse8601(date_end)
-        else:
-            raise ValueError(f"data_end of type {type(date_end)} not supported")
-
-        # TODO: change to exchange static attribute
-        fetch_limit = 500
-
-        timedelta_sec = timeframe_to_seconds(timeframe)
-        timedelta_ms = 1000*timedelta_sec
+        ohlcv_df = self.fetch_historic_ohlcv(
+            date_to_timestamp(date_start),
+            date_to_timestamp(date_end),
+            symbol=symbol,
+            timeframe=timeframe,
+            progress_mode=progress_mode,
+            fetching_pause=fetching_pause,
+            fetching_max_tries=fetching_max_tries)
+
+        ohlcv_df = self.format_ohlcv(ohlcv_df, index=index)
+        
+        ohlcv_df.to_csv(source_filename,
+                        index=True)
+        
+        return ohlcv_df
 
-        fetch_limit_delta_ms = fetch_limit*timedelta_ms
-        period_range = \
-            range(ts_start, ts_end, fetch_limit_delta_ms)
+    def format_ohlcv(self, ohlcv_df, index="datetime"):
+        """Adds local timezone datetime to raw OHLCV data and sets index."""
+        # Get local time zone
+        local_tz = get_localzone()
 
-        ohlcv_var = ["timestamp", "open",
-                     "high", "low", "close", "volume"]
-        
-        ohlcv_df_list = []
-        for ts_s in tqdm.tqdm(period_range,
-                              disable=not progress_mode,
-                              desc=f"Fetching {symbol} OHLCV {timeframe} data"):
+        ohlcv_df = ohlcv_df.copy()
+        # Convert UTC timestamp to local timezone
+        ohlcv_df["datetime"] = \
+            pd.to_datetime(ohlcv_df["timestamp"].astype("int64"),
+                           unit="ms",
+                           utc=True).dt.tz_convert(local_tz)
 
-            ts_e = min(ts_s + fetch_limit_delta_ms,
-                       ts_end)
-            limit = (ts_e - ts_s)//timedelta_ms
+        return ohlcv_df.set_index(index)
 
-            dt_s = datetime.utcfromtimestamp(ts_s/1000)
-            dt_e = datetime.utcfromtimestamp(ts_e/1000)
+    def fetch_historic_ohlcv(self,
+                             ts_start,
+                             ts_end,
+                             symbol="BTC/USDT",
+                             timeframe="1h",
+                             progress_mode=False,
+                             fetching_pause=5,
+                             fetching_max_tries=3,
+                             max_workers=None,
+                             ):
+        """Fetch OHLCV pages from the exchange.
 
-            if self.logger:
-                self.logger.debug(
-                    f"Fetch {timeframe} {symbol} data between {dt_s} and {dt_e}")
-
-            fetching_done = False
-            nb_fetch_tries = 0
-            while not fetching_done:
-                try:
-                    ohlcv = self.bkd.fetch_ohlcv(symbol,
-                                                 timeframe=timeframe,
-                                                 since=ts_s,
-                                                 limit=limit)
-                    # NOTE : We decide to drop na value while getting historical data
-                    ohlcv_cur_df = pd.DataFrame(ohlcv, columns=ohlcv_var)
-                    # assert ts_s == ohlcv_cur_df["timestamp"].iloc[0]
-
-                except Exception as e:
-                    nb_fetch_tries += 1
-                    if nb_fetch_tries >= fetching_max_tries:
-                        if self.logger:
-                            self.logger.info(
-                                f"Fetching OHLCV problem {e} : failed after {fetching_max_tries} attemps")
-                            raise ValueError(f"Fetching OHLCV problem : failed after {fetching_max_tries} attemps")
-                    else:
-                        if self.logger:
-                            self.logger.info(
-                                f"Fetching failed (try {nb_fetch_tries}): retry in {fetching_pause} seconds")
-                            time.sleep(fetching_pause)
-
-                else:
-                    nb_fetch_tries = 0
-                    fetching_done = True
-
-            # Convert UTC timestamp to local timezone
-            ohlcv_cur_df["datetime"] = \
-                pd.to_datetime(ohlcv_cur_df["timestamp"],
-                               unit="ms",
-                               utc=True).dt.tz_convert(local_tz)
-            # Convert local tz datetime to local timestamp
-            ohlcv_cur_df["timestamp"] = \
-                (ohlcv_cur_df["datetime"].astype(int)/1e6).astype(int)
-
-            idx_na = ohlcv_cur_df.isna().any(axis=1)
-            nb_na = idx_na.sum()
-            if self.logger and nb_na > 0:
-                na_dt = ", ".join(ohlcv_cur_df.loc[idx_na, "datetime"].to_list())
-                self.logger.warning(f"Drop {nb_na} NAs")
-                self.logger.debug(f"NA datetimes {na_dt}")
+        Pages are requested concurrently (see `fetch_ohlcv_pages`),
+        `fetching_pause` being the base delay of the retries exponential
+        backoff.
 
-            if self.logger:
-                self.logger.debug(ohlcv_cur_df)
+        Returns:
+            pd.DataFrame: Candles in [ts_start, ts_end) with timestamp in
+            UTC ms.
+        """
+        # TODO: change to exchange static attribute
+        fetch_limit = 500
 
-            ohlcv_df_list.append(ohlcv_cur_df)
+        ohlcv_df, stats = fetch_ohlcv_pages(
+            self.bkd, symbol, timeframe, ts_start, ts_end,
+            fetch_limit=fetch_limit,
+            max_workers=max_workers,
+            max_tries=fetching_max_tries,
+            backoff_base=fetching_pause,
+            progress_mode=progress_mode,
+            logger=self.logger)
+
+        idx_na = ohlcv_df.isna().any(axis=1)
+        nb_na = idx_na.sum()
+        if self.logger and nb_na > 0:
+            na_ts = ", ".join(ohlcv_df.loc[idx_na, "timestamp"].astype(str))
+            self.logger.warning(f"{nb_na} NAs in fetched data")
+            self.logger.debug(f"NA timestamps {na_ts}")
 
-        ohlcv_df = pd.concat(
-            ohlcv_df_list, axis=0, ignore_index=True).set_index(index)
-        
-        ohlcv_df.to_csv(source_filename,
-                        index=True)
-        
         return ohlcv_df
 
     def get_next_historic_ohlcv(self,
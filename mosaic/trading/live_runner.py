@@ -0,0 +1,158 @@
+import time
+import asyncio
+import concurrent.futures
+import pkg_resources
+
+from .candle_feed import CandleFeed
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class LiveRunner:
+    """Runs many live bots in one process on an asyncio event loop.
+
+    Bots trading the same (exchange, symbol, timeframe) share one
+    `CandleFeed` and bots of the same exchange share one exchange
+    connection. A single scheduler sleeps until the next candle close of
+    any feed, updates the closed feeds concurrently, then runs the
+    `live_step` of their bots concurrently. Blocking exchange calls and
+    bot steps run in a thread pool so that they do not block the event
+    loop.
+
+    Attributes:
+        bots (list): Bots in 'live' or 'livetest' mode.
+        fetch_delay (float): Delay (s) after candle close before fetching,
+            leaving the exchange time to close the candle.
+        max_workers (int): Thread pool size (None for the default size).
+        clock (callable): Current timestamp (ms) function.
+        sleep (callable): Coroutine function sleeping a number of seconds.
+        logger: Logger.
+    """
+
+    def __init__(self, bots, fetch_delay=1., max_workers=None,
+                 clock=None, sleep=None, logger=None):
+        self.bots = list(bots)
+        self.fetch_delay = fetch_delay
+        self.max_workers = max_workers
+        self.clock = clock or (lambda: int(1000*time.time()))
+        self.sleep = sleep or asyncio.sleep
+        self.logger = logger
+        self.stopped = False
+        self.feeds = {}
+        self.connections = {}
+
+        for bot in self.bots:
+            if not (bot.mode in ["live", "livetest"]):
+                raise ValueError(
+                    f"Bot {bot.name} mode {bot.mode} not supported by live runner: "
+                    "mode must be 'live' or 'livetest'")
+            self.add_bot(bot)
+
+    def add_bot(self, bot):
+        """Attach a bot to its exchange connection and candle feed."""
+        exchange_name = bot.exchange.name
+        if exchange_name in self.connections:
+            bot.exchange.bkd = self.connections[exchange_name]
+        else:
+            if bot.exchange.bkd is None:
+                bot.exchange.connect()
+            self.connections[exchange_name] = bot.exchange.bkd
+
+        feed_key = (exchange_name, bot.symbol, bot.timeframe)
+        if not (feed_key in self.feeds):
+            self.feeds[feed_key] = \
+                CandleFeed(bot.exchange, bot.symbol, bot.timeframe)
+        feed = self.feeds[feed_key]
+        feed.bots.append(bot)
+        # Closed candles needed by the bots decision models
+        feed.nb_closed = max(feed.nb_closed,
+                             bot.decision_model.bw_length + 1)
+
+    def stop(self):
+        """Stops the runner at the next wake-up."""
+        self.stopped = True
+
+    def run(self, nb_wakeups=None, **kwrds):
+        """Run the bots until stopped (see `run_async`)."""
+        return asyncio.run(self.run_async(nb_wakeups=nb_wakeups, **kwrds))
+
+    async def run_async(self, nb_wakeups=None, **kwrds):
+        """Run the bots until stopped.
+
+        Args:
+            nb_wakeups (int): Stop after this number of candle close
+                wake-ups (the initial update included). None runs forever.
+            **kwrds: Keyword arguments passed to bots `start_session` and
+                `live_step` (e.g. `resume=True` to resume bots from their
+                last checkpoint).
+        """
+        loop = asyncio.get_running_loop()
+        self.stopped = False
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers) as executor:
+
+            await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor, lambda bot=bot: self.start_bot(bot, **kwrds))
+                for bot in self.bots))
+
+            feeds_due = list(self.feeds.values())
+            nb_it = 0
+            while feeds_due and not self.stopped:
+                await asyncio.gather(*(
+                    self.process_feed(feed, executor, **kwrds)
+                    for feed in feeds_due))
+
+                nb_it += 1
+                if nb_wakeups is not None and nb_it >= nb_wakeups:
+                    break
+
+                feeds = [feed for feed in self.feeds.values() if feed.bots]
+                if not feeds:
+                    break
+
+                ts_wakeup = min(feed.ts_next for feed in feeds)
+                await self.sleep(
+                    max(0, ts_wakeup + 1000*self.fetch_delay - self.clock())/1000)
+                feeds_due = [feed for feed in feeds
+                             if feed.ts_next <= ts_wakeup]
+
+        for bot in self.bots:
+            if bot.status == "started":
+                bot.finish()
+
+    def start_bot(self, bot, **kwrds):
+        bot.start_session(**kwrds)
+        if bot.dt_resume is None:
+            bot.dt_ohlcv_closed = None
+
+    async def process_feed(self, feed, executor, **kwrds):
+        """Update feed candles and run its bots step."""
+        loop = asyncio.get_running_loop()
+        feed.update_ts_next(self.clock())
+
+        try:
+            await loop.run_in_executor(executor, feed.update)
+            ohlcv_df = feed.ohlcv_df
+        except Exception as e:
+            # Feed is updated again at the next candle close
+            if self.logger:
+                self.logger.error(
+                    f"Fetching {feed.symbol} {feed.timeframe} candles failed: {e}")
+            return
+
+        await asyncio.gather(*(
+            loop.run_in_executor(
+                executor,
+                lambda bot=bot: self.step_bot(feed, bot, ohlcv_df, **kwrds))
+            for bot in list(feed.bots)))
+
+    def step_bot(self, feed, bot, ohlcv_df, **kwrds):
+        try:
+            bot.live_step(ohlcv_df, **kwrds)
+        except Exception as e:
+            feed.bots.remove(bot)
+            bot.abort(f"Live step failed: {e}")
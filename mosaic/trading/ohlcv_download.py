@@ -0,0 +1,168 @@
+import math
+import time
+import random
+import threading
+import concurrent.futures
+import ccxt
+import pandas as pd
+import tqdm
+from ..utils.data_management import timeframe_to_seconds
+
+import pkg_resources
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+OHLCV_VAR = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Expected duration of one page request, used to size the workers pool
+REQUEST_LATENCY_MS = 1000
+
+MAX_WORKERS = 16
+
+# Transient backend errors worth retrying a page request for
+RETRY_EXCEPTIONS = (ccxt.NetworkError, ccxt.RateLimitExceeded)
+
+
+class RateLimiter:
+    """Spaces requests issued from several threads by a minimal delay."""
+
+    def __init__(self, delay_ms):
+        self.delay = delay_ms/1000
+        self.ts_next = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            ts_now = time.monotonic()
+            ts_request = max(ts_now, self.ts_next)
+            self.ts_next = ts_request + self.delay
+
+        time.sleep(max(0, ts_request - ts_now))
+
+
+def compute_max_workers(rate_limit_ms):
+    """Number of concurrent requests needed to saturate the exchange rate limit."""
+    if not rate_limit_ms:
+        return MAX_WORKERS
+    return max(1, min(MAX_WORKERS,
+                      math.ceil(REQUEST_LATENCY_MS/rate_limit_ms)))
+
+
+def compute_backoff(nb_tries, backoff_base=1, backoff_max=30):
+    """Exponential backoff delay with full jitter (seconds)."""
+    return random.uniform(0, min(backoff_max, backoff_base*2**(nb_tries - 1)))
+
+
+def fetch_ohlcv_pages(bkd,
+                      symbol,
+                      timeframe,
+                      ts_start,
+                      ts_end,
+                      fetch_limit=500,
+                      max_workers=None,
+                      max_tries=3,
+                      backoff_base=1,
+                      backoff_max=30,
+                      retry_exceptions=RETRY_EXCEPTIONS,
+                      progress_mode=False,
+                      logger=None):
+    """Fetch OHLCV candles in [ts_start, ts_end) with concurrent page requests.
+
+    Pages of `fetch_limit` candles are requested concurrently from a thread
+    pool sized from the backend `rateLimit` (ms between two requests),
+    requests being spaced by this rate limit. Failed requests are retried
+    with exponential backoff and jitter when they fail with a transient
+    error, other errors being raised at once. Pages are merged, de-duplicated and
+    sorted by timestamp.
+
+    Args:
+        bkd: ccxt like exchange backend providing `fetch_ohlcv`.
+        max_workers (int): Number of concurrent requests. Defaults to the
+            number needed to saturate the backend rate limit.
+        max_tries (int): Maximum number of attempts per page.
+        backoff_base (float): Backoff delay base (seconds).
+        backoff_max (float): Maximum backoff delay (seconds).
+        retry_exceptions (tuple): Exception classes of retried requests.
+
+    Returns:
+        (pd.DataFrame, dict): Candles with timestamp in UTC ms, and download
+        statistics (pages, candles, retries, duration and throughput).
+    """
+    timedelta_ms = 1000*timeframe_to_seconds(timeframe)
+    fetch_limit_delta_ms = fetch_limit*timedelta_ms
+
+    pages = [(ts_s, (min(ts_s + fetch_limit_delta_ms, ts_end) - ts_s)//timedelta_ms)
+             for ts_s in range(ts_start, ts_end, fetch_limit_delta_ms)]
+    pages = [(ts_s, limit) for ts_s, limit in pages if limit > 0]
+
+    rate_limit_ms = getattr(bkd, "rateLimit", 0)
+    if max_workers is None:
+        max_workers = compute_max_workers(rate_limit_ms)
+
+    rate_limiter = RateLimiter(rate_limit_ms or 0)
+    stats = {"nb_pages": len(pages), "nb_retries": 0}
+    stats_lock = threading.Lock()
+
+    def fetch_page(ts_s, limit):
+        nb_tries = 0
+        while True:
+            rate_limiter.wait()
+            try:
+                return bkd.fetch_ohlcv(symbol,
+                                       timeframe=timeframe,
+                                       since=ts_s,
+                                       limit=limit)
+            except retry_exceptions as e:
+                nb_tries += 1
+                if nb_tries >= max_tries:
+                    raise ValueError(
+                        f"Fetching OHLCV problem {e} : failed after {max_tries} attemps") from e
+                with stats_lock:
+                    stats["nb_retries"] += 1
+                backoff = compute_backoff(nb_tries,
+                                          backoff_base=backoff_base,
+                                          backoff_max=backoff_max)
+                if logger:
+                    logger.info(
+                        f"Fetching failed (try {nb_tries}): retry in {backoff:.2f} seconds")
+                time.sleep(backoff)
+
+    time_start = time.perf_counter()
+
+    ohlcv_list = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) \
+            as executor:
+        futures = [executor.submit(fetch_page, ts_s, limit)
+                   for ts_s, limit in pages]
+        for future in tqdm.tqdm(concurrent.futures.as_completed(futures),
+                                total=len(futures),
+                                disable=not progress_mode,
+                                desc=f"Fetching {symbol} OHLCV {timeframe} data"):
+            ohlcv_list.extend(future.result())
+
+    ohlcv_df = pd.DataFrame(ohlcv_list, columns=OHLCV_VAR, dtype=float)\
+                 .astype({"timestamp": "int64"})
+    ohlcv_df = ohlcv_df[(ohlcv_df["timestamp"] >= ts_start) &
+                        (ohlcv_df["timestamp"] < ts_end)]\
+        .drop_duplicates("timestamp", keep="last")\
+        .sort_values("timestamp")\
+        .reset_index(drop=True)
+
+    duration = time.perf_counter() - time_start
+    stats.update(
+        nb_candles=len(ohlcv_df),
+        nb_workers=max_workers,
+        duration=duration,
+        pages_per_sec=len(pages)/duration if duration > 0 else math.inf,
+        candles_per_sec=len(ohlcv_df)/duration if duration > 0 else math.inf,
+    )
+
+    if logger:
+        logger.info(
+            f"Fetched {stats['nb_candles']} {symbol} {timeframe} candles "
+            f"({stats['nb_pages']} pages, {stats['nb_retries']} retries) in "
+            f"{duration:.2f}s with {max_workers} workers: "
+            f"{stats['candles_per_sec']:.0f} candles/s")
+
+    return ohlcv_df, stats
@@ -0,0 +1,218 @@
+import os
+import json
+import pydantic
+import typing
+import pandas as pd
+from ..core import ObjMOSAIC
+from ..utils.data_management import timeframe_to_seconds
+
+import pkg_resources
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+OHLCV_STORE_VAR = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+class OHLCVStore(ObjMOSAIC):
+    """Local OHLCV store partitioned by exchange/symbol/timeframe/month.
+
+    Candles are stored in Parquet files, one per UTC month:
+    `<root_dir>/<exchange>/<symbol>/<timeframe>/<YYYY-MM>.parquet`, with
+    timestamps in UTC milliseconds. Each timeframe directory also holds a
+    `coverage.json` file listing the [start, end) timestamp intervals
+    already fetched from the exchange. Only the missing gaps of a request
+    are fetched, then any sub-range can be read back with column
+    projection.
+    """
+
+    root_dir: str = pydantic.Field(
+        "ohlcv_store", description="Store root directory")
+
+    logger: typing.Any = pydantic.Field(
+        None, description="Logger")
+
+    def dict(self, **kwrds):
+
+        if kwrds.get("exclude"):
+            kwrds["exclude"].add("logger")
+        else:
+            kwrds["exclude"] = {"logger"}
+
+        return super().dict(**kwrds)
+
+    def partition_dir(self, exchange, symbol, timeframe):
+        return os.path.join(self.root_dir,
+                            exchange,
+                            symbol.replace('/', ':'),
+                            timeframe)
+
+    def partition_filename(self, exchange, symbol, timeframe, month):
+        return os.path.join(self.partition_dir(exchange, symbol, timeframe),
+                            f"{month}.parquet")
+
+    def coverage_filename(self, exchange, symbol, timeframe):
+        return os.path.join(self.partition_dir(exchange, symbol, timeframe),
+                            "coverage.json")
+
+    def get_coverage(self, exchange, symbol, timeframe):
+        """Returns the sorted list of covered [start, end) intervals (ms)."""
+        coverage_filename = \
+            self.coverage_filename(exchange, symbol, timeframe)
+        if not os.path.exists(coverage_filename):
+            return []
+
+        with open(coverage_filename, "r") as coverage_file:
+            return [tuple(interval)
+                    for interval in json.load(coverage_file)["intervals"]]
+
+    def add_coverage(self, exchange, symbol, timeframe, ts_start, ts_end):
+        """Adds a [start, end) interval to the coverage and merges overlaps."""
+        if ts_end <= ts_start:
+            return
+
+        intervals = sorted(
+            self.get_coverage(exchange, symbol, timeframe) +
+            [(ts_start, ts_end)])
+
+        intervals_merged = [list(intervals[0])]
+        for ts_s, ts_e in intervals[1:]:
+            if ts_s <= intervals_merged[-1][1]:
+                intervals_merged[-1][1] = max(intervals_merged[-1][1], ts_e)
+            else:
+                intervals_merged.append([ts_s, ts_e])
+
+        coverage_filename = \
+            self.coverage_filename(exchange, symbol, timeframe)
+        os.makedirs(os.path.dirname(coverage_filename), exist_ok=True)
+        with open(coverage_filename, "w") as coverage_file:
+            json.dump({"intervals": intervals_merged}, coverage_file)
+
+    def find_gaps(self, exchange, symbol, timeframe, ts_start, ts_end):
+        """Returns the [start, end) intervals of a request not covered yet."""
+        gaps = []
+        ts_cur = ts_start
+        for ts_s, ts_e in self.get_coverage(exchange, symbol, timeframe):
+            if ts_e <= ts_cur:
+                continue
+            if ts_s >= ts_end:
+                break
+            if ts_s > ts_cur:
+                gaps.append((ts_cur, ts_s))
+            ts_cur = max(ts_cur, ts_e)
+
+        if ts_cur < ts_end:
+            gaps.append((ts_cur, ts_end))
+
+        return gaps
+
+    @staticmethod
+    def month_range(ts_start, ts_end):
+        """UTC months (YYYY-MM) intersecting [ts_start, ts_end)."""
+        if ts_end <= ts_start:
+            return []
+        return pd.period_range(
+            pd.Timestamp(ts_start, unit="ms").to_period("M"),
+            pd.Timestamp(ts_end - 1, unit="ms").to_period("M"),
+            freq="M").strftime("%Y-%m").to_list()
+
+    def write(self, exchange, symbol, timeframe, ohlcv_df):
+        """Merges OHLCV data (timestamp in UTC ms) into month partitions."""
+        if len(ohlcv_df) == 0:
+            return
+
+        if not ('pyarrow' in installed_pkg):
+            raise ModuleNotFoundError(
+                "Please install pyarrow to use OHLCV store : pip install pyarrow")
+
+        ohlcv_df = ohlcv_df[OHLCV_STORE_VAR]
+        months = pd.to_datetime(ohlcv_df["timestamp"], unit="ms")\
+                   .dt.strftime("%Y-%m")
+        for month, ohlcv_month_df in ohlcv_df.groupby(months):
+            partition_filename = \
+                self.partition_filename(exchange, symbol, timeframe, month)
+
+            if os.path.exists(partition_filename):
+                ohlcv_month_df = pd.concat(
+                    [pd.read_parquet(partition_filename), ohlcv_month_df],
+                    axis=0, ignore_index=True)
+
+            ohlcv_month_df = \
+                ohlcv_month_df.drop_duplicates("timestamp", keep="last")\
+                              .sort_values("timestamp")\
+                              .reset_index(drop=True)
+
+            os.makedirs(os.path.dirname(partition_filename), exist_ok=True)
+            ohlcv_month_df.to_parquet(partition_filename, index=False)
+
+    def read(self, exchange, symbol, timeframe, ts_start, ts_end,
+             columns=None):
+        """Reads stored candles with timestamp in [ts_start, ts_end).
+
+        Args:
+            columns (list): OHLCV columns to be read (all by default). The
+                timestamp column is always returned.
+
+        Returns:
+            pd.DataFrame: Candles with timestamp in UTC ms.
+        """
+        columns_read = ["timestamp"] + \
+            [var for var in (columns or OHLCV_STORE_VAR[1:])
+             if var != "timestamp"]
+
+        ohlcv_df_list = []
+        for month in self.month_range(ts_start, ts_end):
+            partition_filename = \
+                self.partition_filename(exchange, symbol, timeframe, month)
+            if not os.path.exists(partition_filename):
+                continue
+
+            ohlcv_df_list.append(pd.read_parquet(
+                partition_filename,
+                columns=columns_read,
+                filters=[("timestamp", ">=", ts_start),
+                         ("timestamp", "<", ts_end)]))
+
+        if len(ohlcv_df_list) == 0:
+            return pd.DataFrame(columns=columns_read)
+
+        return pd.concat(ohlcv_df_list, axis=0, ignore_index=True)
+
+    def get_ohlcv(self, exchange, symbol, timeframe, ts_start, ts_end,
+                  fetch_fun=None, ts_now=None, columns=None):
+        """Reads candles in [ts_start, ts_end), fetching missing gaps first.
+
+        Args:
+            fetch_fun (callable): Function (ts_start, ts_end) -> pd.DataFrame
+                fetching candles from the exchange. Without fetching
+                function, only stored candles are returned.
+            ts_now (int): Current timestamp (ms). Coverage is only recorded
+                up to the last closed candle. Defaults to now.
+            columns (list): OHLCV columns to be read.
+
+        Returns:
+            pd.DataFrame: Candles with timestamp in UTC ms.
+        """
+        if fetch_fun:
+            timedelta_ms = 1000*timeframe_to_seconds(timeframe)
+            if ts_now is None:
+                ts_now = int(1000*pd.Timestamp.now(tz="UTC").timestamp())
+            ts_closed = ts_now - ts_now % timedelta_ms
+
+            for ts_s, ts_e in self.find_gaps(exchange, symbol, timeframe,
+                                             ts_start, ts_end):
+                if self.logger:
+                    self.logger.info(
+                        f"Fetch {timeframe} {symbol} data gap "
+                        f"{pd.Timestamp(ts_s, unit='ms')} -> "
+                        f"{pd.Timestamp(ts_e, unit='ms')}")
+
+                ohlcv_df = fetch_fun(ts_s, ts_e)
+                # Only closed candles are stored
+                ohlcv_df = ohlcv_df[ohlcv_df["timestamp"] < ts_closed]
+                self.write(exchange, symbol, timeframe, ohlcv_df)
+                self.add_coverage(exchange, symbol, timeframe,
+                                  ts_s, min(ts_e, ts_closed))
+
+        return self.read(exchange, symbol, timeframe, ts_start, ts_end,
+                         columns=columns)
@@ -0,0 +1,112 @@
+import bisect
+import collections
+import math
+import pkg_resources
+
+from .orders import OrderBase
+from .sim_objects import SimOrder
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+def has_fixed_exec_bound(od):
+    """Indicates if an order executes as soon as its fixed price bound is crossed.
+
+    It is the case of orders keeping the base order update and execution
+    conditions, once their execution price is known.
+    """
+    if isinstance(od, SimOrder):
+        return not od.trailing and od.quote_price_exec is not None
+
+    return type(od).update is OrderBase.update and \
+        type(od).is_executable is OrderBase.is_executable and \
+        od.quote_price_exec is not None
+
+
+class OrderBook:
+    """Per-side order counters and open orders indexes of a bot.
+
+    The book wraps the bot `orders_open` and `orders_executed` dicts, which
+    remain the orders storage. It keeps the number of open and executed
+    orders by side, and indexes open orders with a fixed execution bound
+    by side and bound price: at each tick, only the buy orders whose bound
+    is above the quote, the sell orders whose bound is below the quote and
+    the orders without fixed bound (e.g. trailing orders) are checked.
+
+    Attributes:
+        orders_open (dict): Bot open orders.
+        orders_executed (dict): Bot executed orders.
+        nb_open (collections.Counter): Number of open orders by side.
+        nb_executed (collections.Counter): Number of executed orders by side.
+    """
+
+    def __init__(self, orders_open, orders_executed):
+        self.orders_open = orders_open
+        self.orders_executed = orders_executed
+        self.nb_open = collections.Counter()
+        self.nb_executed = collections.Counter()
+        # Open orders placing sequence, giving the order of checks
+        self.seq_next = 0
+        self.seq = {}
+        # Sorted (bound, seq, uid) open orders by side
+        self.bounds = {"buy": [], "sell": []}
+        # Open orders checked at each tick: uid -> seq
+        self.unindexed = {}
+
+        for uid, od in orders_open.items():
+            self.add_open(uid, od)
+        for od in orders_executed.values():
+            self.nb_executed[od.side] += 1
+
+    def is_synced(self, orders_open, orders_executed):
+        """Indicates if the book still matches the bot orders dicts."""
+        return orders_open is self.orders_open and \
+            orders_executed is self.orders_executed and \
+            len(orders_open) == len(self.seq) and \
+            len(orders_executed) == sum(self.nb_executed.values())
+
+    def add_open(self, uid, od):
+        """Registers an order added to the open orders."""
+        self.nb_open[od.side] += 1
+        self.seq[uid] = self.seq_next
+        self.seq_next += 1
+        self.index_open(uid, od)
+
+    def index_open(self, uid, od):
+        if has_fixed_exec_bound(od) and od.side in self.bounds:
+            bisect.insort(self.bounds[od.side],
+                          (od.quote_price_exec, self.seq[uid], uid))
+        else:
+            self.unindexed[uid] = self.seq[uid]
+
+    def set_executed(self, uid, od):
+        """Registers an open order moved to the executed orders."""
+        self.nb_open[od.side] -= 1
+        self.nb_executed[od.side] += 1
+        del self.seq[uid]
+
+    def pop_orders_to_check(self, quote_price):
+        """Open orders that may be executed at a quote price.
+
+        Returned orders are removed from the indexes: orders still open
+        after being checked must be indexed again with `index_open`.
+
+        Returns:
+            list: (uid, order) pairs in placing order.
+        """
+        bounds_buy = self.bounds["buy"]
+        idx_buy = bisect.bisect_left(bounds_buy, (quote_price,))
+        bounds_sell = self.bounds["sell"]
+        idx_sell = bisect.bisect_right(bounds_sell, (quote_price, math.inf))
+
+        to_check = [(seq, uid) for _, seq, uid in bounds_buy[idx_buy:]] + \
+            [(seq, uid) for _, seq, uid in bounds_sell[:idx_sell]] + \
+            [(seq, uid) for uid, seq in self.unindexed.items()]
+
+        del bounds_buy[idx_buy:]
+        del bounds_sell[:idx_sell]
+        self.unindexed = {}
+
+        return [(uid, self.orders_open[uid]) for _, uid in sorted(to_check)]
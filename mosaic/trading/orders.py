@@ -31,7 +31,109 @@ class OrderParams(HyperParams):
         0, description="Execution minimal bound rate")
 
 
-class OrderBase(ObjMOSAIC):
+class OrderExecMixin:
+    """Execution arithmetic of market orders.
+
+    Shared by the pydantic orders and the simulation orders
+    (`sim_objects.SimOrder`), which only need to provide the order
+    attributes (side, amounts, quotes, dates and params).
+    """
+
+    __slots__ = ()
+
+    def update_exec_bound(self):
+
+        if self.quote_price_at_create is None:
+            self.quote_price_at_create = self.quote_price
+
+        if self.quote_price_at_create is not None:
+            sign = 2*(self.side == "buy") - 1
+            self.quote_price_exec = \
+                self.quote_price_at_create*(1 - sign*self.params.exec_bound_rate)
+        if self.quote_price is not None:
+            self.quote_price_rate_open_exec = \
+                self.quote_price/self.quote_price_at_create - 1
+
+    def is_exec_bound_crossed(self):
+
+        exec_bound_cond = \
+            self.quote_price <= self.quote_price_exec \
+            if self.side == "buy" \
+            else self.quote_price >= self.quote_price_exec
+
+        exec_dt_cond = self.dt_open <= self.dt
+
+        return exec_dt_cond & exec_bound_cond
+
+    def fill_market_amounts(self):
+
+        if self.side == "buy":
+            self.base_amount = \
+                self.quote_amount/self.quote_price
+        elif self.side == "sell":
+            self.quote_amount = \
+                self.base_amount*self.quote_price
+
+    def apply_taker_fees(self, fees_rate):
+        """Deduces taker fees from the received amount.
+
+        Returns:
+            (float, str): Fees value and fees asset.
+        """
+        if self.side == "buy":
+            fees_value = self.base_amount*fees_rate
+            self.base_amount -= fees_value
+            return fees_value, self.base
+        elif self.side == "sell":
+            fees_value = self.quote_amount*fees_rate
+            self.quote_amount -= fees_value
+            return fees_value, self.quote
+
+        return None, None
+
+
+class OrderTrailingExecMixin(OrderExecMixin):
+    """Execution arithmetic of trailing market orders."""
+
+    __slots__ = ()
+
+    def update_trailing_bound(self):
+
+        if self.params.exec_trailing_rate is None:
+            self.params.exec_trailing_rate = self.params.exec_bound_rate
+
+        sign = 2*(self.side == "buy") - 1
+
+        if (not self.is_trailing_activated) and \
+           (self.quote_price_at_create is not None) and \
+           self.is_exec_bound_crossed():
+            self.is_trailing_activated = True
+            self.quote_price_trailing_bound = \
+                self.quote_price*(1 + sign*self.params.exec_trailing_rate)
+
+        if self.quote_price_trailing_bound is not None:
+
+            quote_price_trailing_bound_th = \
+                self.quote_price*(1 + sign*self.params.exec_trailing_rate)
+
+            if self.side == "buy":
+                if self.quote_price_trailing_bound > quote_price_trailing_bound_th:
+                    self.quote_price_trailing_bound = quote_price_trailing_bound_th
+            else:
+                if self.quote_price_trailing_bound < quote_price_trailing_bound_th:
+                    self.quote_price_trailing_bound = quote_price_trailing_bound_th
+
+    def is_trailing_bound_crossed(self):
+
+        if not self.is_trailing_activated:
+            return False
+
+        return self.quote_price >= self.quote_price_trailing_bound \
+            if self.side == "buy" \
+            else self.quote_price <= self.quote_price_trailing_bound
+
+
+class OrderBase(ObjMOSAIC, OrderExecMixin):
 
     uid: str = pydantic.Field(None,
                               description="Unique id of the trade")
@@ -125,16 +227,7 @@ class OrderBase(ObjMOSAIC):
             for field, value in new_data.items():
                 setattr(self, field, value)
 
-        if self.quote_price_at_create is None:
-            self.quote_price_at_create = self.quote_price
-
-        if self.quote_price_at_create is not None:
-            sign = 2*(self.side == "buy") - 1
-            self.quote_price_exec = \
-                self.quote_price_at_create*(1 - sign*self.params.exec_bound_rate)
-        if self.quote_price is not None:
-            self.quote_price_rate_open_exec = \
-                self.quote_price/self.quote_price_at_create - 1
+        self.update_exec_bound()
 
 
     def dict(self, exclude={"bkd", "db", "logger"}, **kwrds):
@@ -233,15 +326,7 @@ class OrderBase(ObjMOSAIC):
         return repr_str
 
     def is_executable(self):
-
-        exec_bound_cond = \
-            self.quote_price <= self.quote_price_exec \
-            if self.side == "buy" \
-            else self.quote_price >= self.quote_price_exec
-
-        exec_dt_cond = self.dt_open <= self.dt
-
-        return exec_dt_cond & exec_bound_cond
+        return self.is_exec_bound_crossed()
 
     def get_default_style(self):
         return colored.attr("bold") + \
@@ -337,12 +422,7 @@ class OrderMarket(OrderBase):
 
         super().execute()
 
-        if self.side == "buy":
-            self.base_amount = \
-                self.quote_amount/self.quote_price
-        elif self.side == "sell":
-            self.quote_amount = \
-                self.base_amount*self.quote_price
+        self.fill_market_amounts()
             
         if not self.test_mode:
             
@@ -376,14 +456,9 @@ class OrderMarket(OrderBase):
             self.status = "executed"
 
         else:
-            if self.side == "buy":
-                self.fees.value = self.base_amount*self.bkd.fees_rates.taker
-                self.fees.asset = self.base
-                self.base_amount -= self.fees.value
-            elif self.side == "sell":
-                self.fees.value = self.quote_amount*self.bkd.fees_rates.taker
-                self.fees.asset = self.quote
-                self.quote_amount -= self.fees.value
+            if self.side in ("buy", "sell"):
+                self.fees.value, self.fees.asset = \
+                    self.apply_taker_fees(self.bkd.fees_rates.taker)
 
             self.dt_closed = self.dt
             self.status = "executed"
@@ -399,7 +474,7 @@ class OrderTrailingMarketParams(OrderParams):
         None, description="Execution trailing rate")
 
 
-class OrderTrailingMarket(OrderMarket):
+class OrderTrailingMarket(OrderMarket, OrderTrailingExecMixin):
 
     is_trailing_activated: bool = pydantic.Field(
         False, description="Indicate if order is in trailing mode")
@@ -435,37 +510,7 @@ class OrderTrailingMarket(OrderMarket):
 
         super().update(**new_data)
 
-        if self.params.exec_trailing_rate is None:
-            self.params.exec_trailing_rate = self.params.exec_bound_rate
-        
-        if (not self.is_trailing_activated) and \
-           (self.quote_price_at_create is not None) and \
-           super().is_executable():
-            self.is_trailing_activated = True
-            sign = 2*(self.side == "buy") - 1
-            self.quote_price_trailing_bound = \
-                self.quote_price*(1 + sign*self.params.exec_trailing_rate)
-
-        if self.quote_price_trailing_bound is not None:
-
-            sign = 2*(self.side == "buy") - 1
-            quote_price_trailing_bound_th = \
-                self.quote_price*(1 + sign*self.params.exec_trailing_rate)
-
-            if self.side == "buy":
-                if self.quote_price_trailing_bound > quote_price_trailing_bound_th:
-                    self.quote_price_trailing_bound = quote_price_trailing_bound_th
-            else:
-                if self.quote_price_trailing_bound < quote_price_trailing_bound_th:
-                    self.quote_price_trailing_bound = quote_price_trailing_bound_th
+        self.update_trailing_bound()
 
     def is_executable(self):
-        if self.is_trailing_activated:
-            exec_order = \
-                self.quote_price >= self.quote_price_trailing_bound \
-                if self.side == "buy" \
-                else self.quote_price <= self.quote_price_trailing_bound
-        else:
-            exec_order = False
-            
-        return exec_order
+        return self.is_trailing_bound_crossed()
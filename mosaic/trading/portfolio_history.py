@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pkg_resources
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class PortfolioHistory:
+    """Array-backed portfolio states history of a trading session.
+
+    States are written into preallocated NumPy chunks: a new chunk is
+    allocated when the current one is full, so that recording never
+    copies previous states. One state is kept per timestamp: recording a
+    state at the timestamp of the last one replaces it (e.g. the
+    intrabar quotes of a btclassic candle).
+
+    Attributes:
+        chunk_size (int): Number of states per chunk.
+        tz (tzinfo): Time zone of recorded timestamps.
+    """
+
+    variables = ["quote_price", "quote_amount", "base_amount",
+                 "quote_value", "performance"]
+
+    def __init__(self, chunk_size=4096):
+        self.chunk_size = chunk_size
+        self.reset()
+
+    def reset(self):
+        self.tz = None
+        self.chunks = []
+        # Number of states in the last chunk
+        self.chunk_len = chunk_size = self.chunk_size
+        self.nb_states_full = -chunk_size
+        self.dt_last = None
+
+    def __len__(self):
+        return self.nb_states_full + self.chunk_len
+
+    def new_chunk(self):
+        chunk = dict(dt=np.empty(self.chunk_size, dtype=np.int64),
+                     **{var: np.empty(self.chunk_size)
+                        for var in self.variables})
+        self.chunks.append(chunk)
+        self.nb_states_full += self.chunk_len
+        self.chunk_len = 0
+        return chunk
+
+    def record(self, portfolio):
+        """Records the current state of a portfolio at its timestamp."""
+        dt = portfolio.dt
+        if dt is None:
+            return
+
+        dt_ns = getattr(dt, "value", None)
+        if dt_ns is None:
+            dt = pd.Timestamp(dt)
+            dt_ns = dt.value
+
+        if dt_ns == self.dt_last:
+            chunk = self.chunks[-1]
+            idx = self.chunk_len - 1
+        else:
+            if self.chunk_len == self.chunk_size:
+                self.new_chunk()
+            if self.tz is None and self.dt_last is None:
+                self.tz = dt.tzinfo
+            chunk = self.chunks[-1]
+            idx = self.chunk_len
+            self.chunk_len += 1
+            chunk["dt"][idx] = self.dt_last = dt_ns
+
+        chunk["quote_price"][idx] = np.nan if portfolio.quote_price is None \
+            else portfolio.quote_price
+        chunk["quote_amount"][idx] = portfolio.quote_amount
+        chunk["base_amount"][idx] = portfolio.base_amount
+        chunk["quote_value"][idx] = portfolio.quote_value
+        chunk["performance"][idx] = portfolio.performance
+
+    def extend(self, dt, **values):
+        """Records a sequence of states.
+
+        Args:
+            dt (array-like): States timestamps, in chronological order.
+            **values (array-like): States variables (see `variables`).
+        """
+        dt_index = pd.DatetimeIndex(dt)
+        if len(dt_index) == 0:
+            return
+
+        dt_ns = dt_index.asi8
+        values = {var: np.asarray(values[var], dtype=float)
+                  for var in self.variables}
+
+        # Keep the last state of each timestamp
+        idx_keep = np.ones(len(dt_ns), dtype=bool)
+        idx_keep[:-1] = dt_ns[1:] != dt_ns[:-1]
+        if dt_ns[0] == self.dt_last:
+            # Replaces the last recorded state
+            self.chunk_len -= 1
+        dt_ns = dt_ns[idx_keep]
+        values = {var: value[idx_keep] for var, value in values.items()}
+
+        if self.dt_last is None:
+            self.tz = dt_index.tz
+
+        start = 0
+        while start < len(dt_ns):
+            if self.chunk_len == self.chunk_size:
+                self.new_chunk()
+            chunk = self.chunks[-1]
+            nb_copy = min(self.chunk_size - self.chunk_len, len(dt_ns) - start)
+            chunk_slice = slice(self.chunk_len, self.chunk_len + nb_copy)
+            chunk["dt"][chunk_slice] = dt_ns[start:start + nb_copy]
+            for var, value in values.items():
+                chunk[var][chunk_slice] = value[start:start + nb_copy]
+            self.chunk_len += nb_copy
+            start += nb_copy
+
+        self.dt_last = dt_ns[-1]
+
+    def get_array(self, var):
+        """Recorded values of a variable as a single array."""
+        arrays = [chunk[var][:self.chunk_size] for chunk in self.chunks[:-1]]
+        if self.chunks:
+            arrays.append(self.chunks[-1][var][:self.chunk_len])
+        if not arrays:
+            return np.empty(0, dtype=np.int64 if var == "dt" else float)
+        return np.concatenate(arrays)
+
+    def to_df(self):
+        """Recorded states as a DataFrame indexed by timestamp."""
+        dt_index = pd.DatetimeIndex(self.get_array("dt").view("datetime64[ns]"),
+                                    name="dt")
+        if self.tz is not None:
+            dt_index = dt_index.tz_localize("UTC").tz_convert(self.tz)
+
+        return pd.DataFrame({var: self.get_array(var)
+                             for var in self.variables},
+                            index=dt_index)
+
+    def to_parquet(self, path, **kwrds):
+        """Writes recorded states into a Parquet file."""
+        self.to_df().to_parquet(path, **kwrds)
+
+    def equity_curve(self):
+        """Portfolio quote value along the session."""
+        return self.to_df()["quote_value"].rename("equity")
+
+    def drawdown(self):
+        """Relative drawdown of the portfolio value from its running maximum.
+
+        Drawdowns are negative or null rates, e.g. -0.1 for a portfolio
+        value 10% below its past maximum.
+        """
+        equity_s = self.equity_curve()
+        return (equity_s/equity_s.cummax() - 1).rename("drawdown")
+
+    def max_drawdown(self):
+        """Largest relative drawdown of the session, as a negative rate."""
+        return self.drawdown().min() if len(self) > 0 else 0
+
+    def exposure(self):
+        """Fraction of the portfolio value exposed to the base asset."""
+        history_df = self.to_df()
+        exposure_s = 1 - history_df["quote_amount"]/history_df["quote_value"]
+        return exposure_s.rename("exposure")
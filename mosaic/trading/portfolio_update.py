@@ -0,0 +1,56 @@
+import pkg_resources
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+class PortfolioUpdateMixin:
+    """Portfolio state arithmetic.
+
+    Shared by the pydantic `Portfolio` and the simulation portfolio
+    (`sim_objects.SimPortfolio`), which only need to provide the
+    portfolio attributes.
+    """
+
+    __slots__ = ()
+
+    def update_order(self, od):
+
+        if od.side == "buy":
+
+            self.quote_amount -= od.quote_amount
+            self.base_amount += od.base_amount
+            self.nb_buy_orders += 1
+            self.last_buy_order_dt = self.dt
+            if self.last_sell_order_dt:
+                self.intertrade_duration_cum += \
+                    (self.last_buy_order_dt - self.last_sell_order_dt).total_seconds()
+
+        elif od.side == "sell":
+
+            self.quote_amount += od.quote_amount
+            self.base_amount -= od.base_amount
+            self.nb_sell_orders += 1
+            self.last_sell_order_dt = self.dt
+            if self.last_buy_order_dt:
+                self.intratrade_duration_cum += \
+                    (self.last_sell_order_dt - self.last_buy_order_dt).total_seconds()
+
+        else:
+
+            raise ValueError(f"Unrecognized order side {od.side}")
+
+        self.update()
+
+    def update(self):
+
+        self.quote_exposed = 0 if self.quote_price is None \
+            else self.base_amount*self.quote_price*(1 - self.fees_taker)
+
+        self.quote_value = self.quote_amount + self.quote_exposed
+
+        self.asset_performance = 0 if self.quote_price_init is None \
+            else self.quote_price/self.quote_price_init
+
+        self.performance = self.quote_value/self.quote_amount_init
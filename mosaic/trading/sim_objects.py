@@ -0,0 +1,229 @@
+import uuid
+import pkg_resources
+
+from .orders import FeesValue, OrderMarket, OrderTrailingMarket, \
+    OrderTrailingExecMixin
+from .portfolio_update import PortfolioUpdateMixin
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+# Order models which can be simulated with SimOrder
+SIM_ORDER_CLASSES = (OrderMarket, OrderTrailingMarket)
+
+# OrderBase fields kept by SimOrder (bkd, db and fees handled apart)
+SIM_ORDER_FIELDS = (
+    "uid",
+    "bot_uid",
+    "test_mode",
+    "symbol",
+    "timeframe",
+    "side",
+    "quote_amount",
+    "base_amount",
+    "quote_price",
+    "quote_price_at_create",
+    "quote_price_exec",
+    "quote_price_rate_open_exec",
+    "status",
+    "dt",
+    "dt_open",
+    "dt_closed",
+    "params",
+)
+
+SIM_ORDER_TRAILING_FIELDS = (
+    "is_trailing_activated",
+    "quote_price_trailing_bound",
+)
+
+# Portfolio fields, in the Portfolio model order
+SIM_PORTFOLIO_FIELDS = (
+    "bot_uid",
+    "fees_taker",
+    "dt",
+    "last_buy_order_dt",
+    "last_sell_order_dt",
+    "quote_price_init",
+    "quote_price",
+    "quote_amount_init",
+    "quote_amount",
+    "base_amount",
+    "quote_exposed",
+    "quote_value",
+    "asset_performance",
+    "intratrade_duration_cum",
+    "intertrade_duration_cum",
+    "nb_buy_orders",
+    "nb_sell_orders",
+    "performance",
+)
+
+
+class SimOrder(OrderTrailingExecMixin):
+    """Simulation-grade market order.
+
+    Slotted plain object reproducing the `OrderMarket` and
+    `OrderTrailingMarket` behaviour in test mode, without pydantic
+    attribute handling. Orders are converted into their pydantic model
+    with `to_order` for persistence and reporting.
+    """
+
+    __slots__ = SIM_ORDER_FIELDS + SIM_ORDER_TRAILING_FIELDS + \
+        ("order_cls", "trailing", "fees_value", "fees_asset", "bkd", "db")
+
+    def __init__(self, order_cls, params, uid=None, bot_uid=None,
+                 test_mode=True, symbol=None, timeframe=None, side=None,
+                 quote_amount=None, base_amount=None, dt_open=None):
+        self.order_cls = order_cls
+        self.trailing = issubclass(order_cls, OrderTrailingMarket)
+        self.params = params
+        self.uid = uid or str(uuid.uuid4())
+        self.bot_uid = bot_uid
+        self.test_mode = test_mode
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.side = side
+        self.quote_amount = quote_amount
+        self.base_amount = base_amount
+        self.quote_price = None
+        self.quote_price_at_create = None
+        self.quote_price_exec = None
+        self.quote_price_rate_open_exec = None
+        self.status = "open"
+        self.dt = None
+        self.dt_open = dt_open
+        self.dt_closed = None
+        self.fees_value = None
+        self.fees_asset = None
+        self.is_trailing_activated = False
+        self.quote_price_trailing_bound = None
+        self.bkd = None
+        self.db = None
+
+    @property
+    def base(self):
+        return self.symbol.split("/")[0]
+
+    @property
+    def quote(self):
+        return self.symbol.split("/")[1]
+
+    @classmethod
+    def from_order(cls, od):
+        """Simulation order from a pydantic order."""
+        sim_od = cls(type(od), od.params.copy())
+        for attr in SIM_ORDER_FIELDS:
+            if attr != "params":
+                setattr(sim_od, attr, getattr(od, attr))
+        if sim_od.trailing:
+            for attr in SIM_ORDER_TRAILING_FIELDS:
+                setattr(sim_od, attr, getattr(od, attr))
+        sim_od.fees_value = od.fees.value
+        sim_od.fees_asset = od.fees.asset
+        sim_od.bkd = od.bkd
+        sim_od.db = od.db
+
+        return sim_od
+
+    def to_order(self):
+        """Pydantic order of the simulation order."""
+        od_specs = {attr: getattr(self, attr) for attr in SIM_ORDER_FIELDS}
+        od_specs["params"] = self.params.copy()
+        if self.trailing:
+            od_specs.update({attr: getattr(self, attr)
+                             for attr in SIM_ORDER_TRAILING_FIELDS})
+        od_specs["fees"] = FeesValue(value=self.fees_value,
+                                     asset=self.fees_asset)
+
+        # Backends are set after creation not to store the order again
+        od = self.order_cls(**od_specs)
+        od.bkd = self.bkd
+        od.db = self.db
+
+        return od
+
+    def dict(self, **kwrds):
+        return self.to_order().dict(**kwrds)
+
+    def __str__(self):
+        return str(self.to_order())
+
+    def __repr__(self):
+        return repr(self.to_order())
+
+    def update_db(self):
+        if self.db:
+            self.db.update(endpoint="orders",
+                           data=self.dict(),
+                           index=["bot_uid"])
+
+    def update(self, dt=None, quote_price=None):
+        self.dt = dt
+        self.quote_price = quote_price
+
+        self.update_exec_bound()
+
+        if self.trailing:
+            self.update_trailing_bound()
+
+    def is_executable(self):
+        if not self.trailing:
+            return self.is_exec_bound_crossed()
+
+        return self.is_trailing_bound_crossed()
+
+    def execute(self):
+
+        if not self.test_mode:
+            raise ValueError(
+                "Simulation orders can only be executed in test mode")
+
+        self.fill_market_amounts()
+        if self.side in ("buy", "sell"):
+            self.fees_value, self.fees_asset = \
+                self.apply_taker_fees(self.bkd.fees_rates.taker)
+
+        self.dt_closed = self.dt
+        self.status = "executed"
+
+        self.update_db()
+
+        return True
+
+
+class SimPortfolio(PortfolioUpdateMixin):
+    """Simulation-grade portfolio.
+
+    Slotted plain object reproducing the `Portfolio` updates without
+    pydantic attribute handling. The portfolio state is copied back into
+    a `Portfolio` with `to_portfolio` at the end of the simulation.
+    """
+
+    __slots__ = SIM_PORTFOLIO_FIELDS + ("portfolio_cls",)
+
+    @classmethod
+    def from_portfolio(cls, portfolio):
+        sim_portfolio = cls()
+        sim_portfolio.portfolio_cls = type(portfolio)
+        for attr in SIM_PORTFOLIO_FIELDS:
+            setattr(sim_portfolio, attr, getattr(portfolio, attr))
+        return sim_portfolio
+
+    def to_portfolio(self, portfolio):
+        """Copies the simulation portfolio state into a `Portfolio`."""
+        for attr in SIM_PORTFOLIO_FIELDS:
+            setattr(portfolio, attr, getattr(self, attr))
+        return portfolio
+
+    def dict(self, exclude_none=False, **kwrds):
+        return {attr: getattr(self, attr) for attr in SIM_PORTFOLIO_FIELDS
+                if not (exclude_none and getattr(self, attr) is None)}
+
+    def __str__(self, exclude_bot_uid=False):
+        return self.to_portfolio(self.portfolio_cls())\
+                   .__str__(exclude_bot_uid=exclude_bot_uid)
+
+    def __repr__(self):
+        return self.__str__()
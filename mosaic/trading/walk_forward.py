@@ -0,0 +1,175 @@
+import concurrent.futures
+import multiprocessing
+import pydantic
+import pandas as pd
+import tqdm
+import pkg_resources
+
+from ..core import ObjMOSAIC
+from ..indicator.features_cache import FeaturesCache
+
+installed_pkg = {pkg.key for pkg in pkg_resources.working_set}
+if 'ipdb' in installed_pkg:
+    import ipdb  # noqa: F401
+
+
+# Decision model specifications and data used by the current worker process
+_wf_dm_specs = None
+_wf_ohlcv_df = None
+_wf_features_cache = None
+
+
+def walk_forward_worker_init(dm_specs, ohlcv_df, reuse_features):
+    """Initialize a walk-forward worker process.
+
+    The decision model specifications and the OHLCV data are sent once per
+    worker and kept in the worker globals for all the folds it runs.
+    """
+    global _wf_dm_specs, _wf_ohlcv_df, _wf_features_cache
+
+    _wf_dm_specs = dm_specs
+    _wf_ohlcv_df = ohlcv_df
+    _wf_features_cache = None
+    if reuse_features:
+        _wf_features_cache = FeaturesCache()
+        _wf_features_cache.register_dataset(ohlcv_df)
+
+
+def walk_forward_worker_run(fold):
+    """Run one walk-forward fold in the worker process."""
+    return run_fold(_wf_dm_specs, _wf_ohlcv_df, fold,
+                    features_cache=_wf_features_cache)
+
+
+def run_fold(dm_specs, ohlcv_df, fold, features_cache=None):
+    """Fit a decision model on a fold fit window and predict its block.
+
+    Args:
+        dm_specs (dict): Decision model specifications.
+        ohlcv_df (pd.DataFrame): Whole OHLCV data.
+        fold (tuple): Fit window and predicted block positions
+            (fit_start, fit_end, predict_start, predict_end).
+        features_cache (FeaturesCache): Cache shared by the folds.
+
+    Returns:
+        pd.DataFrame: Decisions of the predicted block.
+    """
+    fit_start, fit_end, predict_start, predict_end = fold
+
+    # Each fold uses a fresh decision model
+    decision_model = ObjMOSAIC.from_dict(dm_specs)
+    if features_cache is not None:
+        decision_model.features_cache = features_cache
+        decision_model.share_features_cache()
+
+    decision_model.fit(ohlcv_df.iloc[fit_start:fit_end])
+
+    # Predicted block is preceded by the decision model backward window
+    ohlcv_predict_df = \
+        ohlcv_df.iloc[max(0, predict_start - decision_model.bw_length):
+                      predict_end]
+    decisions_df = decision_model.predict(ohlcv_predict_df)\
+                                 .reindex(ohlcv_df.index[predict_start:
+                                                         predict_end])
+    decisions_df["decision"] = \
+        decision_model.fillna_decision(decisions_df["decision"])
+
+    return decisions_df
+
+
+class WalkForward(ObjMOSAIC):
+    """Walk-forward fit/predict engine for decision models.
+
+    The decision model is refitted every `refit_every` candles on the
+    `fit_length` previous candles (rolling window) or on all previous
+    candles (expanding window, starting with `fit_length` candles), and
+    predicts the following `refit_every` candles. Folds are independent
+    and may run in parallel processes. The predicted blocks make a single
+    out-of-sample decisions series.
+    """
+
+    fit_length: int = pydantic.Field(
+        ..., description="Number of candles of the fit window (first fit window in expanding mode)",
+        gt=0)
+
+    refit_every: int = pydantic.Field(
+        ..., description="Number of candles predicted between two refits",
+        gt=0)
+
+    window: str = pydantic.Field(
+        "rolling", description="Fit window mode: 'rolling' or 'expanding'",
+        user_input=["rolling", "expanding"])
+
+    n_jobs: int = pydantic.Field(
+        1, description="Number of worker processes (1 runs folds in the calling process, None uses all CPUs)")
+
+    mp_context: str = pydantic.Field(
+        None, description="Multiprocessing start method")
+
+    reuse_features: bool = pydantic.Field(
+        True, description="Compute features once on the whole data and reuse them for every fold")
+
+    @pydantic.validator("window")
+    def validate_window(cls, value):
+        val_accepted = ["rolling", "expanding"]
+        if value not in val_accepted:
+            raise ValueError(f"window must be: {', '.join(val_accepted)}")
+        return value
+
+    def compute_folds(self, nb_data):
+        """Fit windows and predicted blocks positions.
+
+        Returns:
+            list: (fit_start, fit_end, predict_start, predict_end) tuples.
+        """
+        folds = []
+        for predict_start in range(self.fit_length, nb_data, self.refit_every):
+            fit_start = predict_start - self.fit_length \
+                if self.window == "rolling" else 0
+            folds.append((fit_start, predict_start,
+                          predict_start,
+                          min(predict_start + self.refit_every, nb_data)))
+        return folds
+
+    def predict(self, decision_model, ohlcv_df, progress_mode=False):
+        """Walk-forward out-of-sample decisions.
+
+        Args:
+            decision_model (DMBase): Decision model to be refitted.
+            ohlcv_df (pd.DataFrame): OHLCV data.
+            progress_mode (bool): Display folds progress bar.
+
+        Returns:
+            pd.DataFrame: Out-of-sample decisions, from candle `fit_length`
+            onward.
+        """
+        folds = self.compute_folds(len(ohlcv_df))
+        dm_specs = decision_model.dict()
+
+        decisions_df_list = []
+        with tqdm.tqdm(total=len(folds), disable=not progress_mode,
+                       desc="Walk-forward") as pbar:
+            if self.n_jobs == 1:
+                walk_forward_worker_init(dm_specs, ohlcv_df,
+                                         self.reuse_features)
+                for fold in folds:
+                    decisions_df_list.append(walk_forward_worker_run(fold))
+                    pbar.update()
+            else:
+                ctx = multiprocessing.get_context(self.mp_context)
+                with concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.n_jobs,
+                        mp_context=ctx,
+                        initializer=walk_forward_worker_init,
+                        initargs=(dm_specs, ohlcv_df,
+                                  self.reuse_features)) as executor:
+
+                    for decisions_df in executor.map(walk_forward_worker_run,
+                                                      folds):
+                        decisions_df_list.append(decisions_df)
+                        pbar.update()
+
+        if len(decisions_df_list) == 0:
+            return decision_model.predict(ohlcv_df.iloc[:0])
+
+        return pd.concat(decisions_df_list, axis=0)
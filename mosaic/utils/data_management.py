@@ -7,6 +7,8 @@ from tzlocal import get_localzone
 import random
 import itertools
 import re
+import json
+import hashlib
 import typing
 import pydantic
 import pkg_resources
@@ -298,6 +300,53 @@ def timeframe_to_timedelta(timeframe):
     return timedelta(**{timedelta_unit_map.get(unit): value})
 
 
+# Candle quotes visited by intrabar paths. The "direction" path visits
+# the low before the high in rising candles (close >= open) and the high
+# before the low in falling candles
+INTRABAR_PATHS = {
+    "OLH": ("open", "low", "high"),
+    "OLHC": ("open", "low", "high", "close"),
+    "OHLC": ("open", "high", "low", "close"),
+    "direction": ("open", "low|high", "high|low", "close"),
+}
+
+
+def compute_intrabar_quotes(quote_open, quote_low, quote_high,
+                            quote_close=None, path="OLH"):
+    """Intrabar quotes of OHLC arrays following an intrabar path.
+
+    Args:
+        quote_open (np.ndarray): Open prices.
+        quote_low (np.ndarray): Low prices.
+        quote_high (np.ndarray): High prices.
+        quote_close (np.ndarray): Close prices (required by paths
+            visiting the close).
+        path (str): Intrabar path, one of `INTRABAR_PATHS`.
+
+    Returns:
+        np.ndarray: Quotes of shape (nb candles, nb quotes per candle).
+    """
+    if path not in INTRABAR_PATHS:
+        raise ValueError(f"Intrabar path {path} not supported: "
+                         f"use one of {list(INTRABAR_PATHS)}")
+
+    if quote_close is None and "close" in INTRABAR_PATHS[path]:
+        raise ValueError(f"Intrabar path {path} requires close prices")
+
+    quotes = dict(open=np.asarray(quote_open, dtype=float),
+                  low=np.asarray(quote_low, dtype=float),
+                  high=np.asarray(quote_high, dtype=float))
+    if quote_close is not None:
+        quotes["close"] = np.asarray(quote_close, dtype=float)
+
+    if path == "direction":
+        is_rising = quotes["close"] >= quotes["open"]
+        quotes["low|high"] = np.where(is_rising, quotes["low"], quotes["high"])
+        quotes["high|low"] = np.where(is_rising, quotes["high"], quotes["low"])
+
+    return np.column_stack([quotes[var] for var in INTRABAR_PATHS[path]])
+
+
 def fmt_currency(val, dec_prec_inf_1=".3", dec_prec_sup_1=".2f"):
     """Utility function to format currency."""
     return "{{val:{prec}}}".format(prec=(dec_prec_inf_1
@@ -349,6 +398,15 @@ def compute_combinations(**params_dict):
     return [dict(zip(keys, v)) for v in itertools.product(*values)]
 
 
+def compute_data_fingerprint(data_df):
+    """SHA-256 fingerprint of a DataFrame values, index and columns."""
+    data_hash = hashlib.sha256(
+        pd.util.hash_pandas_object(data_df, index=True).values.tobytes())
+    data_hash.update(json.dumps([str(col) for col in data_df.columns])
+                     .encode("utf-8"))
+    return data_hash.hexdigest()
+
+
 def join_obj_columns(data_df, sep="|"):
 
     var_to_joined = data_df.columns
@@ -42,7 +42,6 @@ setup(name='mosaic',
           "pandas==1.5.3",
           "ccxt==2.7.12",
           "plotly==5.13.0",
-          "pandas-ta==0.3.14b0",
           "tzlocal==5.0.1",
           "statsmodels==0.14.0",
           "tqdm==4.64.1",